@@ -1,19 +1,73 @@
 import os
 import sys
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.routers.v1 import parser_routes, comparison_routes, spell_check_routes
+from app.routers.v1 import parser_routes, comparison_routes, spell_check_routes, job_routes, quality_routes
+from app.services.parser_service import ParserService, get_parser_service
+from app.services.job_queue import JobQueue, JobStore
 
 load_dotenv()
 
+async def warm_up(app: FastAPI):
+    try:
+        await app.state.parser_service.warm_up()
+    except Exception as e:
+        # Serve anyway, the first requests just pay the start-up cost themselves
+        print(f"Error warming up parser service: {str(e)}")
+        app.state.warm_up_error = str(e)
+    app.state.ready = True
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+
+    # One service for every router, so all requests share connections, caches and limits
+    app.state.parser_service = ParserService(api_key)
+    app.state.ready = False
+    app.state.warm_up_error = None
+    warm_up_task = asyncio.create_task(warm_up(app))
+
+    # JOB_STORE_PATH makes queued jobs survive restarts and lets several worker processes share them;
+    # by default they are kept in memory, which only works with a single process
+    job_store_path = os.getenv("JOB_STORE_PATH")
+    if not job_store_path and int(os.getenv("WEB_CONCURRENCY", 1)) > 1:
+        raise ValueError("JOB_STORE_PATH must be set when running more than one worker process")
+    app.state.job_queue = JobQueue(
+        app.state.parser_service.run_job,
+        workers=int(os.getenv("JOB_WORKERS", 4)),
+        max_queued=int(os.getenv("JOB_MAX_QUEUED", 1000)),
+        store=JobStore(job_store_path) if job_store_path else None,
+        result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", 3600)),
+        callback_timeout=float(os.getenv("JOB_CALLBACK_TIMEOUT_SECONDS", 10)),
+        max_file_bytes=int(os.getenv("JOB_MAX_FILE_BYTES", 10 * 1024 * 1024)),
+        # Comma separated; when unset, callbacks may go to any host with only public addresses
+        callback_allowed_hosts=[host for host in os.getenv("JOB_CALLBACK_ALLOWED_HOSTS", "").replace(" ", "").split(",") if host]
+    )
+    await app.state.job_queue.start()
+
+    yield
+
+    warm_up_task.cancel()
+    await app.state.job_queue.stop()
+    if app.state.job_queue.store is not None:
+        app.state.job_queue.store.close()
+    app.state.parser_service.shutdown()
+
 app = FastAPI(
     title="Resume Parser API",
     description="API for parsing and analyzing resumes using AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -27,6 +81,8 @@ app.add_middleware(
 app.include_router(parser_routes.router)
 app.include_router(comparison_routes.router)
 app.include_router(spell_check_routes.router)
+app.include_router(job_routes.router)
+app.include_router(quality_routes.router)
 
 @app.get("/")
 async def root():
@@ -34,7 +90,16 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    # 503 until warm-up finishes, so load balancers hold traffic back from cold instances
+    if not getattr(app.state, "ready", False):
+        return ORJSONResponse(status_code=503, content={"status": "starting", "ready": False})
+    return {"status": "healthy", "ready": True, "warm_up_error": app.state.warm_up_error}
+
+@app.get("/metrics")
+async def metrics(request: Request, parser_service: ParserService = Depends(get_parser_service)):
+    stats = parser_service.stats()
+    stats["job_queue"] = request.app.state.job_queue.stats()
+    return stats
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,34 +1,26 @@
 """Routes for resume-job comparison operations"""
 import os
 import sys
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from typing import List, Optional
-from dotenv import load_dotenv
+from fastapi import APIRouter, UploadFile, File, Form, Depends
+from fastapi.responses import ORJSONResponse
+from typing import List
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from app.services.parser_service import ParserService
+from app.services.parser_service import ParserService, get_parser_service
 from app.utils.helpers import format_match_score
 
-load_dotenv()
-
 router = APIRouter(
     prefix="/api/v1",
     tags=["comparison"],
     responses={404: {"description": "Not found"}},
 )
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables")
-
-parser_service = ParserService(GEMINI_API_KEY)
-
 @router.post("/compare-resume-to-job")
 async def compare_resume_to_job(
     resume_file: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    parser_service: ParserService = Depends(get_parser_service)
 ):
     """
     Compare a resume to a job description and provide match analysis
@@ -42,4 +34,25 @@ async def compare_resume_to_job(
     # Format the match score for display
     comparison_result['match_score'] = format_match_score(comparison_result['match_score'] / 100)
 
-    return JSONResponse(content=comparison_result)
+    return ORJSONResponse(content=comparison_result)
+
+@router.post("/rank-resumes")
+async def rank_resumes(
+    resume_files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    top_k: int = Form(10, ge=1),
+    parser_service: ParserService = Depends(get_parser_service)
+):
+    """
+    Rank many resumes against one job description
+
+    - **resume_files**: PDF, DOCX, or TXT files containing the resumes
+    - **job_description**: Text of the job description
+    - **top_k**: Number of best matching resumes to return
+    """
+    ranking_result = await parser_service.rank_resumes(resume_files, job_description, top_k)
+
+    for result in ranking_result['ranked']:
+        result['match_score'] = format_match_score(result['match_score'] / 100)
+
+    return ORJSONResponse(content=ranking_result)
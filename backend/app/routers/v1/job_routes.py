@@ -0,0 +1,78 @@
+"""Routes for queued resume processing jobs"""
+import os
+import sys
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from typing import Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.parser_service import ParserService, get_parser_service, JOB_TASKS
+from app.services.job_queue import JobQueue, JobQueueFull, describe_job, get_job_queue
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["jobs"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    resume_file: UploadFile = File(...),
+    task: str = Form("parse"),
+    job_description: Optional[str] = Form(None),
+    include_summary: bool = Form(True),
+    callback_url: Optional[str] = Form(None),
+    parser_service: ParserService = Depends(get_parser_service),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue a resume for processing and return immediately with a job id
+
+    - **resume_file**: PDF, DOCX, or TXT file containing the resume
+    - **task**: "parse", "compare" or "spell-check"
+    - **job_description**: Text of the job description, required for "compare"
+    - **include_summary**: Whether to include a summary in "parse" results
+    - **callback_url**: Optional URL the finished job is POSTed to as JSON
+    """
+    if task not in JOB_TASKS:
+        raise HTTPException(status_code=400, detail=f"Unknown task. Must be one of: {', '.join(JOB_TASKS)}")
+    if task == 'compare' and not job_description:
+        raise HTTPException(status_code=400, detail="job_description is required for compare jobs")
+    parser_service.validate_file_extension(resume_file.filename)
+
+    params = {'include_summary': include_summary} if task == 'parse' else {}
+    if task == 'compare':
+        params['job_description'] = job_description
+
+    # Read one byte past the limit, so oversized files are rejected without holding them whole
+    data = await resume_file.read(job_queue.max_file_bytes + 1)
+    if len(data) > job_queue.max_file_bytes:
+        raise HTTPException(status_code=413, detail=f"File is larger than {job_queue.max_file_bytes} bytes")
+
+    try:
+        job = await job_queue.submit(task, data, resume_file.filename, params, callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after else None
+        raise HTTPException(status_code=503, detail=str(e), headers=headers)
+
+    return ORJSONResponse(status_code=202, content={
+        "job_id": job['id'],
+        "status": job['status'],
+        "status_url": f"/api/v1/jobs/{job['id']}"
+    })
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    Get the status of a queued job, with its result once completed
+
+    - **job_id**: Id returned when the job was submitted
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return ORJSONResponse(content=describe_job(job))
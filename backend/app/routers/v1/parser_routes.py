@@ -1,17 +1,15 @@
 """Routes for resume parsing operations"""
 import os
 import sys
-from fastapi import APIRouter, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import JSONResponse
-from typing import List, Optional
-from dotenv import load_dotenv
+import orjson
+from fastapi import APIRouter, UploadFile, File, Form, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import List
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from app.services.parser_service import ParserService
-from app.utils.helpers import sanitize_response, format_match_score
-
-load_dotenv()
+from app.services.parser_service import ParserService, get_parser_service
+from app.utils.helpers import sanitize_response
 
 router = APIRouter(
     prefix="/api/v1",
@@ -19,16 +17,11 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables")
-
-parser_service = ParserService(GEMINI_API_KEY)
-
 @router.post("/parse-resume")
 async def parse_resume(
     resume_file: UploadFile = File(...),
-    include_summary: bool = Form(True)
+    include_summary: bool = Form(True),
+    parser_service: ParserService = Depends(get_parser_service)
 ):
     """
     Parse a resume file and extract structured information
@@ -40,4 +33,41 @@ async def parse_resume(
 
     sanitized_result = sanitize_response(result)
 
-    return JSONResponse(content=sanitized_result)
+    return ORJSONResponse(content=sanitized_result)
+
+@router.post("/parse-resumes")
+async def parse_resumes(
+    resume_files: List[UploadFile] = File(...),
+    include_summary: bool = Form(True),
+    parser_service: ParserService = Depends(get_parser_service)
+):
+    """
+    Parse many resumes, streaming one NDJSON line per resume as soon as it is parsed
+
+    Lines arrive in completion order; each carries the file's upload 'index' and 'filename',
+    and either the parsed 'result' or an 'error' with its 'status_code'.
+
+    - **resume_files**: PDF, DOCX, or TXT files, or a single ZIP archive of them
+    - **include_summary**: Whether to include a summary in each result
+    """
+    items, close = await parser_service.prepare_bulk(resume_files, include_summary)
+
+    async def ndjson_lines():
+        try:
+            async for line in parser_service.parse_bulk(items):
+                yield orjson.dumps(line) + b"\n"
+        finally:
+            close()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@router.delete("/documents/{sha256}")
+async def invalidate_document(sha256: str, parser_service: ParserService = Depends(get_parser_service)):
+    """
+    Forget the stored text and results for a previously uploaded file
+
+    - **sha256**: Hex SHA-256 of the file's bytes
+    """
+    invalidated = parser_service.invalidate_document(sha256)
+
+    return ORJSONResponse(content={"sha256": sha256, "invalidated": invalidated})
@@ -0,0 +1,31 @@
+"""Routes for resume quality scoring"""
+import os
+import sys
+from fastapi import APIRouter, UploadFile, File, Form, Depends
+from fastapi.responses import ORJSONResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.parser_service import ParserService, get_parser_service
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["quality"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.post("/resume-quality")
+async def score_resume_quality(
+    resume_file: UploadFile = File(...),
+    local_only: bool = Form(False),
+    parser_service: ParserService = Depends(get_parser_service)
+):
+    """
+    Score a resume's completeness, spelling and presentation with improvement suggestions
+
+    - **resume_file**: PDF, DOCX, or TXT file containing the resume
+    - **local_only**: Score completeness only, without any AI calls, for high-volume pre-screening
+    """
+    quality_result = await parser_service.score_resume_quality(resume_file, local_only)
+
+    return ORJSONResponse(content=quality_result)
@@ -1,16 +1,12 @@
 """Routes for resume spell checking operations"""
 import os
 import sys
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from typing import List, Optional
-from dotenv import load_dotenv
+from fastapi import APIRouter, UploadFile, File, Depends
+from fastapi.responses import ORJSONResponse
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from app.services.parser_service import ParserService
-
-load_dotenv()
+from app.services.parser_service import ParserService, get_parser_service
 
 router = APIRouter(
     prefix="/api/v1",
@@ -18,15 +14,10 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables")
-
-parser_service = ParserService(GEMINI_API_KEY)
-
 @router.post("/spell-check-resume")
 async def spell_check_resume(
-    resume_file: UploadFile = File(...)
+    resume_file: UploadFile = File(...),
+    parser_service: ParserService = Depends(get_parser_service)
 ):
     """
     Perform spell checking on a resume file and provide corrections and suggestions
@@ -35,4 +26,4 @@ async def spell_check_resume(
     """
     spell_check_result = await parser_service.spell_check_resume(resume_file)
 
-    return JSONResponse(content=spell_check_result)
+    return ORJSONResponse(content=spell_check_result)
@@ -0,0 +1,173 @@
+"""Process pool for CPU-bound text extraction"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ExtractionTimeout(Exception):
+    """Raised when extracting a document takes longer than the configured timeout"""
+
+
+class ExtractionPool:
+    """
+    Runs text extraction in worker processes, so parsing PDFs neither blocks
+    the event loop nor contends for the GIL
+    """
+
+    def __init__(self, extract_function, max_workers=None, max_pending=None, timeout=30.0, max_tasks_per_worker=200):
+        """
+        Initialize the pool; worker processes are started on first use
+
+        Parameters:
+        extract_function (callable): Module-level function taking (file content, filename) and returning text
+        max_workers (int): Number of worker processes, defaults to the CPU count
+        max_pending (int): Maximum documents queued or in progress, defaults to 4 per worker
+        timeout (float): Seconds a single document may take before its worker is killed
+        max_tasks_per_worker (int): Documents a worker extracts before it is replaced
+        """
+        self.extract_function = extract_function
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+
+        self._executor = None
+        self._pending = asyncio.Semaphore(self.max_pending)
+        # One call per worker at a time, so a submitted call starts right away and its timeout covers only its run
+        self._running = asyncio.Semaphore(self.max_workers)
+        self._in_flight = {}
+        self._retiring = {}
+        self.completed = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                max_tasks_per_child=self.max_tasks_per_worker
+            )
+        return self._executor
+
+    def _retire(self, executor, stuck=None):
+        """
+        Stop sending calls to an executor and shut it down once its other calls finish
+
+        Parameters:
+        executor (ProcessPoolExecutor): Executor with a stuck or dead worker
+        stuck (Future): Call that timed out, not waited for
+        """
+        # Another request may already have replaced it
+        if self._executor is executor:
+            self._executor = None
+            self.restarts += 1
+        if executor not in self._retiring:
+            self._retiring[executor] = asyncio.create_task(self._shut_down_when_idle(executor, stuck))
+
+    async def _shut_down_when_idle(self, executor, stuck):
+        others = [
+            asyncio.wrap_future(future) for future in self._in_flight.get(executor, ())
+            if future is not stuck and not future.done()
+        ]
+        try:
+            if others:
+                # Each call is bounded by its own timeout as well
+                await asyncio.wait(others, timeout=self.timeout)
+        finally:
+            self._terminate(executor)
+            self._in_flight.pop(executor, None)
+            self._retiring.pop(executor, None)
+
+    @staticmethod
+    def _terminate(executor):
+        """Shut an executor down, killing workers stuck on a document"""
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    async def run(self, func, *args):
+        """
+        Run a function in a worker process
+
+        A call that times out leaves the other calls in flight to finish
+        before its worker is killed; new calls go to fresh workers meanwhile.
+
+        Parameters:
+        func (callable): Module-level function to run
+        *args: Picklable arguments for func
+
+        Returns:
+        object: Whatever func returns
+
+        Raises:
+        ExtractionTimeout: If the call runs longer than the timeout
+        """
+        async with self._pending, self._running:
+            executor = self._get_executor()
+            future = executor.submit(func, *args)
+            in_flight = self._in_flight.setdefault(executor, set())
+            in_flight.add(future)
+            future.add_done_callback(in_flight.discard)
+
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self._retire(executor, stuck=future)
+                raise ExtractionTimeout(f"Text extraction took longer than {self.timeout} seconds")
+            except BrokenProcessPool:
+                self._retire(executor)
+                raise
+
+            self.completed += 1
+            return result
+
+    async def extract(self, data, filename):
+        """
+        Extract text from a file's content in a worker process
+
+        Parameters:
+        data (bytes): File content
+        filename (str): Name of the file, passed through to the extract function
+
+        Returns:
+        str: Extracted text content
+
+        Raises:
+        ExtractionTimeout: If extraction takes longer than the timeout
+        """
+        return await self.run(self.extract_function, data, filename)
+
+    async def warm_up(self):
+        """Start the worker processes and load the extraction code in each"""
+        await asyncio.gather(*[self.extract(b"warm up", "warm-up.txt") for _ in range(self.max_workers)])
+
+    def stats(self):
+        """
+        Get pool configuration and counters
+
+        Returns:
+        dict: Limits plus completed task, timed out and restart counts
+        """
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'retiring_pools': len(self._retiring),
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'restarts': self.restarts
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        for executor, task in list(self._retiring.items()):
+            task.cancel()
+            self._terminate(executor)
+        self._retiring.clear()
+        self._in_flight.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
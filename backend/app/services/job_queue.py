@@ -0,0 +1,626 @@
+"""Background job queue for resume processing"""
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+_JOB_COLUMNS = "id, task, status, filename, params, callback_url, result, error, created_at, finished_at"
+
+
+class JobStore:
+    """
+    SQLite-backed record of jobs, so queued work survives a restart
+
+    Several processes can share one file: a job is claimed by a single
+    owner at a time, and its lease must be renewed while it runs, so jobs
+    left running by a stopped process are picked up once the lease expires.
+    File content is kept only until the job finishes.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store and create its table if needed
+
+        Parameters:
+        path (str): Path to the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, task TEXT NOT NULL, status TEXT NOT NULL, filename TEXT, data BLOB, "
+            "params TEXT, callback_url TEXT, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, finished_at REAL, owner TEXT, lease_until REAL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (('owner', 'TEXT'), ('lease_until', 'REAL')):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def add(self, job, data):
+        """
+        Record a newly queued job
+
+        Parameters:
+        job (dict): Job record
+        data (bytes): File content to process
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, task, status, filename, data, params, callback_url, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job['id'], job['task'], job['status'], job['filename'], data,
+                 json.dumps(job['params']), job['callback_url'], job['created_at'])
+            )
+
+    def claim(self, owner, lease_seconds):
+        """
+        Take the oldest job that is queued, or running under an expired lease
+
+        The status change is a single conditional UPDATE, so when several
+        processes race for the same job only one of them gets it.
+
+        Parameters:
+        owner (str): Id of the claiming queue
+        lease_seconds (float): How long the claim holds without renew()
+
+        Returns:
+        tuple: (job record, file content), or None if no job is waiting
+        """
+        with self._lock:
+            while True:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                claimed = self._conn.execute(
+                    "UPDATE jobs SET status = 'running', owner = ?, lease_until = ? "
+                    "WHERE id = ? AND (status = 'queued' OR (status = 'running' AND lease_until < ?))",
+                    (owner, now + lease_seconds, row[0], now)
+                ).rowcount
+                # Zero rows means another process claimed it first, so look for the next job
+                if claimed:
+                    job_row = self._conn.execute(
+                        f"SELECT {_JOB_COLUMNS}, data FROM jobs WHERE id = ?", (row[0],)
+                    ).fetchone()
+                    return self._to_job(job_row[:-1]), job_row[-1]
+
+    def renew(self, job_id, owner, lease_seconds):
+        """
+        Extend the lease on a claimed job
+
+        Parameters:
+        job_id (str): Job id
+        owner (str): Id of the claiming queue
+        lease_seconds (float): Seconds from now the claim holds
+
+        Returns:
+        bool: False if the job is no longer held by owner
+        """
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time() + lease_seconds, job_id, owner)
+            ).rowcount == 1
+
+    def release(self, owner):
+        """
+        Put the jobs an owner is running back in the queue, e.g. when it stops
+
+        Parameters:
+        owner (str): Id of the claiming queue
+
+        Returns:
+        int: Number of jobs requeued
+        """
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, lease_until = NULL "
+                "WHERE owner = ? AND status = 'running'",
+                (owner,)
+            ).rowcount
+
+    def finish(self, job, owner):
+        """
+        Record a job's outcome and drop its file content
+
+        Parameters:
+        job (dict): Finished job record
+        owner (str): Id of the claiming queue
+
+        Returns:
+        bool: False if the lease was lost and the job is now held by another owner
+        """
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, data = NULL, lease_until = NULL "
+                "WHERE id = ? AND owner = ?",
+                (job['status'], json.dumps(job['result']) if job['result'] is not None else None,
+                 json.dumps(job['error']) if job['error'] is not None else None, job['finished_at'], job['id'], owner)
+            ).rowcount == 1
+
+    def get(self, job_id):
+        """
+        Look up a job
+
+        Parameters:
+        job_id (str): Job id
+
+        Returns:
+        dict: Job record, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def queued(self):
+        """
+        Count the jobs waiting to be claimed
+
+        Returns:
+        int: Number of queued jobs
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+    def position(self, job):
+        """
+        Get a queued job's place in line
+
+        Parameters:
+        job (dict): Queued job record
+
+        Returns:
+        int: 1 for the next job to be claimed
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at <= ?", (job['created_at'],)
+            ).fetchone()[0]
+
+    def delete_finished_before(self, timestamp):
+        """
+        Forget finished jobs
+
+        Parameters:
+        timestamp (float): Delete jobs that finished before this time
+
+        Returns:
+        int: Number of jobs deleted
+        """
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (timestamp,)
+            ).rowcount
+
+    @staticmethod
+    def _to_job(row):
+        job_id, task, status, filename, params, callback_url, result, error, created_at, finished_at = row
+        return {
+            'id': job_id,
+            'task': task,
+            'status': status,
+            'filename': filename,
+            'params': json.loads(params) if params else {},
+            'callback_url': callback_url,
+            'result': json.loads(result) if result is not None else None,
+            'error': json.loads(error) if error is not None else None,
+            'created_at': created_at,
+            'finished_at': finished_at
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def describe_job(job):
+    """
+    Get the client-facing view of a job
+
+    Parameters:
+    job (dict): Job record
+
+    Returns:
+    dict: Id, status, result or error, and timestamps
+    """
+    return {
+        'job_id': job['id'],
+        'task': job['task'],
+        'status': job['status'],
+        'filename': job['filename'],
+        'queue_position': job.get('queue_position'),
+        'result': job['result'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'finished_at': job['finished_at']
+    }
+
+
+def check_callback_url(url, allowed_hosts=None):
+    """
+    Make sure a callback URL can't be used to reach internal services
+
+    Parameters:
+    url (str): Callback URL
+    allowed_hosts (set): Host names callbacks may go to; when empty, any host
+        resolving only to public addresses is allowed
+
+    Raises:
+    ValueError: If the URL isn't http(s) or points at a disallowed host
+    """
+    parsed = urllib.parse.urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise ValueError("Callback URL must be an http or https URL")
+
+    host = parsed.hostname.lower()
+    if allowed_hosts:
+        if host not in allowed_hosts:
+            raise ValueError("Callback URL host is not allowed")
+        return
+
+    try:
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, ValueError):
+        raise ValueError("Callback URL host can't be resolved")
+
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        # Rejects loopback, private, link-local (cloud metadata) and reserved ranges
+        if not ip.is_global:
+            raise ValueError("Callback URL must point to a public address")
+
+
+class _NoRedirects(urllib.request.HTTPRedirectHandler):
+    """Refuses redirects, which could lead a checked callback URL to an internal address"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        raise urllib.error.HTTPError(req.full_url, code, "Callback redirects are not followed", headers, fp)
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirects)
+
+
+def post_callback(url, payload, timeout, allowed_hosts=None):
+    """
+    POST a finished job to its callback URL
+
+    The URL is checked again before the request, since its host may
+    resolve differently than when the job was submitted.
+
+    Parameters:
+    url (str): Callback URL
+    payload (dict): JSON body
+    timeout (float): Seconds to wait for the callback
+    allowed_hosts (set): Host names callbacks may go to, see check_callback_url
+
+    Returns:
+    int: HTTP status of the callback response
+    """
+    check_callback_url(url, allowed_hosts)
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with _callback_opener.open(request, timeout=timeout) as response:
+        return response.status
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a fixed set of worker tasks
+
+    Submissions beyond max_queued waiting jobs are rejected rather than
+    buffered, so bursts push back on clients instead of exhausting memory.
+
+    Without a store, jobs live in this process only: a job can only be
+    looked up from the process it was submitted to, so run the API as a
+    single process. With a store, every process claims jobs from the shared
+    database, and any of them can report on any job.
+    """
+
+    def __init__(self, run_job, workers=4, max_queued=1000, store=None, result_ttl_seconds=3600,
+                 callback_timeout=10.0, max_file_bytes=10 * 1024 * 1024, callback_allowed_hosts=None,
+                 lease_seconds=60.0, poll_interval=1.0):
+        """
+        Initialize the queue; workers start with start()
+
+        Parameters:
+        run_job (callable): Coroutine function run_job(task, data, filename, params) returning the result
+        workers (int): Number of jobs processed concurrently
+        max_queued (int): Maximum jobs waiting to start
+        store (JobStore): Optional durable record of jobs, None keeps them in memory only
+        result_ttl_seconds (float): How long finished jobs can be fetched
+        callback_timeout (float): Seconds to wait for a callback URL to respond
+        max_file_bytes (int): Largest file accepted for a job
+        callback_allowed_hosts (list): Host names callbacks may go to, by default any public host
+        lease_seconds (float): With a store, how long a claimed job stays held without being renewed
+        poll_interval (float): With a store, seconds idle workers wait before checking for jobs
+            submitted to other processes
+        """
+        self.run_job = run_job
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.store = store
+        self.result_ttl_seconds = result_ttl_seconds
+        self.callback_timeout = callback_timeout
+        self.max_file_bytes = max_file_bytes
+        self.callback_allowed_hosts = {host.lower() for host in callback_allowed_hosts or ()}
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.owner = uuid.uuid4().hex
+
+        self._queue = asyncio.Queue()
+        self._wake = asyncio.Event()
+        self._jobs = {}
+        self._data = {}
+        self._tasks = []
+        # Jobs are taken in order, so a job's position is its sequence number less the jobs taken so far
+        self._sequence = {}
+        self._enqueued = 0
+        self._dequeued = 0
+        self._expired_at = time.time()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.callback_failures = 0
+
+    async def start(self):
+        """Start the workers; with a store, they also take jobs other processes left unfinished"""
+        worker = self._worker if self.store is None else self._store_worker
+        self._tasks = [asyncio.create_task(worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers; with a store, interrupted jobs are requeued for any process to run"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None:
+            await asyncio.to_thread(self.store.release, self.owner)
+
+    async def submit(self, task, data, filename, params=None, callback_url=None):
+        """
+        Queue a job
+
+        Parameters:
+        task (str): Kind of processing, passed to run_job
+        data (bytes): File content
+        filename (str): Name of the file
+        params (dict): Task-specific parameters
+        callback_url (str): Optional URL the finished job is POSTed to
+
+        Returns:
+        dict: The queued job
+
+        Raises:
+        ValueError: If the file is too large or the callback URL isn't allowed
+        JobQueueFull: If max_queued jobs are already waiting
+        """
+        if len(data) > self.max_file_bytes:
+            raise ValueError(f"File is larger than {self.max_file_bytes} bytes")
+        if callback_url:
+            await asyncio.to_thread(check_callback_url, callback_url, self.callback_allowed_hosts)
+
+        queued = self._queue.qsize() if self.store is None else await asyncio.to_thread(self.store.queued)
+        if queued >= self.max_queued:
+            self.rejected += 1
+            raise JobQueueFull(f"Job queue is full ({self.max_queued} jobs waiting)",
+                               retry_after=self._retry_after(queued))
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'task': task,
+            'status': 'queued',
+            'filename': filename,
+            'params': params or {},
+            'callback_url': callback_url,
+            'result': None,
+            'error': None,
+            'created_at': time.time(),
+            'finished_at': None
+        }
+        if self.store is not None:
+            await asyncio.to_thread(self.store.add, job, data)
+            self._wake.set()
+            return job
+
+        self._data[job['id']] = data
+        self._jobs[job['id']] = job
+        self._enqueue(job['id'])
+        return job
+
+    def _enqueue(self, job_id):
+        self._enqueued += 1
+        self._sequence[job_id] = self._enqueued
+        self._queue.put_nowait(job_id)
+
+    def get(self, job_id):
+        """
+        Look up a job
+
+        Parameters:
+        job_id (str): Job id
+
+        Returns:
+        dict: Job record, or None if unknown or expired
+        """
+        # The store is the shared record, so jobs run by other processes are seen as they progress
+        job = self._jobs.get(job_id) if self.store is None else self.store.get(job_id)
+        if job is None:
+            return None
+
+        result = dict(job)
+        result['queue_position'] = self._position(job) if job['status'] == 'queued' else None
+        return result
+
+    def _position(self, job):
+        if self.store is not None:
+            return self.store.position(job)
+        sequence = self._sequence.get(job['id'])
+        return sequence - self._dequeued if sequence is not None else None
+
+    def _retry_after(self, queued):
+        """Rough seconds until a queue slot frees up, from recent job durations"""
+        finished = [job for job in self._jobs.values() if job['finished_at'] is not None]
+        if not finished:
+            return None
+        average = sum(job['finished_at'] - job['created_at'] for job in finished) / len(finished)
+        return average * queued / self.workers
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._dequeued += 1
+            self._sequence.pop(job_id, None)
+            job = self._jobs[job_id]
+            job['status'] = 'running'
+            try:
+                await self._process(job, self._data.pop(job_id, None))
+            except Exception:
+                logger.exception("Error processing job %s", job_id)
+            finally:
+                self._queue.task_done()
+                await self._expire()
+
+    async def _store_worker(self):
+        while True:
+            # Cleared before claiming, so a submit landing during the claim still wakes this worker
+            self._wake.clear()
+            claimed = await asyncio.to_thread(self.store.claim, self.owner, self.lease_seconds)
+            if claimed is None:
+                # Woken early by a local submit, otherwise poll for jobs from other processes
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job, data = claimed
+            self._jobs[job['id']] = job
+            renewing = asyncio.create_task(self._renew(job['id']))
+            try:
+                await self._process(job, data)
+            except Exception:
+                logger.exception("Error processing job %s", job['id'])
+            finally:
+                renewing.cancel()
+                await self._expire()
+
+    async def _renew(self, job_id):
+        """Keep the lease on a running job, well before it expires"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await asyncio.to_thread(self.store.renew, job_id, self.owner, self.lease_seconds):
+                logger.warning("Lost the lease on job %s", job_id)
+                return
+
+    async def _process(self, job, data):
+        try:
+            job['result'] = await self.run_job(job['task'], data, job['filename'], job['params'])
+            job['status'] = 'completed'
+            self.completed += 1
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = {
+                'status_code': getattr(e, 'status_code', 500),
+                'detail': getattr(e, 'detail', str(e))
+            }
+            self.failed += 1
+        job['finished_at'] = time.time()
+
+        if self.store is not None and not await asyncio.to_thread(self.store.finish, job, self.owner):
+            # Another process took the job over after the lease lapsed, and reports it itself
+            logger.warning("Job %s was taken over by another worker, dropping this result", job['id'])
+            return
+
+        if job['callback_url']:
+            try:
+                await asyncio.to_thread(
+                    post_callback, job['callback_url'], describe_job(job), self.callback_timeout,
+                    self.callback_allowed_hosts
+                )
+            except Exception as e:
+                self.callback_failures += 1
+                logger.warning("Error calling back %s for job %s: %s", job['callback_url'], job['id'], e)
+
+    async def _expire(self):
+        """Forget finished jobs older than the result TTL, at most once a minute"""
+        now = time.time()
+        if now - self._expired_at < 60:
+            return
+        self._expired_at = now
+
+        cutoff = now - self.result_ttl_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job['finished_at'] is not None and job['finished_at'] < cutoff]:
+            del self._jobs[job_id]
+        if self.store is not None:
+            await asyncio.to_thread(self.store.delete_finished_before, cutoff)
+
+    def stats(self):
+        """
+        Get queue depth and job counters
+
+        Returns:
+        dict: Configuration, queued and running jobs, and completion counters
+        """
+        return {
+            'workers': self.workers,
+            'max_queued': self.max_queued,
+            'max_file_bytes': self.max_file_bytes,
+            'queued': self._queue.qsize() if self.store is None else self.store.queued(),
+            'running': sum(1 for job in self._jobs.values() if job['status'] == 'running'),
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'callback_failures': self.callback_failures
+        }
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """
+    Dependency returning the application's job queue
+
+    Parameters:
+    request (Request): Incoming request
+
+    Returns:
+    JobQueue: Queue created by the application lifespan
+    """
+    return request.app.state.job_queue
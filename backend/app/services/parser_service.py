@@ -1,9 +1,13 @@
 """Service for resume parsing operations"""
 import os
 import sys
+import io
+import asyncio
+import hashlib
 import tempfile
-import shutil
-from fastapi import UploadFile, HTTPException
+import zipfile
+from typing import List
+from fastapi import Request, UploadFile, HTTPException
 
 # Add the root directory to the path for proper imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -11,11 +15,177 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # Import model - use absolute import from root directory
 try:
     from model.parsers.resume_parser import ResumeParser
+    from model.helpers.response_cache import ResponseCache
+    from model.helpers.rate_limiter import RateLimiter, RateLimitExceeded
+    from model.helpers.document_store import DocumentStore
+    from model.extractors.text_extractor import TextExtractor
+    from model.extractors.pdf_engine import PdfExtractionEngine, count_pdf_pages
+    from model.extractors.registry import check_extension, default_registry, sniff_stream
 except ImportError:
     parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     model_path = os.path.join(parent_dir, "..")
     sys.path.append(model_path)
     from model.parsers.resume_parser import ResumeParser
+    from model.helpers.response_cache import ResponseCache
+    from model.helpers.rate_limiter import RateLimiter, RateLimitExceeded
+    from model.helpers.document_store import DocumentStore
+    from model.extractors.text_extractor import TextExtractor
+    from model.extractors.pdf_engine import PdfExtractionEngine, count_pdf_pages
+    from model.extractors.registry import check_extension, default_registry, sniff_stream
+
+from app.services.extraction_pool import ExtractionPool, ExtractionTimeout
+from app.utils.helpers import sanitize_response, format_match_score
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+JOB_TASKS = ('parse', 'compare', 'spell-check')
+UPLOAD_MEMORY_LIMIT = int(os.getenv("UPLOAD_MEMORY_LIMIT", 8 * 1024 * 1024))
+
+_response_cache = None
+_rate_limiter = None
+_document_store = None
+_extraction_pool = None
+
+
+def get_response_cache():
+    """
+    Get the process-wide Gemini response cache configured from the environment
+
+    LLM_CACHE_PATH selects the SQLite file (empty disables caching),
+    LLM_CACHE_MAX_ENTRIES and LLM_CACHE_TTL_SECONDS bound its size and age.
+
+    Returns:
+    ResponseCache: Shared cache, or None if caching is disabled
+    """
+    global _response_cache
+
+    cache_path = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+    if not cache_path:
+        return None
+
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            cache_path,
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000)),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+        )
+
+    return _response_cache
+
+
+def get_document_store():
+    """
+    Get the process-wide store of processed documents configured from the environment
+
+    DOCUMENT_STORE_PATH selects the SQLite file (empty disables the store),
+    DOCUMENT_STORE_MAX_ENTRIES and DOCUMENT_STORE_TTL_SECONDS bound its size and age.
+
+    Returns:
+    DocumentStore: Shared store, or None if disabled
+    """
+    global _document_store
+
+    store_path = os.getenv("DOCUMENT_STORE_PATH", "documents.sqlite3")
+    if not store_path:
+        return None
+
+    if _document_store is None:
+        _document_store = DocumentStore(
+            store_path,
+            max_entries=int(os.getenv("DOCUMENT_STORE_MAX_ENTRIES", 50000)),
+            ttl_seconds=float(os.getenv("DOCUMENT_STORE_TTL_SECONDS", 30 * 24 * 3600))
+        )
+
+    return _document_store
+
+
+def get_extraction_pool():
+    """
+    Get the process-wide text extraction pool configured from the environment
+
+    EXTRACTION_WORKERS sets the number of worker processes (0 extracts in a
+    thread instead), EXTRACTION_MAX_PENDING bounds queued documents,
+    EXTRACTION_TIMEOUT_SECONDS limits each document and
+    EXTRACTION_MAX_TASKS_PER_WORKER recycles workers.
+
+    Returns:
+    ExtractionPool: Shared pool, or None if extraction runs in threads
+    """
+    global _extraction_pool
+
+    workers = int(os.getenv("EXTRACTION_WORKERS", os.cpu_count() or 1))
+    if workers <= 0:
+        return None
+
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool(
+            TextExtractor.extract_text_from_uploaded_file,
+            max_workers=workers,
+            max_pending=int(os.getenv("EXTRACTION_MAX_PENDING", workers * 4)),
+            timeout=float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", 30)),
+            max_tasks_per_worker=int(os.getenv("EXTRACTION_MAX_TASKS_PER_WORKER", 200))
+        )
+
+    return _extraction_pool
+
+
+def _has_content(parsed_data):
+    """Check whether parsed resume data holds anything beyond the empty default structure"""
+    for value in parsed_data.values():
+        if isinstance(value, dict):
+            if any(value.values()):
+                return True
+        elif value:
+            return True
+    return False
+
+
+def _optional_float(name):
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def _optional_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+def get_rate_limiter():
+    """
+    Get the process-wide Gemini rate limiter configured from the environment
+
+    LLM_MAX_IN_FLIGHT caps concurrent calls, LLM_REQUESTS_PER_MINUTE and
+    LLM_TOKENS_PER_MINUTE set this worker's share of the quota, and
+    LLM_MAX_RETRIES bounds retries of 429/5xx responses.
+
+    Returns:
+    RateLimiter: Shared rate limiter
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(
+            max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", 8)),
+            requests_per_minute=_optional_float("LLM_REQUESTS_PER_MINUTE"),
+            tokens_per_minute=_optional_float("LLM_TOKENS_PER_MINUTE"),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", 5)),
+            max_queue_seconds=float(os.getenv("LLM_MAX_QUEUE_SECONDS", 60))
+        )
+
+    return _rate_limiter
+
+
+def rate_limit_error(error):
+    """
+    Convert a RateLimitExceeded error into a 429 response
+
+    Parameters:
+    error (RateLimitExceeded): The rate limit error
+
+    Returns:
+    HTTPException: Exception to raise from the route
+    """
+    headers = {"Retry-After": str(max(1, round(error.retry_after)))} if error.retry_after else None
+    return HTTPException(status_code=429, detail=str(error), headers=headers)
 
 class ParserService:
     """
@@ -29,7 +199,19 @@ class ParserService:
         Parameters:
         api_key (str): Gemini API key
         """
-        self.resume_parser = ResumeParser(api_key)
+        self.resume_parser = ResumeParser(api_key, cache=get_response_cache(), rate_limiter=get_rate_limiter())
+        self.document_store = get_document_store()
+        self.extraction_pool = get_extraction_pool()
+        self.pdf_engine = PdfExtractionEngine(
+            pages_per_task=int(os.getenv("PDF_PAGES_PER_TASK", 8)),
+            max_pages=_optional_int("PDF_MAX_PAGES"),
+            max_chars=_optional_int("PDF_MAX_CHARS")
+        )
+        self.rank_concurrency = int(os.getenv("RANK_MAX_CONCURRENCY", 16))
+        self.bulk_concurrency = int(os.getenv("BULK_MAX_CONCURRENCY", 8))
+        self.bulk_max_files = int(os.getenv("BULK_MAX_FILES", 1000))
+        self.bulk_max_file_bytes = int(os.getenv("BULK_MAX_FILE_BYTES", 20 * 1024 * 1024))
+        self.bulk_memory_limit = int(os.getenv("BULK_MEMORY_LIMIT", 64 * 1024 * 1024))
 
     def get_allowed_file_extensions(self):
         """
@@ -66,38 +248,137 @@ class ParserService:
 
     async def extract_text_from_upload(self, file: UploadFile):
         """
-        Extract text from an uploaded file
+        Extract text from an uploaded file, reusing the stored document if the same file was seen before
 
         Parameters:
         file (UploadFile): Uploaded file
 
         Returns:
-        tuple: (text content, temp file path)
+        tuple: (text content, SHA-256 of the file, stored document or None)
 
         Raises:
         HTTPException: If there's an error processing the file
         """
         # Validate file extension
-        file_ext = self.validate_file_extension(file.filename)
+        self.validate_file_extension(file.filename)
 
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-                shutil.copyfileobj(file.file, temp_file)
-                temp_path = temp_file.name
+            sha256, stream = self._spool_upload(file)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
-            text = self.resume_parser.extract_text_from_file(temp_path)
+        return await self._extract_text(stream, sha256, file.filename)
 
-            return text, temp_path
+    async def extract_text_from_bytes(self, data, filename):
+        """
+        Extract text from a file's content, e.g. one held by a queued job
 
-        except Exception as e:
-            if 'temp_path' in locals():
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+        Parameters:
+        data (bytes): File content
+        filename (str): Name of the file
+
+        Returns:
+        tuple: (text content, SHA-256 of the file, stored document or None)
+
+        Raises:
+        HTTPException: If there's an error processing the file
+        """
+        self.validate_file_extension(filename)
+        return await self._extract_text(io.BytesIO(data), hashlib.sha256(data).hexdigest(), filename)
+
+    async def _extract_text(self, stream, sha256, filename):
+        """Extract text from a seekable stream, using and filling the document store"""
+        try:
+            file_format = sniff_stream(stream)
+            check_extension(file_format, filename)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        try:
+            document = None
+            if self.document_store is not None:
+                document = self.document_store.get(
+                    sha256, self.resume_parser.model_version, default_registry.version()
+                )
+                if document is not None and document['text'] is not None:
+                    return document['text'], sha256, document
+
+            # PDFs longer than one page range are split across workers, unless another PDF backend is preferred
+            split_pdf = (
+                file_format == 'pdf' and self.extraction_pool is not None and self.extraction_pool.max_workers > 1
+                and default_registry.backend_names('pdf')[0] == 'pypdf2'
+            )
+
+            if split_pdf:
+                data = stream.read()
+                page_count = await asyncio.to_thread(count_pdf_pages, data)
+                if self.pdf_engine.splits(page_count):
+                    extraction = await self.pdf_engine.aextract(
+                        data, self.extraction_pool.run, self.extraction_pool.max_workers, page_count
+                    )
+                    text = extraction['text']
+                else:
+                    text = await self.extraction_pool.extract(data, filename)
+            elif self.extraction_pool is not None:
+                text = await self.extraction_pool.extract(stream.read(), filename)
+            else:
+                text = await asyncio.to_thread(self.resume_parser.extract_text_from_stream, stream)
+
+            if self.document_store is not None:
+                self.document_store.put_text(sha256, text, default_registry.version())
+
+            return text, sha256, document
+
+        except ExtractionTimeout as e:
+            raise HTTPException(status_code=504, detail=str(e))
 
+        except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+    def _spool_upload(self, file: UploadFile, copy=False, memory_limit=UPLOAD_MEMORY_LIMIT):
+        """
+        Hash an upload and get a seekable stream over its content
+
+        The upload's own spooled file is reused when it can be rewound; otherwise
+        the content is copied into memory, spilling to disk past memory_limit.
+
+        Parameters:
+        file (UploadFile): Uploaded file
+        copy (bool): Always copy, for content used after the request's files are closed
+        memory_limit (int): Bytes of a copy held in memory before it spills to disk
+
+        Returns:
+        tuple: (SHA-256 of the content, binary stream positioned at the start)
+        """
+        source = file.file
+        stream = source if not copy and getattr(source, 'seekable', lambda: False)() else None
+        if stream is None:
+            stream = tempfile.SpooledTemporaryFile(max_size=memory_limit)
+        else:
+            stream.seek(0)
+
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            if stream is not source:
+                stream.write(chunk)
+        stream.seek(0)
+
+        return digest.hexdigest(), stream
+
+    async def _parse_text(self, text, sha256, document):
+        """Parse resume text, reusing and filling the document store"""
+        if document is not None and document['parsed'] is not None:
+            return document['parsed']
+
+        parsed_data = await self.resume_parser.aparse_resume(text, include_summary=True)
+
+        # An empty result means parsing failed, don't keep serving it
+        if self.document_store is not None and _has_content(parsed_data):
+            self.document_store.put_parsed(sha256, parsed_data, self.resume_parser.model_version)
+
+        return parsed_data
+
     async def parse_resume(self, file: UploadFile, include_summary=True):
         """
         Parse a resume from an uploaded file
@@ -109,20 +390,36 @@ class ParserService:
         Returns:
         dict: Parsed resume data
         """
-        text, temp_path = await self.extract_text_from_upload(file)
+        return await self._parse_extracted(await self.extract_text_from_upload(file), include_summary)
+
+    async def parse_resume_bytes(self, data, filename, include_summary=True):
+        """
+        Parse a resume from a file's content
+
+        Parameters:
+        data (bytes): Resume file content
+        filename (str): Name of the file
+        include_summary (bool): Whether to include summary in response
+
+        Returns:
+        dict: Parsed resume data
+        """
+        return await self._parse_extracted(await self.extract_text_from_bytes(data, filename), include_summary)
+
+    async def _parse_extracted(self, extracted, include_summary):
+        text, sha256, document = extracted
 
         try:
-            parsed_data = self.resume_parser.parse_resume(text, include_summary=include_summary)
-            os.unlink(temp_path)
+            parsed_data = await self._parse_text(text, sha256, document)
+            if not include_summary:
+                parsed_data = {key: value for key, value in parsed_data.items() if key != 'summary'}
 
             return parsed_data
 
-        except Exception as e:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+        except RateLimitExceeded as e:
+            raise rate_limit_error(e)
 
+        except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
 
     async def compare_resume_to_job(self, file: UploadFile, job_description: str):
@@ -136,21 +433,35 @@ class ParserService:
         Returns:
         dict: Comparison results
         """
-        text, temp_path = await self.extract_text_from_upload(file)
+        return await self._compare_extracted(await self.extract_text_from_upload(file), job_description)
+
+    async def compare_resume_bytes_to_job(self, data, filename, job_description: str):
+        """
+        Compare a resume file's content to a job description
+
+        Parameters:
+        data (bytes): Resume file content
+        filename (str): Name of the file
+        job_description (str): Job description text
+
+        Returns:
+        dict: Comparison results
+        """
+        return await self._compare_extracted(await self.extract_text_from_bytes(data, filename), job_description)
+
+    async def _compare_extracted(self, extracted, job_description):
+        text, sha256, document = extracted
 
         try:
-            parsed_data = self.resume_parser.parse_resume(text)
-            comparison_result = self.resume_parser.compare_resume_to_jd(parsed_data, job_description)
-            os.unlink(temp_path)
+            parsed_data = await self._parse_text(text, sha256, document)
+            comparison_result = await self.resume_parser.acompare_resume_to_jd(parsed_data, job_description)
 
             return comparison_result
 
-        except Exception as e:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+        except RateLimitExceeded as e:
+            raise rate_limit_error(e)
 
+        except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error comparing resume: {str(e)}")
 
     async def spell_check_resume(self, file: UploadFile):
@@ -163,18 +474,369 @@ class ParserService:
         Returns:
         dict: Spell check results
         """
-        text, temp_path = await self.extract_text_from_upload(file)
+        return await self._spell_check_extracted(await self.extract_text_from_upload(file))
+
+    async def spell_check_resume_bytes(self, data, filename):
+        """
+        Spell check a resume file's content
+
+        Parameters:
+        data (bytes): Resume file content
+        filename (str): Name of the file
+
+        Returns:
+        dict: Spell check results
+        """
+        return await self._spell_check_extracted(await self.extract_text_from_bytes(data, filename))
+
+    async def _spell_check_extracted(self, extracted):
+        text, sha256, document = extracted
+
+        if document is not None and document['spell_check'] is not None:
+            return document['spell_check']
 
         try:
-            spell_check_result = self.resume_parser.spell_check_resume(text)
-            os.unlink(temp_path)
+            spell_check_result = await self.resume_parser.aspell_check_resume(text)
+
+            # Failed checks report an unknown severity, don't keep serving them
+            if self.document_store is not None and spell_check_result['summary']['severity'] != "unknown":
+                self.document_store.put_spell_check(sha256, spell_check_result, self.resume_parser.model_version)
 
             return spell_check_result
 
+        except RateLimitExceeded as e:
+            raise rate_limit_error(e)
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error spell checking resume: {str(e)}")
+
+    async def score_resume_quality(self, file: UploadFile, local_only=False):
+        """
+        Score a resume's quality
+
+        Parameters:
+        file (UploadFile): Uploaded resume file
+        local_only (bool): Score completeness only, without any AI calls
+
+        Returns:
+        dict: Quality metrics, suggestions and the AI assessment
+        """
+        return await self._score_quality_extracted(await self.extract_text_from_upload(file), local_only)
+
+    async def _score_quality_extracted(self, extracted, local_only):
+        text, sha256, document = extracted
+
+        try:
+            if local_only:
+                # Stored parsed data is more accurate than the outline and costs nothing
+                if document is not None and document['parsed'] is not None:
+                    resume_data = document['parsed']
+                else:
+                    resume_data = self.resume_parser.outline_resume(text)
+                return await self.resume_parser.acalculate_resume_quality_score(resume_data, local_only=True)
+
+            parsed_data = await self._parse_text(text, sha256, document)
+            stored_spell_check = document['spell_check'] if document is not None else None
+            return await self.resume_parser.acalculate_resume_quality_score(
+                parsed_data, raw_text=text, spell_check_results=stored_spell_check
+            )
+
+        except RateLimitExceeded as e:
+            raise rate_limit_error(e)
+
         except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error scoring resume: {str(e)}")
+
+    async def prepare_bulk(self, files: List[UploadFile], include_summary=True):
+        """
+        Take ownership of the files for a bulk parse that outlives the request
+
+        A single ZIP upload is opened as an archive whose members are only
+        read when their turn comes. Other uploads are copied, since FastAPI
+        closes them before a streamed response is produced; together the
+        copies keep at most bulk_memory_limit bytes in memory and spill the
+        rest to disk.
+
+        Parameters:
+        files (List[UploadFile]): Uploaded resume files, or one ZIP archive of them
+        include_summary (bool): Whether to include summaries in the results
+
+        Returns:
+        tuple: (filename, coroutine function parsing the file) pairs for parse_bulk, and a
+            function closing the copies and archive once the parse is over
+
+        Raises:
+        HTTPException: If the archive is invalid or holds too many files
+        """
+        if len(files) == 1 and files[0].filename.lower().endswith('.zip'):
+            _, stream = await asyncio.to_thread(self._spool_upload, files[0], True)
             try:
-                os.unlink(temp_path)
-            except:
-                pass
+                archive = zipfile.ZipFile(stream)
+            except zipfile.BadZipFile:
+                stream.close()
+                raise HTTPException(status_code=400, detail="Invalid ZIP archive")
+
+            def close():
+                archive.close()
+                stream.close()
+
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+                and not os.path.basename(info.filename).startswith('.')
+            ]
+            if len(members) > self.bulk_max_files:
+                close()
+                raise HTTPException(status_code=413, detail=f"Archive holds more than {self.bulk_max_files} files")
+
+            items = [(info.filename, self._bulk_member_parser(archive, info, include_summary)) for info in members]
+            return items, close
+
+        if len(files) > self.bulk_max_files:
+            raise HTTPException(status_code=413, detail=f"More than {self.bulk_max_files} files uploaded")
+
+        memory_limit = min(UPLOAD_MEMORY_LIMIT, self.bulk_memory_limit // max(1, len(files)))
+        streams = []
+
+        def close():
+            for stream in streams:
+                stream.close()
+
+        items = []
+        try:
+            for file in files:
+                items.append((file.filename, await self._bulk_upload_parser(file, include_summary, memory_limit, streams)))
+        except BaseException:
+            close()
+            raise
+
+        return items, close
+
+    async def _bulk_upload_parser(self, file, include_summary, memory_limit, streams):
+        size = file.size
+        if size is None:
+            size = file.file.seek(0, os.SEEK_END)
+        if size > self.bulk_max_file_bytes:
+            # Not copied at all, the file only gets its error line
+            async def reject():
+                raise HTTPException(status_code=413, detail=f"File is larger than {self.bulk_max_file_bytes} bytes")
+
+            return reject
+
+        file.file.seek(0)
+        sha256, stream = await asyncio.to_thread(self._spool_upload, file, True, memory_limit)
+        streams.append(stream)
+
+        async def parse():
+            try:
+                self.validate_file_extension(file.filename)
+                return await self._parse_extracted(
+                    await self._extract_text(stream, sha256, file.filename), include_summary
+                )
+            finally:
+                stream.close()
+
+        return parse
+
+    def _bulk_member_parser(self, archive, info, include_summary):
+        async def parse():
+            # zipfile stops decompressing at the declared size, so this bounds memory per member
+            if info.file_size > self.bulk_max_file_bytes:
+                raise HTTPException(status_code=413, detail=f"File is larger than {self.bulk_max_file_bytes} bytes")
+            filename = os.path.basename(info.filename)
+            self.validate_file_extension(filename)
+            data = await asyncio.to_thread(archive.read, info)
+            return await self.parse_resume_bytes(data, filename, include_summary)
+
+        return parse
+
+    async def parse_bulk(self, items):
+        """
+        Parse many resumes concurrently, yielding each result as soon as it is ready
 
-            raise HTTPException(status_code=500, detail=f"Error spell checking resume: {str(e)}")
+        At most bulk_concurrency resumes are processed at a time, so only
+        that many archive members are decompressed into memory at once.
+
+        Parameters:
+        items (list): (filename, parse coroutine function) pairs from prepare_bulk
+
+        Returns:
+        async generator: Per resume dicts with the 'index' and 'filename', and
+            either the parsed 'result' or the 'error' and its 'status_code'
+        """
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def run(index, filename, parse):
+            async with semaphore:
+                try:
+                    result = sanitize_response(await parse())
+                except Exception as e:
+                    return {
+                        'index': index,
+                        'filename': filename,
+                        'status': 'failed',
+                        'status_code': getattr(e, 'status_code', 500),
+                        'error': getattr(e, 'detail', str(e))
+                    }
+            return {'index': index, 'filename': filename, 'status': 'completed', 'result': result}
+
+        tasks = [asyncio.create_task(run(index, filename, parse)) for index, (filename, parse) in enumerate(items)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # The client went away, don't keep parsing for nobody
+            for task in tasks:
+                task.cancel()
+
+    async def rank_resumes(self, files: List[UploadFile], job_description: str, top_k=10):
+        """
+        Rank many resumes against one job description
+
+        The job requirements are extracted once and every resume is parsed
+        concurrently, then scored without further AI calls.
+
+        Parameters:
+        files (List[UploadFile]): Uploaded resume files
+        job_description (str): Job description text
+        top_k (int): Number of best matching resumes to return, at least 1
+
+        Returns:
+        dict: Top ranked results, plus the files that couldn't be processed
+
+        Raises:
+        HTTPException: If top_k is below 1, or the job requirements can't be extracted
+        """
+        # Checked before any AI call; a negative slice would otherwise drop the best matches
+        if top_k < 1:
+            raise HTTPException(status_code=400, detail="top_k must be at least 1")
+
+        try:
+            jd_requirements = self.resume_parser.compile_jd_requirements(
+                await self.resume_parser.aextract_jd_requirements(job_description)
+            )
+        except RateLimitExceeded as e:
+            raise rate_limit_error(e)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error extracting job requirements: {str(e)}")
+
+        semaphore = asyncio.Semaphore(self.rank_concurrency)
+
+        async def score_resume(file):
+            async with semaphore:
+                text, sha256, document = await self.extract_text_from_upload(file)
+                parsed_data = await self._parse_text(text, sha256, document)
+
+            result = self.resume_parser.match_resume_to_requirements(parsed_data, jd_requirements)
+            result['filename'] = file.filename
+            result['name'] = parsed_data['contact_info'].get('name')
+            return result
+
+        outcomes = await asyncio.gather(*[score_resume(file) for file in files], return_exceptions=True)
+
+        ranked = []
+        failed = []
+        for file, outcome in zip(files, outcomes):
+            if isinstance(outcome, Exception):
+                failed.append({'filename': file.filename, 'error': getattr(outcome, 'detail', str(outcome))})
+            else:
+                ranked.append(outcome)
+
+        ranked.sort(key=lambda result: result['match_score'], reverse=True)
+
+        return {
+            'total': len(files),
+            'ranked': ranked[:top_k],
+            'failed': failed
+        }
+
+    def invalidate_document(self, sha256):
+        """
+        Drop everything stored for a file so the next upload is processed from scratch
+
+        Parameters:
+        sha256 (str): Hex SHA-256 of the file content
+
+        Returns:
+        bool: Whether anything was stored for the file
+        """
+        if self.document_store is None:
+            return False
+        return self.document_store.invalidate(sha256.lower())
+
+    async def run_job(self, task, data, filename, params):
+        """
+        Process a queued job, producing the same result as the matching endpoint
+
+        Parameters:
+        task (str): One of JOB_TASKS
+        data (bytes): Resume file content
+        filename (str): Name of the file
+        params (dict): 'include_summary' for parse jobs, 'job_description' for compare jobs
+
+        Returns:
+        dict: Job result
+
+        Raises:
+        HTTPException: If processing fails
+        """
+        if task == 'parse':
+            return sanitize_response(await self.parse_resume_bytes(data, filename, params.get('include_summary', True)))
+
+        if task == 'compare':
+            comparison_result = await self.compare_resume_bytes_to_job(data, filename, params['job_description'])
+            comparison_result['match_score'] = format_match_score(comparison_result['match_score'] / 100)
+            return comparison_result
+
+        if task == 'spell-check':
+            return await self.spell_check_resume_bytes(data, filename)
+
+        raise HTTPException(status_code=400, detail=f"Unknown job task: {task}")
+
+    async def warm_up(self):
+        """
+        Prepare the service for its first requests
+
+        Starts the extraction workers and, unless LLM_WARMUP is "false",
+        opens the Gemini connection with a tiny prompt.
+        """
+        if self.extraction_pool is not None:
+            await self.extraction_pool.warm_up()
+
+        if os.getenv("LLM_WARMUP", "true").lower() != "false":
+            await self.resume_parser.gemini_client.awarm_up()
+
+    def stats(self):
+        """
+        Get metrics for the shared caches, limits and workers
+
+        Returns:
+        dict: Stats of each component, None for disabled ones
+        """
+        cache = self.resume_parser.gemini_client.cache
+        line_cache = self.resume_parser.spell_checker.line_cache
+        return {
+            "llm_cache": cache.stats() if cache is not None else None,
+            "spell_check_line_cache": line_cache.stats() if line_cache is not None else None,
+            "llm_rate_limiter": self.resume_parser.gemini_client.rate_limiter.stats(),
+            "document_store": self.document_store.stats() if self.document_store is not None else None,
+            "extraction_pool": self.extraction_pool.stats() if self.extraction_pool is not None else None
+        }
+
+    def shutdown(self):
+        """Stop the extraction worker processes"""
+        if self.extraction_pool is not None:
+            self.extraction_pool.shutdown()
+
+
+def get_parser_service(request: Request) -> ParserService:
+    """
+    Dependency returning the application's shared parser service
+
+    Parameters:
+    request (Request): Incoming request
+
+    Returns:
+    ParserService: Service created by the application lifespan
+    """
+    return request.app.state.parser_service
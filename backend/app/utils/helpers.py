@@ -1,48 +1,99 @@
-import json
-import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+
+class _SectionModel(BaseModel):
+    # Lax mode, so phone numbers and the like given as numbers become strings; unknown keys are dropped
+    model_config = ConfigDict(extra='ignore', coerce_numbers_to_str=True)
+
+
+class _ContactInfo(_SectionModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+    portfolio: Optional[str] = None
+
+
+class _Skills(_SectionModel):
+    technical: List[str] = Field(default_factory=list)
+    soft: List[str] = Field(default_factory=list)
+    languages: List[str] = Field(default_factory=list)
+    tools: List[str] = Field(default_factory=list)
+
+
+class _ResumeResponse(_SectionModel):
+    contact_info: _ContactInfo = Field(default_factory=_ContactInfo)
+    education: List[Dict[str, Any]] = Field(default_factory=list)
+    work_experience: List[Dict[str, Any]] = Field(default_factory=list)
+    skills: _Skills = Field(default_factory=_Skills)
+    projects: List[Dict[str, Any]] = Field(default_factory=list)
+    certifications: List[Dict[str, Any]] = Field(default_factory=list)
+    publications: List[Dict[str, Any]] = Field(default_factory=list)
+    summary: Optional[str] = None
+
+
+# Validation schema built once at import rather than on every request
+_resume_response_validator = _ResumeResponse.__pydantic_validator__
+
+
+def _text(value: Any) -> Optional[str]:
+    """Keep strings, turn numbers into strings and drop anything else"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return None
+
+
+def _as_list(value: Any) -> List[Any]:
+    """Wrap a single value in a list, None becomes an empty list"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _coerce_section(data: Any, model: type) -> Dict[str, Any]:
+    """Coerce a section's fields to their types, dropping values that can't be"""
+    if not isinstance(data, dict):
+        return {}
+    section = {}
+    for name, field in model.model_fields.items():
+        if name not in data:
+            continue
+        value = data[name]
+        if field.annotation is Optional[str]:
+            section[name] = _text(value)
+        elif field.annotation is List[str]:
+            section[name] = [text for text in map(_text, _as_list(value)) if text is not None]
+        elif field.annotation is List[Dict[str, Any]]:
+            section[name] = [entry for entry in _as_list(value) if isinstance(entry, dict)]
+        else:
+            section[name] = _coerce_section(value, field.annotation)
+    return section
+
 
 def sanitize_response(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Sanitize and validate the response from the resume parser
     to ensure it matches the expected structure
-    """
-    expected_structure = {
-        'contact_info': {
-            'name': None,
-            'email': None,
-            'phone': None,
-            'location': None,
-            'linkedin': None,
-            'github': None,
-            'portfolio': None
-        },
-        'education': [],
-        'work_experience': [],
-        'skills': {
-            'technical': [],
-            'soft': [],
-            'languages': [],
-            'tools': []
-        },
-        'projects': [],
-        'certifications': [],
-        'publications': [],
-        'summary': None
-    }
-
-    result = json.loads(json.dumps(expected_structure))
-
-    for key in expected_structure:
-        if key in data:
-            if isinstance(expected_structure[key], dict):
-                if isinstance(data[key], dict):
-                    for subkey in expected_structure[key]:
-                        if subkey in data[key]:
-                            result[key][subkey] = data[key][subkey]
-            else:
-                result[key] = data[key]
 
+    Values of the wrong type are coerced where it's clear how (a single
+    skill becomes a list of one, None an empty list) and dropped otherwise.
+    """
+    try:
+        resume = _resume_response_validator.validate_python(data)
+    except ValidationError:
+        # Only a malformed response pays for coercing every field in Python
+        resume = _resume_response_validator.validate_python(_coerce_section(data, _ResumeResponse))
+    # Shallow dump: the values were already validated, and entries are returned as the model gave them
+    result = dict(resume.__dict__)
+    result['contact_info'] = dict(resume.contact_info.__dict__)
+    result['skills'] = dict(resume.skills.__dict__)
     return result
 
 def format_match_score(score: float) -> str:
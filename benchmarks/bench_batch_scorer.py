@@ -0,0 +1,59 @@
+"""
+Time re-ranking a resume pool with BatchScorer against scoring each resume with JobMatcher
+
+The first job a pool is scored against pays for scanning every resume for
+its requirements; a job whose requirements have been seen before is scored
+with a single matrix product.
+
+Usage: python benchmarks/bench_batch_scorer.py [resumes] [requirements per category]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_requirement_matcher import generate
+from model.analyzers.batch_scorer import BatchScorer
+from model.analyzers.job_matcher import JobMatcher
+
+
+def main():
+    resume_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    requirement_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    resumes = [generate(requirement_count, 30, seed=seed)[0] for seed in range(resume_count)]
+    jobs = [generate(requirement_count, 30, seed=resume_count + seed)[1] for seed in range(5)]
+
+    matcher = JobMatcher(None)
+    started = time.perf_counter()
+    compiled = matcher.compile_requirements(jobs[0])
+    expected = [matcher.match_requirements(resume_data, compiled)['match_score'] for resume_data in resumes]
+    matcher_seconds = time.perf_counter() - started
+
+    scorer = BatchScorer(resumes)
+    started = time.perf_counter()
+    scores = scorer.score([jobs[0]])[:, 0]
+    first_seconds = time.perf_counter() - started
+    assert scores.tolist() == expected
+
+    started = time.perf_counter()
+    scorer.score(jobs[1:])
+    encode_seconds = time.perf_counter() - started
+
+    repeats = 20
+    started = time.perf_counter()
+    for _ in range(repeats):
+        top = scorer.rank(jobs[0], top_k=10)
+    rerank_seconds = (time.perf_counter() - started) / repeats
+    assert [score for _, score in top] == sorted(expected, reverse=True)[:10]
+
+    print(f"{resume_count} resumes, {requirement_count} technical requirements per job, "
+          f"{scorer.vocabulary_size} requirements encoded")
+    print(f"JobMatcher, one resume at a time  {matcher_seconds * 1000:9.1f} ms per job")
+    print(f"BatchScorer, first job            {first_seconds * 1000:9.1f} ms (scans every resume)")
+    print(f"BatchScorer, 4 more jobs          {encode_seconds * 1000:9.1f} ms (scans for their new requirements)")
+    print(f"BatchScorer, re-ranking a job     {rerank_seconds * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare the streaming DOCX XML backend with python-docx for latency and peak RSS
+
+Each backend runs in a fresh process, so peak RSS growth is measured from
+the same starting point.
+
+Usage: python benchmarks/bench_docx_extraction.py [paragraphs] [table rows]
+"""
+import io
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import lines, make_docx
+from model.extractors import backends
+
+BACKENDS = {'xml': backends.docx_xml, 'python-docx': backends.docx_python_docx}
+
+
+def run_backend(name, data, repeats):
+    """
+    Extract a document with one backend
+
+    Returns:
+    tuple: (seconds per extraction, peak RSS growth in MB, characters extracted)
+    """
+    function = BACKENDS[name]
+    # Import the backend's library before taking the baseline
+    function(io.BytesIO(make_docx(['warm up'])))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        text = function(io.BytesIO(data))
+    seconds = (time.perf_counter() - started) / repeats
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / unit
+    return seconds, growth, len(text)
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    table_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    data = make_docx(lines(paragraphs), table_rows=table_rows)
+
+    print(f"{paragraphs} paragraphs, {table_rows} table rows, {len(data) // 1024} KB")
+    for name in BACKENDS:
+        with ProcessPoolExecutor(1) as executor:
+            seconds, growth, chars = executor.submit(run_backend, name, data, 3).result()
+        print(f"{name:12} {seconds * 1000:8.1f} ms   +{growth:6.1f} MB peak RSS   {chars} characters")
+
+
+if __name__ == '__main__':
+    main()
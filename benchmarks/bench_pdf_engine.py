@@ -0,0 +1,66 @@
+"""
+Compare PdfExtractionEngine with the serial PyPDF2 loop it replaced
+
+Usage: python benchmarks/bench_pdf_engine.py [documents] [pages] [workers]
+"""
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+
+from benchmarks.corpus import lines, make_pdf
+from model.extractors.pdf_engine import PdfExtractionEngine
+
+
+def legacy_extract_text_from_pdf(pdf_file):
+    """The previous implementation: every page in order, concatenated one at a time"""
+    text = ""
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    for page_num in range(len(pdf_reader.pages)):
+        text += pdf_reader.pages[page_num].extract_text()
+    return text
+
+
+def timed(function, documents):
+    started = time.perf_counter()
+    for document in documents:
+        function(document)
+    return time.perf_counter() - started
+
+
+def main():
+    document_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    page_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+
+    documents = [
+        make_pdf([lines(50, seed=document * page_count + page) for page in range(page_count)])
+        for document in range(document_count)
+    ]
+    engine = PdfExtractionEngine(pages_per_task=max(1, page_count // workers))
+    limited = PdfExtractionEngine(pages_per_task=max(1, page_count // workers), max_chars=8000)
+
+    with ProcessPoolExecutor(workers) as executor:
+        # Start the workers and import PyPDF2 in each before timing
+        engine.extract(documents[0], executor)
+        assert engine.extract(documents[0], executor)['text'] == legacy_extract_text_from_pdf(io.BytesIO(documents[0]))
+
+        results = [
+            ('legacy serial', timed(lambda data: legacy_extract_text_from_pdf(io.BytesIO(data)), documents)),
+            ('engine in order', timed(engine.extract, documents)),
+            (f'engine {workers} workers', timed(lambda data: engine.extract(data, executor), documents)),
+            (f'engine {workers} workers, 8000 chars', timed(lambda data: limited.extract(data, executor), documents)),
+        ]
+
+    print(f"{document_count} documents of {page_count} pages")
+    for name, seconds in results:
+        print(f"{name:32} {seconds / document_count * 1000:8.1f} ms per document")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Compare RequirementMatcher with the nested substring scans it replaced
+
+Usage: python benchmarks/bench_requirement_matcher.py [requirements per category] [resume items]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.analyzers.skill_index import RequirementMatcher
+
+
+def legacy_match_requirements(resume_data, jd_requirements):
+    """
+    The previous implementation: every requirement checked against every resume item
+
+    Returns:
+    tuple: (matches, gaps, match score) with matches and gaps keyed by category
+    """
+    matches = {'technical': [], 'soft': [], 'education': [], 'experience': []}
+    gaps = {'technical': [], 'soft': [], 'education': [], 'experience': []}
+
+    for category, key in (('technical', 'technical_skills'), ('soft', 'soft_skills')):
+        resume_skills = [skill.lower() for skill in resume_data['skills'].get(category, [])]
+        for skill in [skill.lower() for skill in jd_requirements.get(key, [])]:
+            if any(skill in resume_skill for resume_skill in resume_skills):
+                matches[category].append(skill)
+            else:
+                gaps[category].append(skill)
+
+    for req in jd_requirements.get('education_requirements', []):
+        req_lower = req.lower()
+        for edu in resume_data.get('education', []):
+            degree = (edu.get('degree') or '').lower()
+            if req_lower in degree or any(word in degree for word in req_lower.split()):
+                matches['education'].append(req)
+                break
+        else:
+            gaps['education'].append(req)
+
+    for req in jd_requirements.get('experience_requirements', []):
+        req_lower = req.lower()
+        for exp in resume_data.get('work_experience', []):
+            title = (exp.get('job_title') or '').lower()
+            responsibilities = exp.get('responsibilities')
+            text = ' '.join(responsibilities).lower() if isinstance(responsibilities, list) else ''
+            if req_lower in title or req_lower in text:
+                matches['experience'].append(req)
+                break
+        else:
+            gaps['experience'].append(req)
+
+    total_requirements = sum(len(matches[category]) + len(gaps[category]) for category in matches)
+    if total_requirements == 0:
+        match_score = 0
+    else:
+        match_score = round(sum(len(category_matches) for category_matches in matches.values()) / total_requirements * 100)
+    return matches, gaps, match_score
+
+
+def generate(requirement_count, item_count, seed=0):
+    """
+    Random job requirements and a resume drawn from the same vocabulary
+
+    Returns:
+    tuple: (resume data, job requirements)
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"skill{index} framework" for index in range(requirement_count * 8)]
+    titles = [f"senior engineer {index}" for index in range(item_count)]
+    jd_requirements = {
+        'technical_skills': rng.sample(vocabulary, requirement_count),
+        'soft_skills': rng.sample(vocabulary, requirement_count // 4),
+        'education_requirements': [f"master of science {index}" for index in range(4)],
+        'experience_requirements': rng.sample(vocabulary, requirement_count // 4)
+    }
+    resume_data = {
+        'skills': {'technical': rng.sample(vocabulary, item_count), 'soft': rng.sample(vocabulary, item_count // 4)},
+        'education': [{'degree': 'Bachelor of Science'}],
+        'work_experience': [
+            {'job_title': title, 'responsibilities': rng.sample(vocabulary, 5)} for title in titles[:8]
+        ]
+    }
+    return resume_data, jd_requirements
+
+
+def main():
+    requirement_count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    item_count = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    resume_data, jd_requirements = generate(requirement_count, item_count)
+    resumes = 20
+
+    started = time.perf_counter()
+    matcher = RequirementMatcher(jd_requirements)
+    compile_seconds = time.perf_counter() - started
+    assert matcher.match(resume_data) == legacy_match_requirements(resume_data, jd_requirements)
+
+    started = time.perf_counter()
+    for _ in range(resumes):
+        legacy_match_requirements(resume_data, jd_requirements)
+    legacy_seconds = (time.perf_counter() - started) / resumes
+
+    started = time.perf_counter()
+    for _ in range(resumes):
+        matcher.match(resume_data)
+    matcher_seconds = (time.perf_counter() - started) / resumes
+
+    print(f"{requirement_count} technical requirements, {item_count} resume skills")
+    print(f"legacy substring scans   {legacy_seconds * 1000:8.2f} ms per resume")
+    print(f"compiled matcher         {matcher_seconds * 1000:8.2f} ms per resume")
+    print(f"compiling the matcher    {compile_seconds * 1000:8.2f} ms once per job description")
+
+
+if __name__ == '__main__':
+    main()
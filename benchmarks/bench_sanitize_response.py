@@ -0,0 +1,98 @@
+"""
+Compare sanitize_response with the sanitizer it replaced
+
+Usage: python benchmarks/bench_sanitize_response.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app.utils.helpers import sanitize_response
+
+
+def legacy_sanitize_response(data):
+    """The previous implementation: deep-copy a template through JSON, then copy known keys"""
+    expected_structure = {
+        'contact_info': {
+            'name': None,
+            'email': None,
+            'phone': None,
+            'location': None,
+            'linkedin': None,
+            'github': None,
+            'portfolio': None
+        },
+        'education': [],
+        'work_experience': [],
+        'skills': {
+            'technical': [],
+            'soft': [],
+            'languages': [],
+            'tools': []
+        },
+        'projects': [],
+        'certifications': [],
+        'publications': [],
+        'summary': None
+    }
+
+    result = json.loads(json.dumps(expected_structure))
+
+    for key in expected_structure:
+        if key in data:
+            if isinstance(expected_structure[key], dict):
+                if isinstance(data[key], dict):
+                    for subkey in expected_structure[key]:
+                        if subkey in data[key]:
+                            result[key][subkey] = data[key][subkey]
+            else:
+                result[key] = data[key]
+
+    return result
+
+
+SAMPLE = {
+    'contact_info': {
+        'name': 'Jane Doe',
+        'email': 'jane.doe@example.com',
+        'phone': '+1 555 010 2030',
+        'location': 'Austin, TX',
+        'linkedin': 'linkedin.com/in/janedoe',
+        'github': 'github.com/janedoe',
+        'portfolio': None
+    },
+    'education': [
+        {'institution': 'State University', 'degree': 'BSc', 'field_of_study': 'Computer Science',
+         'start_date': '2012', 'end_date': '2016', 'gpa': '3.7'}
+    ],
+    'work_experience': [
+        {'company': f'Company {index}', 'title': 'Software Engineer', 'start_date': '2018', 'end_date': '2020',
+         'responsibilities': ['Built services in Python', 'Maintained CI pipelines', 'Mentored interns']}
+        for index in range(4)
+    ],
+    'skills': {
+        'technical': ['Python', 'Go', 'SQL', 'Kubernetes', 'Docker', 'AWS', 'PostgreSQL', 'Redis'],
+        'soft': ['Communication', 'Leadership'],
+        'languages': ['English', 'Spanish'],
+        'tools': ['Git', 'Jira', 'Terraform']
+    },
+    'projects': [{'name': 'Resume parser', 'description': 'Parses resumes', 'technologies': ['Python']}],
+    'certifications': [{'name': 'AWS Solutions Architect', 'issuer': 'Amazon', 'date': '2021'}],
+    'publications': [],
+    'summary': 'Backend engineer with eight years of experience.',
+    'raw_text': 'x' * 4000
+}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for name, function in (('legacy', legacy_sanitize_response), ('current', sanitize_response)):
+        seconds = min(timeit.repeat(lambda: function(SAMPLE), number=iterations, repeat=5))
+        print(f"{name:8} {seconds / iterations * 1e6:8.2f} us per call")
+
+
+if __name__ == '__main__':
+    main()
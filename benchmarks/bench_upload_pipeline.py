@@ -0,0 +1,114 @@
+"""
+Compare the in-memory upload path with the temporary file path it replaced
+
+Each request starts from an upload held in a SpooledTemporaryFile, as
+Starlette hands it over, and follows ParserService's path with an
+extraction pool: PDFs have their pages counted in-process, and only those
+longer than one page range are written to a temporary file for the range
+workers. Worker calls run in this process, so their I/O is counted too;
+pickling the content across to a worker process is not measured. I/O is
+read from /proc/self/io where available.
+
+Usage: python benchmarks/bench_upload_pipeline.py [requests]
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from app.services.parser_service import ParserService, UPLOAD_CHUNK_SIZE
+from benchmarks.corpus import lines, make_docx, make_pdf
+from model.extractors.pdf_engine import PdfExtractionEngine, count_pdf_pages
+from model.extractors.text_extractor import TextExtractor
+
+ENGINE = PdfExtractionEngine(pages_per_task=8)
+
+
+async def run_here(func, *args):
+    """Stands in for ExtractionPool.run"""
+    return func(*args)
+
+
+def legacy_extract(upload, suffix):
+    """The previous implementation: copy to a named temporary file, re-open it by path, then unlink it"""
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        temp_path = temp_file.name
+        for chunk in iter(lambda: upload.file.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            temp_file.write(chunk)
+    try:
+        return digest.hexdigest(), TextExtractor.extract_text_from_file(temp_path)
+    finally:
+        os.unlink(temp_path)
+
+
+def current_extract(upload, suffix):
+    """Hash the upload's own spooled file and extract from its content, as ParserService does with a pool"""
+    sha256, stream = ParserService._spool_upload(None, upload)
+    data = stream.read()
+    if suffix == '.pdf':
+        page_count = count_pdf_pages(data)
+        if ENGINE.splits(page_count):
+            return sha256, asyncio.run(ENGINE.aextract(data, run_here, 2, page_count))['text']
+    return sha256, TextExtractor.extract_text_from_uploaded_file(data)
+
+
+def upload(data):
+    file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    file.write(data)
+    file.seek(0)
+    return SimpleNamespace(file=file)
+
+
+def io_counters():
+    """Read and write system calls so far, None where /proc/self/io isn't available"""
+    try:
+        with open('/proc/self/io') as file:
+            counters = dict(line.split(': ') for line in file.read().splitlines())
+    except OSError:
+        return None
+    return int(counters['syscr']), int(counters['syscw'])
+
+
+def measure(function, data, suffix, requests):
+    uploads = [upload(data) for _ in range(requests)]
+    before = io_counters()
+    started = time.perf_counter()
+    for item in uploads:
+        function(item, suffix)
+    seconds = (time.perf_counter() - started) / requests
+    after = io_counters()
+    if before is None or after is None:
+        return seconds, None
+    return seconds, tuple((end - start) / requests for start, end in zip(before, after))
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    documents = [
+        ('.txt', '\n'.join(lines(400)).encode('utf-8')),
+        ('.pdf', make_pdf([lines(50, seed=page) for page in range(2)])),
+        # Split into page ranges
+        ('.pdf', make_pdf([lines(50, seed=page) for page in range(20)])),
+        ('.docx', make_docx(lines(200)))
+    ]
+
+    for suffix, data in documents:
+        assert legacy_extract(upload(data), suffix) == current_extract(upload(data), suffix)
+        print(f"{suffix[1:]} upload, {len(data) // 1024} KB")
+        for name, function in (('legacy temp file', legacy_extract), ('in memory', current_extract)):
+            seconds, syscalls = measure(function, data, suffix, requests)
+            io = f"{syscalls[0]:6.1f} reads {syscalls[1]:6.1f} writes" if syscalls else "I/O counters unavailable"
+            print(f"  {name:18} {seconds * 1000:8.3f} ms per request, {io} per request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Generated documents for the benchmarks"""
+import io
+
+WORDS = ('designed built maintained deployed python services pipelines kubernetes clusters data '
+         'models customers latency reduced improved team analytics platform reporting migration').split()
+
+
+def lines(count, seed=0):
+    """
+    Resume-like lines of text
+
+    Parameters:
+    count (int): Number of lines
+    seed (int): Varies the text between documents
+
+    Returns:
+    list: Lines of text
+    """
+    return [
+        ' '.join(WORDS[(seed + line * 7 + word * 3) % len(WORDS)] for word in range(12))
+        for line in range(count)
+    ]
+
+
+def make_pdf(pages):
+    """
+    Build a PDF with one Helvetica text line per given line
+
+    Parameters:
+    pages (list): Lines of text for each page
+
+    Returns:
+    bytes: PDF file content
+    """
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join(f'{4 + 2 * index} 0 R' for index in range(len(pages))), len(pages))).encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+    ]
+    for index, page_lines in enumerate(pages):
+        content = 'BT /F1 10 Tf 12 TL 72 740 Td ' + ' '.join(f'({line}) Tj T*' for line in page_lines) + ' ET'
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>'
+        ).encode())
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream'.encode())
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(output.tell())
+        output.write(f'{number} 0 obj\n'.encode() + body + b'\nendobj\n')
+    xref = output.tell()
+    output.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode())
+    for offset in offsets:
+        output.write(f'{offset:010d} 00000 n \n'.encode())
+    output.write(f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+    return output.getvalue()
+
+
+def make_docx(paragraphs, table_rows=0):
+    """
+    Build a DOCX with python-docx
+
+    Parameters:
+    paragraphs (list): Paragraph texts
+    table_rows (int): Rows of a three-column table added after the paragraphs
+
+    Returns:
+    bytes: DOCX file content
+    """
+    import docx
+
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    if table_rows:
+        table = document.add_table(rows=table_rows, cols=3)
+        for row_index, row in enumerate(table.rows):
+            for column, cell in enumerate(row.cells):
+                cell.text = f'cell {row_index}.{column}'
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
@@ -1,7 +1,12 @@
 """Resume parsing and analysis model package"""
 
-# Import the ResumeParser class for direct access from the model package
-from model.parsers.resume_parser import ResumeParser
-
 # Export the ResumeParser class
-__all__ = ['ResumeParser'] 
\ No newline at end of file
+__all__ = ['ResumeParser']
+
+
+def __getattr__(name):
+    """Import ResumeParser on first access, so importing any model submodule doesn't load its dependencies"""
+    if name == 'ResumeParser':
+        from model.parsers.resume_parser import ResumeParser
+        return ResumeParser
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,132 @@
+"""Vectorized scoring of many parsed resumes against many job descriptions"""
+import numpy as np
+from model.analyzers.skill_index import RequirementMatcher
+
+
+# Requirement categories, with the key each one has in extracted JD requirements
+CATEGORIES = [
+    ('technical', 'technical_skills'),
+    ('soft', 'soft_skills'),
+    ('education', 'education_requirements'),
+    ('experience', 'experience_requirements')
+]
+
+
+class BatchScorer:
+    """
+    Encodes a pool of parsed resumes against a shared requirement vocabulary,
+    so the whole pool can be scored against any number of job descriptions
+    with matrix operations and no AI calls
+
+    Scores are the same deterministic match scores JobMatcher.match_requirements computes.
+    """
+
+    def __init__(self, resumes):
+        """
+        Initialize the scorer for a pool of resumes
+
+        Parameters:
+        resumes (list): Parsed resume data dictionaries
+        """
+        self.resumes = list(resumes)
+        self._columns = {}
+        # Boolean matrix (resumes x vocabulary): whether each resume meets each requirement
+        self._coverage = np.zeros((len(self.resumes), 0), dtype=bool)
+
+    @property
+    def vocabulary_size(self):
+        """Number of distinct requirements encoded so far"""
+        return len(self._columns)
+
+    @staticmethod
+    def _requirement_terms(jd_requirements):
+        """Yield the (category, normalized requirement) terms of a job, repeated as often as they're listed"""
+        for category, key in CATEGORIES:
+            for requirement in jd_requirements.get(key, []):
+                yield category, requirement.lower()
+
+    def _encode_terms(self, jd_requirements_list):
+        """Add columns for requirements the pool hasn't been checked against yet"""
+        new_terms = {}
+        for jd_requirements in jd_requirements_list:
+            for term in self._requirement_terms(jd_requirements):
+                if term not in self._columns and term not in new_terms:
+                    new_terms[term] = len(self._columns) + len(new_terms)
+
+        if not new_terms:
+            return
+
+        # Compile only the new terms and scan each resume once against all of them
+        terms_by_category = {category: [] for category, _ in CATEGORIES}
+        for category, requirement in new_terms:
+            terms_by_category[category].append(requirement)
+        matcher = RequirementMatcher({key: terms_by_category[category] for category, key in CATEGORIES})
+
+        category_columns = {
+            category: np.array([new_terms[(category, requirement)] for requirement in terms_by_category[category]], dtype=np.intp) - len(self._columns)
+            for category, _ in CATEGORIES
+        }
+
+        coverage = np.zeros((len(self.resumes), len(new_terms)), dtype=bool)
+        for row, resume_data in enumerate(self.resumes):
+            found = matcher.find_matches(resume_data)
+            for category, _ in CATEGORIES:
+                if found[category]:
+                    coverage[row, category_columns[category][sorted(found[category])]] = True
+
+        self._columns.update(new_terms)
+        self._coverage = np.hstack([self._coverage, coverage])
+
+    def _requirement_matrix(self, jd_requirements_list):
+        """Build the (jobs x vocabulary) matrix counting how often each job lists each requirement"""
+        requirements = np.zeros((len(jd_requirements_list), len(self._columns)), dtype=np.float32)
+        for row, jd_requirements in enumerate(jd_requirements_list):
+            for term in self._requirement_terms(jd_requirements):
+                requirements[row, self._columns[term]] += 1
+        return requirements
+
+    def score(self, jd_requirements_list, chunk_size=4096):
+        """
+        Compute the match score of every resume against every job
+
+        Parameters:
+        jd_requirements_list (list): Requirements extracted from each job description
+        chunk_size (int): Number of resumes multiplied at a time, bounding memory use
+
+        Returns:
+        numpy.ndarray: Integer match scores (0-100) with shape (resumes, jobs)
+        """
+        jd_requirements_list = list(jd_requirements_list)
+        self._encode_terms(jd_requirements_list)
+
+        requirements = self._requirement_matrix(jd_requirements_list)
+        totals = requirements.sum(axis=1, dtype=np.float64)
+
+        scores = np.zeros((len(self.resumes), len(jd_requirements_list)), dtype=np.int64)
+        for start in range(0, len(self.resumes), chunk_size):
+            coverage = self._coverage[start:start + chunk_size].astype(np.float32)
+            matched = coverage @ requirements.T
+            with np.errstate(divide='ignore', invalid='ignore'):
+                percentages = np.where(totals > 0, matched / totals * 100, 0)
+            scores[start:start + chunk_size] = np.round(percentages)
+        return scores
+
+    def rank(self, jd_requirements, top_k=10):
+        """
+        Rank the resume pool against a single job
+
+        Parameters:
+        jd_requirements (dict): Requirements extracted from the job description
+        top_k (int): Number of best matching resumes to return
+
+        Returns:
+        list: (resume index, match score) pairs, best match first
+        """
+        scores = self.score([jd_requirements])[:, 0]
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(index), int(scores[index])) for index in top]
@@ -1,5 +1,10 @@
 """Resume to job description comparison functionality"""
 import re
+import hashlib
+import threading
+from collections import OrderedDict
+from model.helpers.rate_limiter import RateLimitExceeded
+from model.analyzers.skill_index import RequirementMatcher
 
 
 class JobMatcher:
@@ -7,28 +12,22 @@ class JobMatcher:
     Compare a resume to a job description to evaluate match quality
     """
     
-    def __init__(self, gemini_client):
+    def __init__(self, gemini_client, max_cached_requirements=256):
         """
         Initialize the JobMatcher
         
         Parameters:
         gemini_client (GeminiClient): Initialized Gemini client for AI operations
+        max_cached_requirements (int): Number of job descriptions whose extracted requirements are kept in memory
         """
         self.gemini_client = gemini_client
+        self.max_cached_requirements = max_cached_requirements
+        self._requirements_cache = OrderedDict()
+        self._requirements_lock = threading.Lock()
     
-    def compare_resume_to_job(self, resume_data, job_description_text):
-        """
-        Compare a parsed resume to a job description and provide a match score with recommendations
-        
-        Parameters:
-        resume_data (dict): The parsed resume data
-        job_description_text (str): The job description text
-        
-        Returns:
-        dict: Matching score, skill matches/gaps, and recommendations
-        """
-        # Extract skills from job description using Gemini
-        prompt = f"""Extract ALL required skills and qualifications from this job description. 
+    def _build_requirements_prompt(self, job_description_text):
+        """Build the prompt extracting requirements from a job description"""
+        return f"""Extract ALL required skills and qualifications from this job description. 
         Categorize them as:
         1. Technical skills: Programming languages, frameworks, technologies
         2. Soft skills: Communication, teamwork, etc.
@@ -48,145 +47,213 @@ class JobMatcher:
         Job Description:
         {job_description_text}
         """
+
+    def _normalize_requirements(self, jd_requirements):
+        """Ensure all required keys exist in the extracted requirements"""
+        for key in ["technical_skills", "soft_skills", "education_requirements", "experience_requirements"]:
+            if key not in jd_requirements:
+                jd_requirements[key] = []
+        return jd_requirements
+
+    @staticmethod
+    def _job_description_key(job_description_text):
+        return hashlib.sha256(job_description_text.encode('utf-8')).hexdigest()
+
+    def _get_cached_requirements(self, key):
+        with self._requirements_lock:
+            jd_requirements = self._requirements_cache.get(key)
+            if jd_requirements is not None:
+                self._requirements_cache.move_to_end(key)
+            return jd_requirements
+
+    def _cache_requirements(self, key, jd_requirements):
+        with self._requirements_lock:
+            self._requirements_cache[key] = jd_requirements
+            self._requirements_cache.move_to_end(key)
+            while len(self._requirements_cache) > self.max_cached_requirements:
+                self._requirements_cache.popitem(last=False)
+        return jd_requirements
+
+    def extract_requirements(self, job_description_text):
+        """
+        Extract the requirements from a job description, reusing earlier extractions of the same text
         
-        try:
-            jd_requirements = self.gemini_client.generate_response(prompt)
-            
-            # Ensure all required keys exist
-            for key in ["technical_skills", "soft_skills", "education_requirements", "experience_requirements"]:
-                if key not in jd_requirements:
-                    jd_requirements[key] = []
-            
-            # Compare resume skills to job requirements
-            technical_matches = []
-            technical_gaps = []
-            soft_matches = []
-            soft_gaps = []
-            education_matches = []
-            education_gaps = []
-            experience_matches = []
-            experience_gaps = []
-            
-            # Technical skills comparison - make case insensitive
-            resume_technical = [skill.lower() for skill in resume_data['skills'].get('technical', [])]
-            jd_technical = [skill.lower() for skill in jd_requirements.get('technical_skills', [])]
-            
-            for skill in jd_technical:
-                if any(skill in rt.lower() for rt in resume_technical):
-                    technical_matches.append(skill)
-                else:
-                    technical_gaps.append(skill)
-            
-            # Soft skills comparison - make case insensitive
-            resume_soft = [skill.lower() for skill in resume_data['skills'].get('soft', [])]
-            jd_soft = [skill.lower() for skill in jd_requirements.get('soft_skills', [])]
-            
-            for skill in jd_soft:
-                if any(skill in rs.lower() for rs in resume_soft):
-                    soft_matches.append(skill)
-                else:
-                    soft_gaps.append(skill)
-            
-            # Education comparison
-            education_reqs = jd_requirements.get('education_requirements', [])
-            
-            for req in education_reqs:
-                req_lower = req.lower()
-                found = False
-                for edu in resume_data.get('education', []):
-                    degree = edu.get('degree', '').lower()
-                    if req_lower in degree or any(word in degree for word in req_lower.split()):
-                        education_matches.append(req)
-                        found = True
-                        break
-                if not found:
-                    education_gaps.append(req)
-            
-            # Experience comparison
-            experience_reqs = jd_requirements.get('experience_requirements', [])
-            
-            for req in experience_reqs:
-                req_lower = req.lower()
-                found = False
-                for exp in resume_data.get('work_experience', []):
-                    title = exp.get('job_title', '').lower()
-                    resp = ' '.join(exp.get('responsibilities', [])).lower() if isinstance(exp.get('responsibilities'), list) else ''
-                    if req_lower in title or req_lower in resp:
-                        experience_matches.append(req)
-                        found = True
-                        break
-                if not found:
-                    experience_gaps.append(req)
-            
-            # Calculate match score (weighted)
-            total_req_skills = len(jd_technical) + len(jd_soft) + len(education_reqs) + len(experience_reqs)
-            
-            if total_req_skills == 0:
-                match_score = 0
-            else:
-                total_matches = len(technical_matches) + len(soft_matches) + len(education_matches) + len(experience_matches)
-                match_score = round((total_matches / total_req_skills) * 100)
-            
-            # Generate recommendations
-            recommendations = []
-            
-            if technical_gaps:
-                recommendations.append(f"Add these technical skills to your resume: {', '.join(technical_gaps)}")
-            
-            if soft_gaps:
-                recommendations.append(f"Highlight these soft skills if you have them: {', '.join(soft_gaps)}")
-            
-            if education_gaps:
-                recommendations.append(f"Consider addressing these education requirements: {', '.join(education_gaps)}")
-            
-            if experience_gaps:
-                recommendations.append(f"Emphasize experience related to: {', '.join(experience_gaps)}")
-            
-            # Enhance recommendations with Gemini if there are gaps
-            if technical_gaps or soft_gaps or education_gaps or experience_gaps:
-                try:
-                    ai_prompt = f"""Based on the following resume and job description gaps, provide 3 specific, actionable recommendations to improve the resume:
+        Parameters:
+        job_description_text (str): The job description text
+        
+        Returns:
+        dict: Technical, soft, education and experience requirements. Shared between callers, don't modify it.
+        """
+        key = self._job_description_key(job_description_text)
+        jd_requirements = self._get_cached_requirements(key)
+        if jd_requirements is None:
+            jd_requirements = self._normalize_requirements(
+                self.gemini_client.generate_response(self._build_requirements_prompt(job_description_text))
+            )
+            self._cache_requirements(key, jd_requirements)
+        return jd_requirements
+
+    async def aextract_requirements(self, job_description_text):
+        """
+        Asynchronous version of extract_requirements
+        
+        Parameters:
+        job_description_text (str): The job description text
+        
+        Returns:
+        dict: Technical, soft, education and experience requirements. Shared between callers, don't modify it.
+        """
+        key = self._job_description_key(job_description_text)
+        jd_requirements = self._get_cached_requirements(key)
+        if jd_requirements is None:
+            jd_requirements = self._normalize_requirements(
+                await self.gemini_client.agenerate_response(self._build_requirements_prompt(job_description_text))
+            )
+            self._cache_requirements(key, jd_requirements)
+        return jd_requirements
+
+    def compile_requirements(self, jd_requirements):
+        """
+        Compile extracted requirements for scoring many resumes against the same job
+        
+        Parameters:
+        jd_requirements (dict): Requirements extracted from the job description
+        
+        Returns:
+        RequirementMatcher: Compiled requirements
+        """
+        return RequirementMatcher(jd_requirements)
+
+    def match_requirements(self, resume_data, jd_requirements):
+        """
+        Compare resume data to extracted job requirements without any AI calls
+        
+        Parameters:
+        resume_data (dict): The parsed resume data
+        jd_requirements (dict or RequirementMatcher): Requirements extracted from the job description,
+            optionally already compiled with compile_requirements
+        
+        Returns:
+        dict: Matching score, skill matches/gaps, and rule-based recommendations
+        """
+        if not isinstance(jd_requirements, RequirementMatcher):
+            jd_requirements = self.compile_requirements(jd_requirements)
+        
+        matches, gaps, match_score = jd_requirements.match(resume_data)
+        
+        # Generate recommendations
+        recommendations = []
+        
+        if gaps['technical']:
+            recommendations.append(f"Add these technical skills to your resume: {', '.join(gaps['technical'])}")
+        
+        if gaps['soft']:
+            recommendations.append(f"Highlight these soft skills if you have them: {', '.join(gaps['soft'])}")
+        
+        if gaps['education']:
+            recommendations.append(f"Consider addressing these education requirements: {', '.join(gaps['education'])}")
+        
+        if gaps['experience']:
+            recommendations.append(f"Emphasize experience related to: {', '.join(gaps['experience'])}")
+        
+        return {
+            'match_score': match_score,
+            'matches': matches,
+            'gaps': gaps,
+            'recommendations': recommendations
+        }
+
+    def _build_recommendations_prompt(self, comparison):
+        """Build the prompt asking for recommendations that close the gaps, or None if there are no gaps"""
+        gaps = comparison['gaps']
+        if not any(gaps.values()):
+            return None
+        
+        return f"""Based on the following resume and job description gaps, provide 3 specific, actionable recommendations to improve the resume:
 
                     Job Description Gaps:
-                    Technical Skills Gaps: {technical_gaps}
-                    Soft Skills Gaps: {soft_gaps}
-                    Education Gaps: {education_gaps}
-                    Experience Gaps: {experience_gaps}
+                    Technical Skills Gaps: {gaps['technical']}
+                    Soft Skills Gaps: {gaps['soft']}
+                    Education Gaps: {gaps['education']}
+                    Experience Gaps: {gaps['experience']}
                     
-                    Current Match Score: {match_score}%
+                    Current Match Score: {comparison['match_score']}%
                     
                     Give 3 specific suggestions to improve the resume for this job.
                     """
-                    
-                    ai_response = self.gemini_client.model.generate_content(ai_prompt)
-                    enhanced_recommendations = [line.strip() for line in ai_response.text.split('\n') if line.strip() and not line.strip().startswith(('1.', '2.', '3.'))]
-                    if enhanced_recommendations:
-                        recommendations.extend(enhanced_recommendations[:3])
+
+    def _add_ai_recommendations(self, comparison, ai_response_text):
+        """Append up to 3 AI recommendations to the comparison results"""
+        enhanced_recommendations = [line.strip() for line in ai_response_text.split('\n') if line.strip() and not line.strip().startswith(('1.', '2.', '3.'))]
+        if enhanced_recommendations:
+            comparison['recommendations'].extend(enhanced_recommendations[:3])
+        return comparison
+
+    def _error_result(self, error):
+        """Build the result returned when the comparison fails"""
+        return {
+            'match_score': 0,
+            'matches': {'technical': [], 'soft': [], 'education': [], 'experience': []},
+            'gaps': {'technical': [], 'soft': [], 'education': [], 'experience': []},
+            'recommendations': [f"Error processing comparison: {str(error)}"]
+        }
+
+    def compare_resume_to_job(self, resume_data, job_description_text):
+        """
+        Compare a parsed resume to a job description and provide a match score with recommendations
+        
+        Parameters:
+        resume_data (dict): The parsed resume data
+        job_description_text (str): The job description text
+        
+        Returns:
+        dict: Matching score, skill matches/gaps, and recommendations
+        """
+        try:
+            # Extract skills from job description using Gemini
+            jd_requirements = self.extract_requirements(job_description_text)
+            comparison = self.match_requirements(resume_data, jd_requirements)
+            
+            # Enhance recommendations with Gemini if there are gaps
+            ai_prompt = self._build_recommendations_prompt(comparison)
+            if ai_prompt:
+                try:
+                    self._add_ai_recommendations(comparison, self.gemini_client.generate_text(ai_prompt))
+                except Exception as e:
+                    pass
+            
+            return comparison
+            
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            return self._error_result(e)
+
+    async def acompare_resume_to_job(self, resume_data, job_description_text):
+        """
+        Asynchronous version of compare_resume_to_job
+        
+        Parameters:
+        resume_data (dict): The parsed resume data
+        job_description_text (str): The job description text
+        
+        Returns:
+        dict: Matching score, skill matches/gaps, and recommendations
+        """
+        try:
+            jd_requirements = await self.aextract_requirements(job_description_text)
+            comparison = self.match_requirements(resume_data, jd_requirements)
+            
+            ai_prompt = self._build_recommendations_prompt(comparison)
+            if ai_prompt:
+                try:
+                    self._add_ai_recommendations(comparison, await self.gemini_client.agenerate_text(ai_prompt))
                 except Exception as e:
                     pass
             
-            # Return the results
-            return {
-                'match_score': match_score,
-                'matches': {
-                    'technical': technical_matches,
-                    'soft': soft_matches,
-                    'education': education_matches,
-                    'experience': experience_matches
-                },
-                'gaps': {
-                    'technical': technical_gaps,
-                    'soft': soft_gaps,
-                    'education': education_gaps,
-                    'experience': experience_gaps
-                },
-                'recommendations': recommendations
-            }
+            return comparison
             
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            return {
-                'match_score': 0,
-                'matches': {'technical': [], 'soft': [], 'education': [], 'experience': []},
-                'gaps': {'technical': [], 'soft': [], 'education': [], 'experience': []},
-                'recommendations': [f"Error processing comparison: {str(e)}"]
-            } 
\ No newline at end of file
+            return self._error_result(e)
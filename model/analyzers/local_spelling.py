@@ -0,0 +1,312 @@
+"""Dictionary pre-pass flagging likely misspellings before a resume is sent for review"""
+import mmap
+import os
+import re
+import threading
+from functools import lru_cache
+
+# Sorted "word<TAB>frequency bucket" lines, 9 for the most common words down to 0
+VOCABULARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'vocabulary.txt')
+
+_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+# A capitalized first word is only flagged when one edit from a word at least this common,
+# roughly the 25k most frequent, so names and companies starting a line stay unflagged
+_SENTENCE_START_MIN_FREQUENCY = 2
+
+_TOKEN = re.compile(r"\S+")
+_WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+# A sentence runs to terminal punctuation followed by whitespace, or to the end of its line
+_SENTENCE = re.compile(r"\S[^\n]*?(?:[.!?](?=\s)|$)", re.MULTILINE)
+_PARAGRAPH = re.compile(r"[^\n]*\S[^\n]*(?:\n[^\n]*\S[^\n]*)*")
+_LINE = re.compile(r"[^\n]*\S[^\n]*")
+_SPLITTERS = (_PARAGRAPH, _LINE, _SENTENCE)
+
+
+class Vocabulary:
+    """
+    Word list memory-mapped from disk and binary searched in place
+
+    Nothing is loaded up front, and the pages are shared by every process
+    reading the same file.
+    """
+
+    def __init__(self, path=VOCABULARY_PATH, cache_size=50000):
+        """
+        Open the word list
+
+        Parameters:
+        path (str): Sorted vocabulary file
+        cache_size (int): Number of lookups remembered
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._lookup = lru_cache(maxsize=cache_size)(self._search)
+
+    def _search(self, word):
+        """Frequency bucket of a word, None if it isn't in the list"""
+        key = word.encode('ascii', 'ignore')
+        data = self._map
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b'\n', 0, middle) + 1
+            end = data.find(b'\n', start)
+            if end < 0:
+                end = len(data)
+            tab = data.find(b'\t', start, end)
+            entry = data[start:tab]
+            if entry < key:
+                low = end + 1
+            elif entry > key:
+                high = start
+            else:
+                return int(data[tab + 1:end])
+        return None
+
+    def frequency(self, word):
+        """
+        Look up how common a word is
+
+        Parameters:
+        word (str): Lowercase word
+
+        Returns:
+        int: Frequency bucket from 0 to 9, None for unknown words
+        """
+        return self._lookup(word)
+
+    def __contains__(self, word):
+        return self._lookup(word) is not None
+
+    def suggest(self, word, limit=3):
+        """
+        Known words one edit away, most common first
+
+        Parameters:
+        word (str): Lowercase misspelled word
+        limit (int): Maximum number of suggestions
+
+        Returns:
+        list: Suggested words
+        """
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        edits = {left + right[1:] for left, right in splits if right}
+        edits.update(left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1)
+        edits.update(left + letter + right[1:] for left, right in splits if right for letter in _LETTERS)
+        edits.update(left + letter + right for left, right in splits for letter in _LETTERS)
+        edits.discard(word)
+
+        known = [(self._lookup(edit), edit) for edit in edits]
+        known = [(frequency, edit) for frequency, edit in known if frequency is not None]
+        known.sort(key=lambda item: (-item[0], item[1]))
+        return [edit for _, edit in known[:limit]]
+
+    def close(self):
+        """Unmap the word list"""
+        self._map.close()
+
+
+_default_vocabulary = None
+_default_lock = threading.Lock()
+
+
+def get_vocabulary():
+    """
+    Get the bundled vocabulary, opened on first use and shared afterwards
+
+    Returns:
+    Vocabulary: English and technical word list
+    """
+    global _default_vocabulary
+    if _default_vocabulary is None:
+        with _default_lock:
+            if _default_vocabulary is None:
+                _default_vocabulary = Vocabulary()
+    return _default_vocabulary
+
+
+def split_sentences(text):
+    """
+    Split text into sentences, never joining separate lines
+
+    Parameters:
+    text (str): Text to split
+
+    Returns:
+    list: (start, end) character offsets of each sentence
+    """
+    return [match.span() for match in _SENTENCE.finditer(text)]
+
+
+def split_lines(text):
+    """
+    Find the non-blank lines of text
+
+    Parameters:
+    text (str): Text to split
+
+    Returns:
+    list: (start, end) character offsets of each line
+    """
+    return [match.span() for match in _LINE.finditer(text)]
+
+
+def split_text(text, max_chars, start=0, end=None, _level=0):
+    """
+    Split text into pieces of bounded length, preferring the largest boundaries
+
+    Paragraphs (blocks between blank lines) are kept whole when they fit;
+    longer ones are split into lines, then sentences, and only then cut at
+    max_chars.
+
+    Parameters:
+    text (str): Text to split
+    max_chars (int): Maximum length of a piece
+    start (int): Offset to start at
+    end (int): Offset to stop at, defaults to the end of the text
+
+    Returns:
+    list: (piece, offset into text) tuples in order, leaving out blank space between pieces
+    """
+    end = len(text) if end is None else end
+    if _level == len(_SPLITTERS):
+        return [(text[index:min(index + max_chars, end)], index) for index in range(start, end, max_chars)]
+
+    pieces = []
+    for match in _SPLITTERS[_level].finditer(text, start, end):
+        if match.end() - match.start() <= max_chars:
+            pieces.append((match.group(), match.start()))
+        else:
+            pieces.extend(split_text(text, max_chars, match.start(), match.end(), _level + 1))
+    return pieces
+
+
+class LocalSpellChecker:
+    """
+    Flags words missing from the vocabulary
+
+    Words that are usually not dictionary words in a resume are left alone:
+    capitalized words (names, companies, acronyms), words containing digits,
+    URLs, email addresses and dotted names such as file names or "node.js".
+    The capitalized first word of a sentence is checked in lowercase, but
+    only flagged when it is one edit from a common word, e.g. "Devloped";
+    other capitalized misspellings are not caught locally.
+    """
+
+    def __init__(self, vocabulary=None, min_length=3, suggestions=3):
+        """
+        Initialize the checker
+
+        Parameters:
+        vocabulary (Vocabulary): Word list, defaults to the bundled one
+        min_length (int): Shorter words are not checked
+        suggestions (int): Maximum suggestions per flagged word
+        """
+        self._vocabulary = vocabulary
+        self.min_length = min_length
+        self.suggestions = suggestions
+
+    @property
+    def vocabulary(self):
+        """Word list used for lookups"""
+        if self._vocabulary is None:
+            self._vocabulary = get_vocabulary()
+        return self._vocabulary
+
+    def _is_known(self, word):
+        vocabulary = self.vocabulary
+        if word in vocabulary:
+            return True
+        # Possessives and regular plurals of known words, which the list often leaves out
+        if word.endswith("'s"):
+            return word[:-2] in vocabulary
+        if word.endswith('ies'):
+            return word[:-3] + 'y' in vocabulary
+        if word.endswith('es') and word[:-2] in vocabulary:
+            return True
+        return word.endswith('s') and word[:-1] in vocabulary
+
+    def find_candidates(self, text):
+        """
+        Find likely misspellings
+
+        Parameters:
+        text (str): Text to check
+
+        Returns:
+        list: Dictionaries with 'word', 'offset' into text and 'suggestions'
+        """
+        text = text.replace('’', "'")
+        sentence_starts = set()
+        for start, end in split_sentences(text):
+            first_word = _WORD.search(text, start, end)
+            if first_word is not None:
+                sentence_starts.add(first_word.start())
+
+        candidates = []
+        for token in _TOKEN.finditer(text):
+            value = token.group()
+            if '@' in value or '://' in value or value.lower().startswith('www.'):
+                continue
+            if any(char.isdigit() for char in value):
+                continue
+            if '.' in value.strip('.,;:!?()[]{}"\''):
+                continue
+
+            for word in _WORD.finditer(value):
+                spelling = word.group()
+                offset = token.start() + word.start()
+                if len(spelling) < self.min_length:
+                    continue
+                if spelling.islower():
+                    if not self._is_known(spelling):
+                        candidates.append({
+                            'word': spelling,
+                            'offset': offset,
+                            'suggestions': self.vocabulary.suggest(spelling, self.suggestions)
+                        })
+                elif offset in sentence_starts and spelling[1:].islower():
+                    suggestions = self._sentence_start_suggestions(spelling)
+                    if suggestions:
+                        candidates.append({'word': spelling, 'offset': offset, 'suggestions': suggestions})
+        return candidates
+
+    def _sentence_start_suggestions(self, spelling):
+        """Capitalized suggestions for a sentence's first word, empty unless it looks like a misspelled common word"""
+        word = spelling.lower()
+        if self._is_known(word):
+            return []
+        suggestions = self.vocabulary.suggest(word, self.suggestions)
+        if not suggestions or self.vocabulary.frequency(suggestions[0]) < _SENTENCE_START_MIN_FREQUENCY:
+            return []
+        return [suggestion.capitalize() for suggestion in suggestions]
+
+    def check(self, text):
+        """
+        Find likely misspellings and the sentences containing them
+
+        Parameters:
+        text (str): Text to check
+
+        Returns:
+        dict: 'candidates' as from find_candidates, and 'segments', the
+        sentences holding candidates as dictionaries with 'text' and 'offset'
+        """
+        candidates = self.find_candidates(text)
+        segments = []
+        if candidates:
+            offsets = iter(candidate['offset'] for candidate in candidates)
+            offset = next(offsets)
+            for start, end in split_sentences(text):
+                if offset is None:
+                    break
+                if offset >= end:
+                    continue
+                if offset >= start:
+                    segments.append({'text': text[start:end], 'offset': start})
+                # Skip the other candidates in this sentence
+                while offset is not None and offset < end:
+                    offset = next(offsets, None)
+        return {'candidates': candidates, 'segments': segments}
@@ -0,0 +1,196 @@
+"""Precompiled matching of job requirements against resumes"""
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton finding which of a set of patterns occur in a text in a single pass
+    """
+
+    def __init__(self, patterns):
+        """
+        Build the automaton
+
+        Parameters:
+        patterns (list): Pattern strings; a pattern's id is its position in the list
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._empty_ids = []
+
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                # The empty string occurs in every text
+                self._empty_ids.append(pattern_id)
+                continue
+
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        # Breadth-first pass to link each state to its longest proper suffix state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text, found=None):
+        """
+        Find the patterns occurring in a text
+
+        Parameters:
+        text (str): Text to scan
+        found (set): Optional set to add the ids to, so several texts can be scanned together
+
+        Returns:
+        set: Ids of the patterns found
+        """
+        if found is None:
+            found = set()
+        found.update(self._empty_ids)
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class RequirementMatcher:
+    """
+    Job requirements compiled once so each resume can be scored in a single pass over its text
+    """
+
+    def __init__(self, jd_requirements):
+        """
+        Compile the requirements extracted from a job description
+
+        Parameters:
+        jd_requirements (dict): Technical, soft, education and experience requirements
+        """
+        self.technical_skills = [skill.lower() for skill in jd_requirements.get('technical_skills', [])]
+        self.soft_skills = [skill.lower() for skill in jd_requirements.get('soft_skills', [])]
+        self.education_requirements = list(jd_requirements.get('education_requirements', []))
+        self.experience_requirements = list(jd_requirements.get('experience_requirements', []))
+
+        self._technical_index = AhoCorasick(self.technical_skills)
+        self._soft_index = AhoCorasick(self.soft_skills)
+
+        # An education requirement is met by its full text or by any of its words
+        education_patterns = []
+        self._education_pattern_ids = []
+        for req in self.education_requirements:
+            req_lower = req.lower()
+            ids = [len(education_patterns)]
+            education_patterns.append(req_lower)
+            for word in req_lower.split():
+                ids.append(len(education_patterns))
+                education_patterns.append(word)
+            self._education_pattern_ids.append(ids)
+        self._education_index = AhoCorasick(education_patterns)
+
+        self._experience_index = AhoCorasick([req.lower() for req in self.experience_requirements])
+
+    @property
+    def total_requirements(self):
+        """Number of requirements a resume is scored against"""
+        return (len(self.technical_skills) + len(self.soft_skills)
+                + len(self.education_requirements) + len(self.experience_requirements))
+
+    def find_matches(self, resume_data):
+        """
+        Find which requirements a resume meets
+
+        Parameters:
+        resume_data (dict): The parsed resume data
+
+        Returns:
+        dict: Sets of matched requirement indices for each category
+        """
+        skills = resume_data['skills']
+
+        technical = set()
+        for skill in skills.get('technical', []):
+            self._technical_index.find(skill.lower(), technical)
+
+        soft = set()
+        for skill in skills.get('soft', []):
+            self._soft_index.find(skill.lower(), soft)
+
+        education_found = set()
+        for edu in resume_data.get('education', []):
+            self._education_index.find((edu.get('degree') or '').lower(), education_found)
+        education = {
+            index for index, ids in enumerate(self._education_pattern_ids)
+            if any(pattern_id in education_found for pattern_id in ids)
+        }
+
+        experience = set()
+        for exp in resume_data.get('work_experience', []):
+            self._experience_index.find((exp.get('job_title') or '').lower(), experience)
+            responsibilities = exp.get('responsibilities')
+            if isinstance(responsibilities, list):
+                self._experience_index.find(' '.join(responsibilities).lower(), experience)
+
+        return {
+            'technical': technical,
+            'soft': soft,
+            'education': education,
+            'experience': experience
+        }
+
+    def match(self, resume_data):
+        """
+        Compare a resume to the compiled requirements
+
+        Parameters:
+        resume_data (dict): The parsed resume data
+
+        Returns:
+        tuple: (matches, gaps, match score) with matches and gaps keyed by category
+        """
+        found = self.find_matches(resume_data)
+        categories = {
+            'technical': self.technical_skills,
+            'soft': self.soft_skills,
+            'education': self.education_requirements,
+            'experience': self.experience_requirements
+        }
+
+        matches = {}
+        gaps = {}
+        for category, requirements in categories.items():
+            matched = found[category]
+            matches[category] = [req for index, req in enumerate(requirements) if index in matched]
+            gaps[category] = [req for index, req in enumerate(requirements) if index not in matched]
+
+        total_requirements = self.total_requirements
+        if total_requirements == 0:
+            match_score = 0
+        else:
+            total_matches = sum(len(category_matches) for category_matches in matches.values())
+            match_score = round((total_matches / total_requirements) * 100)
+
+        return matches, gaps, match_score
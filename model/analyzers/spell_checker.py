@@ -1,4 +1,10 @@
 """Resume spell checking functionality"""
+import asyncio
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+from model.analyzers.local_spelling import LocalSpellChecker, split_lines, split_text
+from model.helpers.line_cache import LineCache
+from model.helpers.rate_limiter import RateLimitExceeded
 
 
 class SpellChecker:
@@ -6,27 +12,43 @@ class SpellChecker:
     Perform spell checking on resume text
     """
     
-    def __init__(self, gemini_client):
+    def __init__(self, gemini_client, prepass=True, chunk_chars=3000, max_concurrency=4, line_cache_size=50000):
         """
         Initialize the SpellChecker
         
         Parameters:
         gemini_client (GeminiClient): Initialized Gemini client for AI operations
+        prepass (bool): Check words against a local dictionary first and only send the
+            sentences with likely misspellings to the model
+        chunk_chars (int): Maximum characters of resume text per model call
+        max_concurrency (int): Maximum chunks of one resume checked at once
+        line_cache_size (int): Lines whose verdicts are remembered across resumes, 0 to disable
         """
         self.gemini_client = gemini_client
+        self.local_checker = LocalSpellChecker() if prepass else None
+        self.chunk_chars = chunk_chars
+        self.max_concurrency = max(1, max_concurrency)
+        # Boilerplate lines (degrees, schools, template headings) recur across resumes
+        self.line_cache = LineCache(line_cache_size) if line_cache_size else None
     
-    def check_spelling(self, resume_text):
-        """
-        Perform spell checking on resume text and suggest corrections
-        
-        Parameters:
-        resume_text (str): The raw resume text
-        
-        Returns:
-        dict: Dictionary containing spelling errors and suggestions
-        """
-        try:
-            prompt = f"""Perform a detailed spell check on the following resume text. 
+    def _build_prompt(self, resume_text, flagged=None):
+        """Build the spell check prompt for a resume, or for excerpts of one around flagged words"""
+        if flagged:
+            hints = ", ".join(
+                f"{candidate['word']} ({', '.join(candidate['suggestions'])})" if candidate['suggestions']
+                else candidate['word']
+                for candidate in flagged
+            )
+            source = f"""Resume Excerpts:
+            {resume_text}
+            
+            These words were not found in a dictionary, with possible corrections in brackets.
+            Some may be valid technical terms or names: {hints}"""
+        else:
+            source = f"""Resume Text:
+            {resume_text}"""
+
+        return f"""Perform a detailed spell check on the following resume text. 
             Identify any spelling errors, grammatical mistakes, or awkward phrasing.
             For each identified issue:
             1. Provide the incorrect text
@@ -47,39 +69,226 @@ class SpellChecker:
             Only include actual errors - ignore formatting issues or style preferences.
             Output ONLY the JSON.
             
-            Resume Text:
-            {resume_text}
+            {source}
             """
-            
-            spelling_results = self.gemini_client.generate_response(prompt)
-            
-            # Add a summary section
-            if spelling_results.get('errors'):
-                num_errors = len(spelling_results['errors'])
-                severity = "high" if num_errors > 10 else "medium" if num_errors > 5 else "low"
-                spelling_results['summary'] = {
-                    'total_errors': num_errors,
-                    'severity': severity,
-                    'improvement_recommendation': f"Correcting these {num_errors} issues will improve your resume's professionalism."
-                }
+
+    def _plan(self, resume_text):
+        """
+        Split the text the model should review into chunks of lines
+
+        With the local pre-pass only the sentences holding flagged words are
+        reviewed; otherwise the whole text is, split on paragraph boundaries.
+        Lines with a cached verdict are left out of the chunks.
+
+        Returns:
+        tuple: (chunks, errors from cached lines). Chunks are dictionaries with the
+        'text' to send, the 'lines' in it, the 'starts' of those lines within it and
+        their 'offsets' in resume_text, and the 'flagged' words it contains
+        """
+        if self.local_checker is None:
+            pieces = split_text(resume_text, self.chunk_chars)
+            flagged = []
+        else:
+            prepass = self.local_checker.check(resume_text)
+            # Segments can be longer than a chunk, e.g. a run-on paragraph with no sentence breaks
+            pieces = [
+                (piece, segment['offset'] + offset)
+                for segment in prepass['segments']
+                for piece, offset in split_text(segment['text'], self.chunk_chars)
+            ]
+            flagged = prepass['candidates']
+
+        chunks = []
+        chunk = None
+        cached_errors = []
+        for piece, piece_offset in pieces:
+            unseen = []
+            for start, end in split_lines(piece):
+                line = piece[start:end]
+                verdict = self.line_cache.get(line) if self.line_cache is not None else None
+                if verdict is None:
+                    unseen.append((line, piece_offset + start))
+                else:
+                    cached_errors.extend(self._place(verdict, line, piece_offset + start))
+            if not unseen:
+                continue
+
+            # Pieces are kept together so chunks still break on paragraph boundaries
+            piece_length = sum(len(line) + 1 for line, _ in unseen)
+            if chunk is None or chunk['length'] + piece_length > self.chunk_chars + 1:
+                chunk = {'lines': [], 'starts': [], 'offsets': [], 'length': 0}
+                chunks.append(chunk)
+            for line, offset in unseen:
+                chunk['starts'].append(chunk['length'])
+                chunk['offsets'].append(offset)
+                chunk['lines'].append(line)
+                chunk['length'] += len(line) + 1
+
+        for chunk in chunks:
+            spans = [(offset, offset + len(line)) for line, offset in zip(chunk['lines'], chunk['offsets'])]
+            chunk['text'] = "\n".join(chunk['lines'])
+            chunk['flagged'] = [
+                candidate for candidate in flagged
+                if any(start <= candidate['offset'] < end for start, end in spans)
+            ]
+        return chunks, cached_errors
+
+    @staticmethod
+    def _locate(text, error_text, search_from=0):
+        """Position of an error's text, preferring the next occurrence, -1 if it can't be found"""
+        if not error_text:
+            return -1
+        position = text.find(error_text, search_from)
+        if position < 0:
+            position = text.find(error_text)
+        if position < 0:
+            position = text.lower().find(error_text.lower())
+        return position
+
+    def _place(self, verdict, line, line_offset):
+        """Give the errors cached for a line their offsets at this occurrence of it"""
+        errors = []
+        search_from = 0
+        for error in verdict:
+            position = self._locate(line, error['error_text'], search_from)
+            if position >= 0:
+                search_from = position + len(error['error_text'])
+            errors.append({**error, 'offset': line_offset + position if position >= 0 else None})
+        return errors
+
+    def _merge(self, chunks, chunk_results, cached_errors):
+        """
+        Combine the model's results for each chunk with the cached lines' errors
+
+        Each error gets the 'offset' of its text in the original resume text,
+        None if the text couldn't be found, and repeated errors are dropped.
+        Verdicts for the checked lines are cached when every error in their
+        chunk could be placed.
+        """
+        errors = list(cached_errors)
+        for chunk, results in zip(chunks, chunk_results):
+            text = chunk['text']
+            search_from = 0
+            verdicts = [[] for _ in chunk['lines']]
+            placed = True
+            for error in results.get('errors') or []:
+                if not isinstance(error, dict):
+                    continue
+                error_text = error.get('error_text') or ''
+                # Errors are usually listed in order, so a repeated word maps to its next occurrence
+                position = self._locate(text, error_text, search_from)
+
+                offset = None
+                if position >= 0:
+                    search_from = position + len(error_text)
+                    line = bisect.bisect_right(chunk['starts'], position) - 1
+                    offset = chunk['offsets'][line] + position - chunk['starts'][line]
+                    verdicts[line].append({
+                        'error_text': error_text,
+                        'suggestion': error.get('suggestion'),
+                        'explanation': error.get('explanation')
+                    })
+                else:
+                    placed = False
+                errors.append({**error, 'offset': offset})
+
+            if placed and self.line_cache is not None:
+                for line, verdict in zip(chunk['lines'], verdicts):
+                    self.line_cache.set(line, tuple(verdict))
+
+        unique = []
+        seen = set()
+        for error in errors:
+            key = (error['offset'], error.get('error_text'), error.get('suggestion'))
+            if key not in seen:
+                seen.add(key)
+                unique.append(error)
+        unique.sort(key=lambda error: (error['offset'] is None, error['offset'] or 0))
+        return {'errors': unique}
+
+    def _add_summary(self, spelling_results):
+        """Add a summary section to the model's spell check results"""
+        if spelling_results.get('errors'):
+            num_errors = len(spelling_results['errors'])
+            severity = "high" if num_errors > 10 else "medium" if num_errors > 5 else "low"
+            spelling_results['summary'] = {
+                'total_errors': num_errors,
+                'severity': severity,
+                'improvement_recommendation': f"Correcting these {num_errors} issues will improve your resume's professionalism."
+            }
+        else:
+            spelling_results['summary'] = {
+                'total_errors': 0,
+                'severity': "none",
+                'improvement_recommendation': "No spelling or grammar issues detected. Your resume appears well-written."
+            }
+        
+        return spelling_results
+
+    def _error_result(self, error):
+        """Build the result returned when spell checking fails"""
+        return {
+            'errors': [],
+            'summary': {
+                'total_errors': 0,
+                'severity': "unknown",
+                'improvement_recommendation': f"Error performing spell check: {str(error)}"
+            }
+        }
+
+    def check_spelling(self, resume_text):
+        """
+        Perform spell checking on resume text and suggest corrections
+        
+        Parameters:
+        resume_text (str): The raw resume text
+        
+        Returns:
+        dict: Dictionary containing spelling errors, with the offset of each in
+        resume_text, and suggestions
+        """
+        try:
+            chunks, cached_errors = self._plan(resume_text)
+            prompts = [self._build_prompt(chunk['text'], chunk['flagged']) for chunk in chunks]
+            if len(prompts) <= 1:
+                chunk_results = [self.gemini_client.generate_response(prompt) for prompt in prompts]
             else:
-                spelling_results['summary'] = {
-                    'total_errors': 0,
-                    'severity': "none",
-                    'improvement_recommendation': "No spelling or grammar issues detected. Your resume appears well-written."
-                }
-            
-            return spelling_results
-            
+                with ThreadPoolExecutor(min(len(prompts), self.max_concurrency)) as pool:
+                    chunk_results = list(pool.map(self.gemini_client.generate_response, prompts))
+            return self._add_summary(self._merge(chunks, chunk_results, cached_errors))
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            return {
-                'errors': [],
-                'summary': {
-                    'total_errors': 0,
-                    'severity': "unknown",
-                    'improvement_recommendation': f"Error performing spell check: {str(e)}"
-                }
-            }
+            return self._error_result(e)
+
+    async def acheck_spelling(self, resume_text):
+        """
+        Asynchronous version of check_spelling
+        
+        Parameters:
+        resume_text (str): The raw resume text
+        
+        Returns:
+        dict: Dictionary containing spelling errors, with the offset of each in
+        resume_text, and suggestions
+        """
+        try:
+            # Dictionary lookups and suggestion generation are CPU-bound, keep them off the event loop
+            chunks, cached_errors = await asyncio.to_thread(self._plan, resume_text)
+            slots = asyncio.Semaphore(self.max_concurrency)
+
+            async def check_chunk(chunk):
+                async with slots:
+                    return await self.gemini_client.agenerate_response(
+                        self._build_prompt(chunk['text'], chunk['flagged'])
+                    )
+
+            chunk_results = await asyncio.gather(*[check_chunk(chunk) for chunk in chunks])
+            return self._add_summary(self._merge(chunks, chunk_results, cached_errors))
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            return self._error_result(e)
     
     def format_results(self, spell_check_results):
         """
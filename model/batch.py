@@ -0,0 +1,384 @@
+"""
+Offline batch parsing of a directory of resumes
+
+Usage:
+    python -m model.batch RESUME_DIR OUTPUT.ndjson [options]
+    python -m model.batch RESUME_DIR OUTPUT.parquet [options]
+
+Text is extracted in a process pool and parsed with concurrent Gemini
+calls. Each finished file is written as one NDJSON record and recorded in
+a checkpoint file, so an interrupted run picks up where it stopped. A
+file can get several records across runs, so the output is reduced to one
+record per file (see read_records) once a run completes, and Parquet
+output is written from those records.
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from model.extractors.text_extractor import TextExtractor
+from model.helpers.rate_limiter import RateLimiter
+from model.helpers.response_cache import ResponseCache
+from model.parsers.models import ParsedResume
+from model.parsers.resume_parser import ResumeParser
+
+DEFAULT_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+def extract_file(path):
+    """
+    Extract a file's text, run in worker processes
+
+    Parameters:
+    path (str): Path to the resume file
+
+    Returns:
+    tuple: (text, SHA-256 of the file, seconds taken)
+    """
+    started = time.perf_counter()
+    with open(path, 'rb') as file:
+        data = file.read()
+    text = TextExtractor.extract_text_from_uploaded_file(data)
+    return text, hashlib.sha256(data).hexdigest(), time.perf_counter() - started
+
+
+def find_files(root, extensions):
+    """
+    Walk a directory tree for resume files
+
+    Parameters:
+    root (str): Directory to search
+    extensions (tuple): Lowercase file extensions to include
+
+    Returns:
+    list: Paths relative to root, in a stable order
+    """
+    paths = []
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in extensions:
+                paths.append(os.path.relpath(os.path.join(directory, filename), root))
+    return paths
+
+
+def load_checkpoint(path):
+    """
+    Read the files finished by previous runs
+
+    Parameters:
+    path (str): Checkpoint file, one relative path per line
+
+    Returns:
+    set: Finished relative paths
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as file:
+        return {line.rstrip('\n') for line in file if line.strip()}
+
+
+def read_records(path):
+    """
+    Read the NDJSON records, keeping one per file
+
+    A file gets more than one record when it failed and was retried, or when
+    a run stopped after writing its record but before checkpointing it. The
+    latest completed record is kept, or the latest failed one if the file
+    never completed. Lines cut short by an interrupted write are skipped.
+
+    Parameters:
+    path (str): NDJSON file written by BatchRunner
+
+    Returns:
+    list: Records, in the order their files were first written
+    """
+    records = {}
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            previous = records.get(record['path'])
+            if previous is None or record['status'] == 'completed' or previous['status'] != 'completed':
+                records[record['path']] = record
+    return list(records.values())
+
+
+def compact_records(path):
+    """
+    Rewrite an NDJSON file with one record per file, as chosen by read_records
+
+    Parameters:
+    path (str): NDJSON file written by BatchRunner
+    """
+    records = read_records(path)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        for record in records:
+            file.write(json.dumps(record) + '\n')
+    os.replace(temp_path, path)
+
+
+def _end_last_line(path):
+    """Terminate a line left unfinished by an interrupted run, so appended records start on their own line"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb+') as file:
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) != b'\n':
+            file.write(b'\n')
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile
+
+    Parameters:
+    values (list): Numbers
+    fraction (float): Percentile as a fraction, e.g. 0.95
+
+    Returns:
+    float: Percentile value, None for no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+class BatchRunner:
+    """
+    Parses every resume under a directory into an NDJSON file
+    """
+
+    def __init__(self, parser, output_path, checkpoint_path, workers=None, concurrency=8,
+                 include_summary=True, progress_every=100):
+        """
+        Initialize the runner
+
+        Parameters:
+        parser (ResumeParser): Parser used for the Gemini calls
+        output_path (str): NDJSON file records are appended to
+        checkpoint_path (str): File listing finished paths
+        workers (int): Extraction processes, defaults to the CPU count
+        concurrency (int): Maximum concurrent Gemini calls
+        include_summary (bool): Whether to include summaries in the parsed data
+        progress_every (int): Print progress after this many files, 0 to disable
+        """
+        self.parser = parser
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.include_summary = include_summary
+        self.progress_every = progress_every
+
+        self.timings = {'extract': [], 'parse': [], 'total': []}
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+
+    async def run(self, root, extensions=DEFAULT_EXTENSIONS):
+        """
+        Parse every unfinished file under a directory
+
+        Parameters:
+        root (str): Directory of resumes
+        extensions (tuple): Lowercase file extensions to include
+
+        Returns:
+        dict: Run report from report()
+        """
+        paths = find_files(root, extensions)
+        finished = load_checkpoint(self.checkpoint_path)
+        pending = [path for path in paths if path not in finished]
+        self.skipped = len(paths) - len(pending)
+
+        llm_slots = asyncio.Semaphore(self.concurrency)
+        # Files in flight; enough to keep both the workers and the LLM calls busy without loading everything
+        window = asyncio.Semaphore(self.workers * 2 + self.concurrency)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        _end_last_line(self.output_path)
+        _end_last_line(self.checkpoint_path)
+
+        # Spawned workers don't inherit the event loop's threads
+        with ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn')) as pool, \
+                open(self.output_path, 'a', encoding='utf-8') as output, \
+                open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+
+            async def process(path):
+                try:
+                    record = await self._process(loop, pool, llm_slots, root, path)
+                    # Record before checkpoint: a stop in between redoes the file, leaving a
+                    # duplicate record that read_records drops, rather than losing the record
+                    output.write(json.dumps(record) + '\n')
+                    output.flush()
+                    if record['status'] == 'completed':
+                        # Failed files are retried by the next run
+                        checkpoint.write(path + '\n')
+                        checkpoint.flush()
+                    self._progress(started)
+                finally:
+                    window.release()
+
+            tasks = []
+            for path in pending:
+                await window.acquire()
+                tasks.append(asyncio.create_task(process(path)))
+            await asyncio.gather(*tasks)
+
+        return self.report(time.perf_counter() - started)
+
+    async def _process(self, loop, pool, llm_slots, root, path):
+        record = {'path': path, 'sha256': None, 'status': 'failed', 'parsed': None, 'error': None, 'timings': {}}
+        started = time.perf_counter()
+        try:
+            text, record['sha256'], extract_seconds = await loop.run_in_executor(
+                pool, extract_file, os.path.join(root, path)
+            )
+            record['timings']['extract'] = extract_seconds
+            self.timings['extract'].append(extract_seconds)
+
+            async with llm_slots:
+                parse_started = time.perf_counter()
+                parsed = await self.parser.aparse(text)
+                parse_seconds = time.perf_counter() - parse_started
+            record['timings']['parse'] = parse_seconds
+            self.timings['parse'].append(parse_seconds)
+
+            # Parsing errors are logged by the parser and come back as an empty result
+            if parsed == ParsedResume():
+                record['error'] = "No data parsed"
+            else:
+                record['parsed'] = parsed.to_dict(self.include_summary)
+                record['status'] = 'completed'
+        except Exception as e:
+            record['error'] = str(e)
+
+        total_seconds = time.perf_counter() - started
+        record['timings']['total'] = total_seconds
+        self.timings['total'].append(total_seconds)
+        if record['status'] == 'completed':
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        return record
+
+    def _progress(self, started):
+        done = self.succeeded + self.failed
+        if self.progress_every and done % self.progress_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{done} files processed ({self.failed} failed), {done / elapsed:.2f} docs/sec", file=sys.stderr)
+
+    def report(self, elapsed):
+        """
+        Summarize throughput and per-stage latency
+
+        Parameters:
+        elapsed (float): Wall-clock seconds of the run
+
+        Returns:
+        dict: Counts, docs/sec and p50/p95 seconds for each stage
+        """
+        done = self.succeeded + self.failed
+        return {
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'seconds': elapsed,
+            'docs_per_second': done / elapsed if elapsed > 0 else None,
+            'stages': {
+                stage: {'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95), 'count': len(values)}
+                for stage, values in self.timings.items()
+            }
+        }
+
+
+def write_parquet(ndjson_path, parquet_path):
+    """
+    Convert the NDJSON records to Parquet, with nested fields stored as JSON strings
+
+    Parameters:
+    ndjson_path (str): NDJSON file written by BatchRunner
+    parquet_path (str): Parquet file to write
+    """
+    import pandas as pd
+
+    records = pd.DataFrame(read_records(ndjson_path))
+    for column in ('parsed', 'timings'):
+        records[column] = records[column].map(lambda value: json.dumps(value) if value is not None else None)
+    records.to_parquet(parquet_path, index=False)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Parse a directory of resumes into NDJSON or Parquet")
+    parser.add_argument('input_dir', help="Directory searched recursively for resumes")
+    parser.add_argument('output', help="Output file, .ndjson or .parquet")
+    parser.add_argument('--checkpoint', help="Progress file, defaults to OUTPUT.checkpoint")
+    parser.add_argument('--workers', type=int, default=None, help="Text extraction processes (default: CPU count)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Concurrent Gemini calls (default: 8)")
+    parser.add_argument('--requests-per-minute', type=float, default=None, help="Gemini request quota")
+    parser.add_argument('--tokens-per-minute', type=float, default=None, help="Gemini token quota")
+    parser.add_argument('--cache', default=None, help="SQLite file caching Gemini responses across runs")
+    parser.add_argument('--no-summary', action='store_true', help="Leave summaries out of the parsed data")
+    parser.add_argument('--extensions', default=','.join(DEFAULT_EXTENSIONS), help="Comma separated file extensions")
+    parser.add_argument('--progress-every', type=int, default=100, help="Print progress every N files, 0 to disable")
+    args = parser.parse_args(argv)
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        parser.error("GEMINI_API_KEY not found in environment variables")
+
+    parquet_path = args.output if args.output.lower().endswith('.parquet') else None
+    if parquet_path and not any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+        parser.error("Parquet output needs pyarrow or fastparquet installed")
+    # Parquet can't be appended to, so records are staged as NDJSON until the run completes
+    ndjson_path = parquet_path + '.ndjson' if parquet_path else args.output
+    checkpoint_path = args.checkpoint or args.output + '.checkpoint'
+
+    resume_parser = ResumeParser(
+        api_key,
+        cache=ResponseCache(args.cache) if args.cache else None,
+        rate_limiter=RateLimiter(
+            max_in_flight=args.concurrency,
+            requests_per_minute=args.requests_per_minute,
+            tokens_per_minute=args.tokens_per_minute
+        )
+    )
+    runner = BatchRunner(
+        resume_parser,
+        ndjson_path,
+        checkpoint_path,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        include_summary=not args.no_summary,
+        progress_every=args.progress_every
+    )
+    extensions = tuple(
+        extension.strip().lower() if extension.strip().startswith('.') else '.' + extension.strip().lower()
+        for extension in args.extensions.split(',') if extension.strip()
+    )
+
+    report = asyncio.run(runner.run(args.input_dir, extensions))
+
+    if parquet_path and os.path.exists(ndjson_path):
+        write_parquet(ndjson_path, parquet_path)
+    elif os.path.exists(ndjson_path):
+        compact_records(ndjson_path)
+
+    print(json.dumps(report, indent=2))
+    return 0 if report['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Text extraction backends
+
+Each backend imports its library on first use, so deployments only pay for
+the libraries they actually extract with. Backends take a seekable binary
+stream positioned at the start of the file.
+"""
+import re
+import zipfile
+from xml.etree import ElementTree
+
+
+def pdf_pypdf2(stream, max_pages=None, max_chars=None):
+    """Extract PDF text with PyPDF2"""
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(stream)
+    page_count = len(pdf_reader.pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    page_texts = []
+    total_chars = 0
+    for page_num in range(page_count):
+        page_text = pdf_reader.pages[page_num].extract_text()
+        page_texts.append(page_text)
+        total_chars += len(page_text)
+        if max_chars is not None and total_chars >= max_chars:
+            break
+
+    text = ''.join(page_texts)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def pdf_pypdfium2(stream, max_pages=None, max_chars=None):
+    """Extract PDF text with pypdfium2 (PDFium bindings, much faster than pure-Python parsers)"""
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(stream.read())
+    try:
+        page_count = len(pdf)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+
+        page_texts = []
+        total_chars = 0
+        for page_num in range(page_count):
+            page = pdf[page_num]
+            text_page = page.get_textpage()
+            page_text = text_page.get_text_range()
+            text_page.close()
+            page.close()
+
+            page_texts.append(page_text)
+            total_chars += len(page_text)
+            if max_chars is not None and total_chars >= max_chars:
+                break
+    finally:
+        pdf.close()
+
+    text = ''.join(page_texts)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def pdf_pdfminer(stream, max_pages=None, max_chars=None):
+    """Extract PDF text with pdfminer.six"""
+    from pdfminer.high_level import extract_text
+
+    text = extract_text(stream, maxpages=max_pages or 0)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def docx_python_docx(stream):
+    """Extract DOCX paragraph text with python-docx"""
+    import docx
+
+    doc = docx.Document(stream)
+    return '\n'.join(para.text for para in doc.paragraphs)
+
+
+def txt_utf8(stream):
+    """Decode plain text as UTF-8"""
+    data = stream.read()
+    if isinstance(data, str):
+        return data
+    return data.decode('utf-8')
+
+
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_FALLBACK_TAG = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_HEADER_FOOTER_PART = re.compile(r'word/(header|footer)(\d*)\.xml$')
+
+
+def _docx_parts(archive):
+    """Get the XML parts holding a DOCX's text: headers, then the body, then footers"""
+    names = archive.namelist()
+    if 'word/document.xml' not in names:
+        raise ValueError("Not a DOCX file: word/document.xml is missing")
+
+    headers, footers = [], []
+    for name in names:
+        match = _HEADER_FOOTER_PART.match(name)
+        if match:
+            parts = headers if match.group(1) == 'header' else footers
+            parts.append((int(match.group(2) or 0), name))
+
+    return [name for _, name in sorted(headers)] + ['word/document.xml'] + [name for _, name in sorted(footers)]
+
+
+def iter_docx_paragraphs(stream):
+    """
+    Stream the paragraphs of a DOCX without building its object model
+
+    Paragraphs in tables and text boxes are included; a text box's
+    paragraphs come before the paragraph anchoring it.
+
+    Parameters:
+    stream: Seekable binary file-like object
+
+    Returns:
+    generator: Text of each paragraph
+    """
+    with zipfile.ZipFile(stream) as archive:
+        for part in _docx_parts(archive):
+            with archive.open(part) as xml_file:
+                yield from _iter_part_paragraphs(xml_file)
+
+
+def _iter_part_paragraphs(xml_file):
+    paragraph_tag = _WORD_NAMESPACE + 'p'
+    run_tag = _WORD_NAMESPACE + 'r'
+    text_tag = _WORD_NAMESPACE + 't'
+    run_text = {_WORD_NAMESPACE + 'tab': '\t', _WORD_NAMESPACE + 'br': '\n', _WORD_NAMESPACE + 'cr': '\n',
+                _WORD_NAMESPACE + 'noBreakHyphen': '-'}
+
+    # Paragraphs nest inside text boxes, so keep a buffer per open paragraph
+    paragraphs = []
+    run_depth = 0
+    fallback_depth = 0
+    for event, elem in ElementTree.iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == paragraph_tag:
+                paragraphs.append([])
+            elif tag == run_tag:
+                run_depth += 1
+            elif tag == _FALLBACK_TAG:
+                # Legacy copy of the preceding mc:Choice content, e.g. a text box
+                fallback_depth += 1
+            continue
+
+        if tag == paragraph_tag:
+            paragraph = paragraphs.pop()
+            if not fallback_depth:
+                yield ''.join(paragraph)
+            # Drop parsed content so memory stays bounded by the largest paragraph
+            elem.clear()
+        elif tag == run_tag:
+            run_depth -= 1
+        elif tag == _FALLBACK_TAG:
+            fallback_depth -= 1
+        elif paragraphs and not fallback_depth:
+            if tag == text_tag:
+                paragraphs[-1].append(elem.text or '')
+            elif run_depth and tag in run_text:
+                # Tab stops in paragraph properties also use w:tab, only count ones in runs
+                paragraphs[-1].append(run_text[tag])
+
+
+def docx_xml(stream):
+    """Extract DOCX text, including tables, headers, footers and text boxes, by streaming its XML"""
+    return '\n'.join(iter_docx_paragraphs(stream))
@@ -0,0 +1,247 @@
+"""Page-parallel PDF text extraction"""
+import asyncio
+import concurrent.futures
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+
+def _open_pdf(source):
+    """PyPDF2 reader over a PDF's content or an open binary file, which must stay open while reading"""
+    import PyPDF2
+
+    return PyPDF2.PdfReader(source if hasattr(source, 'read') else io.BytesIO(source))
+
+
+def count_pdf_pages(data):
+    """
+    Count the pages of a PDF
+
+    Only the cross-reference table and the page tree are parsed, so this is
+    cheap enough to run in-process before deciding how to extract.
+
+    Parameters:
+    data (bytes): PDF file content
+
+    Returns:
+    int: Number of pages
+    """
+    return len(_open_pdf(data).pages)
+
+
+def _extract_pages(reader, start, stop, max_chars=None):
+    """Extract a range of pages from an open reader, stopping once max_chars have been extracted"""
+    pages = []
+    total_chars = 0
+    for page_num in range(start, min(stop, len(reader.pages))):
+        started = time.perf_counter()
+        page_text = reader.pages[page_num].extract_text() or ""
+        pages.append([page_text, time.perf_counter() - started])
+
+        total_chars += len(page_text)
+        if max_chars is not None and total_chars >= max_chars:
+            break
+    return pages
+
+
+def extract_pdf_pages(source, start, stop, max_chars=None):
+    """
+    Extract the text of a range of PDF pages
+
+    Module-level so it can run in worker processes. Only the cross-reference
+    table, the page tree and the range's own pages are read from the file.
+
+    Parameters:
+    source (str or bytes): Path of a PDF file, or the PDF content itself
+    start (int): Index of the first page
+    stop (int): Index after the last page
+    max_chars (int): Stop once this many characters have been extracted from the range
+
+    Returns:
+    list: [page text, seconds taken] for each extracted page
+    """
+    if isinstance(source, bytes):
+        return _extract_pages(_open_pdf(source), start, stop, max_chars)
+    with open(source, 'rb') as file:
+        return _extract_pages(_open_pdf(file), start, stop, max_chars)
+
+
+@contextlib.contextmanager
+def _spooled(data):
+    """Write PDF content to a temporary file for worker tasks to open, removing it afterwards"""
+    file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+    try:
+        with file:
+            file.write(data)
+        yield file.name
+    finally:
+        os.unlink(file.name)
+
+
+class PdfExtractionEngine:
+    """
+    Extracts PDF text by splitting large documents into page ranges handled by parallel workers
+
+    Page ranges are extracted with PyPDF2, the only backend that can open a page range on its own.
+    """
+
+    def __init__(self, pages_per_task=8, max_pages=None, max_chars=None):
+        """
+        Initialize the engine
+
+        Parameters:
+        pages_per_task (int): Pages extracted by each worker task
+        max_pages (int): Only extract this many pages from the start of a document, None for all
+        max_chars (int): Truncate extracted text to this many characters, None for no limit
+        """
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+    def page_ranges(self, page_count):
+        """
+        Split a document's pages into worker tasks
+
+        Parameters:
+        page_count (int): Number of pages in the document
+
+        Returns:
+        list: (start, stop) page index ranges
+        """
+        if self.max_pages is not None:
+            page_count = min(page_count, self.max_pages)
+        return [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+    def _combine(self, page_count, range_results):
+        """Join the pages extracted by each task, in order and up to the character limit, into a single result"""
+        pages = []
+        total_chars = 0
+        for range_pages in range_results:
+            for page in range_pages:
+                pages.append(page)
+                total_chars += len(page[0])
+                if self.max_chars is not None and total_chars >= self.max_chars:
+                    break
+            else:
+                continue
+            break
+        text = ''.join(page_text for page_text, _ in pages)
+
+        truncated = len(pages) < page_count
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text = text[:self.max_chars]
+            truncated = True
+
+        return {
+            'text': text,
+            'page_count': page_count,
+            'pages_extracted': len(pages),
+            'page_timings': [seconds for _, seconds in pages],
+            'truncated': truncated
+        }
+
+    def _remaining_chars(self, range_results):
+        """Characters still allowed after the ranges extracted so far, None without a limit"""
+        if self.max_chars is None:
+            return None
+        return self.max_chars - sum(len(page_text) for range_pages in range_results for page_text, _ in range_pages)
+
+    def extract(self, data, executor=None):
+        """
+        Extract text from a PDF
+
+        Parameters:
+        data (bytes): PDF file content
+        executor (concurrent.futures.Executor): Runs page ranges in parallel; None extracts them in order
+
+        Returns:
+        dict: 'text', 'page_count', 'pages_extracted', per-page 'page_timings' in seconds, and
+            whether the text was 'truncated' by the page or character limits
+        """
+        reader = _open_pdf(data)
+        page_count = len(reader.pages)
+        ranges = self.page_ranges(page_count)
+
+        if executor is None or len(ranges) <= 1:
+            stop = ranges[-1][1] if ranges else 0
+            return self._combine(page_count, [_extract_pages(reader, 0, stop, self.max_chars)])
+
+        with _spooled(data) as path:
+            futures = [executor.submit(extract_pdf_pages, path, start, stop, self.max_chars) for start, stop in ranges]
+            range_results = []
+            try:
+                for future in futures:
+                    range_results.append(future.result())
+                    remaining_chars = self._remaining_chars(range_results)
+                    if remaining_chars is not None and remaining_chars <= 0:
+                        break
+            finally:
+                # Later ranges aren't needed, but the file must outlive the ones already running
+                for future in futures:
+                    future.cancel()
+                concurrent.futures.wait(futures)
+
+        return self._combine(page_count, range_results)
+
+    def splits(self, page_count):
+        """
+        Check whether a document is large enough to be split into page ranges
+
+        Parameters:
+        page_count (int): Number of pages in the document
+
+        Returns:
+        bool: True if it takes more than one worker task
+        """
+        return len(self.page_ranges(page_count)) > 1
+
+    async def aextract(self, data, run, concurrency=None, page_count=None):
+        """
+        Asynchronous version of extract
+
+        With a character limit, ranges are started in order and no more are
+        started once the ranges extracted so far reach it. A document that
+        fits in one range is sent to a single worker as is; larger ones are
+        written to a temporary file each range's worker opens.
+
+        Parameters:
+        data (bytes): PDF file content
+        run (callable): Coroutine function run(func, *args) executing func in a worker, e.g. ExtractionPool.run
+        concurrency (int): Ranges extracted at once, e.g. the number of workers; None starts them all
+        page_count (int): Number of pages, if already counted; otherwise they are counted in-process
+
+        Returns:
+        dict: Same as extract
+        """
+        if page_count is None:
+            page_count = count_pdf_pages(data)
+        ranges = self.page_ranges(page_count)
+        if len(ranges) <= 1:
+            stop = ranges[-1][1] if ranges else 0
+            return self._combine(page_count, [await run(extract_pdf_pages, data, 0, stop, self.max_chars)])
+
+        with _spooled(data) as path:
+            window = concurrency or len(ranges)
+
+            range_results = []
+            tasks = []
+            try:
+                for start, stop in ranges:
+                    if len(tasks) - len(range_results) >= window:
+                        range_results.append(await tasks[len(range_results)])
+                    remaining_chars = self._remaining_chars(range_results)
+                    if remaining_chars is not None and remaining_chars <= 0:
+                        break
+                    tasks.append(asyncio.ensure_future(run(extract_pdf_pages, path, start, stop, remaining_chars)))
+                for task in tasks[len(range_results):]:
+                    range_results.append(await task)
+            finally:
+                # Wait for the ranges still running before their file is removed
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return self._combine(page_count, range_results)
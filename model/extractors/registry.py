@@ -0,0 +1,259 @@
+"""Registry of text extraction backends keyed by sniffed file format"""
+import codecs
+import os
+import threading
+import time
+from collections import OrderedDict
+from model.extractors import backends
+
+
+# Bytes read from the start of a file to identify its format
+SNIFF_SIZE = 1024
+
+# File extensions of each format, for checking a file's name against its content
+EXTENSIONS = {'pdf': ('.pdf',), 'docx': ('.docx',), 'txt': ('.txt',)}
+
+# Bump when a backend changes the text it extracts, so stored text is extracted again
+EXTRACTOR_VERSION = 1
+
+
+def sniff_format(head):
+    """
+    Identify a file's format from its leading bytes
+
+    Parameters:
+    head (bytes): The first SNIFF_SIZE bytes of the file
+
+    Returns:
+    str: 'pdf', 'docx' or 'txt'
+
+    Raises:
+    ValueError: If the content isn't a supported format
+    """
+    # PDF readers accept junk before the header, so look beyond the first bytes
+    if b'%PDF-' in head:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'docx'
+    if head.startswith(b'\xd0\xcf\x11\xe0'):
+        raise ValueError("Legacy .doc files are not supported, please upload a PDF or DOCX")
+
+    try:
+        # Incremental decoding tolerates a multi-byte character cut off at the end of the sample
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        raise ValueError("Could not determine file type and failed to decode as text")
+    return 'txt'
+
+
+def sniff_stream(stream):
+    """
+    Identify the format of a seekable binary stream without moving it
+
+    Parameters:
+    stream: Seekable binary file-like object
+
+    Returns:
+    str: 'pdf', 'docx' or 'txt'
+    """
+    position = stream.tell()
+    head = stream.read(SNIFF_SIZE)
+    stream.seek(position)
+    return sniff_format(head)
+
+
+def check_extension(file_format, filename):
+    """
+    Check that a file's extension doesn't name a different format than its content
+
+    Extensions of no supported format aren't checked.
+
+    Parameters:
+    file_format (str): Format sniffed from the content
+    filename (str): Name of the file
+
+    Raises:
+    ValueError: If the extension belongs to another format
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    named = [name for name, extensions in EXTENSIONS.items() if extension in extensions]
+    if named and file_format not in named:
+        raise ValueError(f"File content is {file_format.upper()}, which doesn't match its {extension} extension")
+
+
+class ExtractorRegistry:
+    """
+    Ordered text extraction backends for each file format
+
+    Backends are tried in preference order; one whose library isn't installed
+    or that fails on a document falls back to the next.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._backends = {}
+        self._unavailable = set()
+        self._options = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def register(self, file_format, name, function):
+        """
+        Add a backend for a format, after any already registered
+
+        Parameters:
+        file_format (str): Format the backend handles, as returned by sniff_format
+        name (str): Backend name used to select it
+        function (callable): Takes a binary stream plus format options and returns the text
+        """
+        self._backends.setdefault(file_format, OrderedDict())[name] = function
+
+    def backend_names(self, file_format):
+        """
+        Get the backends for a format in preference order
+
+        Parameters:
+        file_format (str): File format
+
+        Returns:
+        list: Backend names
+        """
+        return list(self._backends.get(file_format, {}))
+
+    def set_preference(self, file_format, names):
+        """
+        Choose which backends a format tries first
+
+        Parameters:
+        file_format (str): File format
+        names (list): Backend names to try first, in order; the others keep their order after them
+
+        Raises:
+        ValueError: If a name isn't registered for the format
+        """
+        registered = self._backends.get(file_format, OrderedDict())
+        unknown = [name for name in names if name not in registered]
+        if unknown:
+            raise ValueError(f"Unknown {file_format} extraction backends: {', '.join(unknown)}")
+
+        for name in reversed(names):
+            registered.move_to_end(name, last=False)
+
+    def set_options(self, file_format, **options):
+        """
+        Set default options passed to a format's backends, e.g. max_pages for PDFs
+
+        Parameters:
+        file_format (str): File format
+        **options: Options used when extract isn't given them
+        """
+        self._options[file_format] = options
+
+    def version(self):
+        """
+        Identify what decides the text extracted from a file: the backend code, the
+        backend preferences and the default options such as PDF page and character limits
+
+        Returns:
+        str: Version to store alongside extracted text
+        """
+        formats = []
+        for file_format in sorted(self._backends):
+            options = ','.join(f"{name}={value}" for name, value in sorted(self._options.get(file_format, {}).items()))
+            formats.append(f"{file_format}:{'>'.join(self.backend_names(file_format))}({options})")
+        return f"v{EXTRACTOR_VERSION};{';'.join(formats)}"
+
+    def _record(self, name, seconds, failed):
+        with self._lock:
+            stats = self._stats.setdefault(name, {'calls': 0, 'failures': 0, 'seconds': 0.0})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            if failed:
+                stats['failures'] += 1
+
+    def extract(self, stream, file_format=None, **options):
+        """
+        Extract text from a stream with the preferred available backend
+
+        Parameters:
+        stream: Seekable binary file-like object positioned at the start of the file
+        file_format (str): Format of the file, sniffed from its content if None
+        **options: Format-specific options such as max_pages for PDFs, overriding the defaults
+            from set_options unless None
+
+        Returns:
+        str: Extracted text content
+        """
+        if file_format is None:
+            file_format = sniff_stream(stream)
+
+        names = [name for name in self.backend_names(file_format) if name not in self._unavailable]
+        if not names:
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        options = {**self._options.get(file_format, {}), **{key: value for key, value in options.items() if value is not None}}
+
+        start_position = stream.tell()
+        extraction_error = None
+        import_error = None
+        for name in names:
+            stream.seek(start_position)
+            started = time.perf_counter()
+            try:
+                text = self._backends[file_format][name](stream, **options)
+            except ImportError as e:
+                # Library not installed in this deployment, don't try it again
+                self._unavailable.add(name)
+                import_error = import_error or e
+                continue
+            except Exception as e:
+                self._record(name, time.perf_counter() - started, failed=True)
+                extraction_error = extraction_error or e
+                continue
+
+            self._record(name, time.perf_counter() - started, failed=False)
+            return text
+
+        # Report the preferred backend's failure rather than a missing optional library
+        raise extraction_error or import_error
+
+    def stats(self):
+        """
+        Get per-backend usage, for comparing extraction speed between backends
+
+        Returns:
+        dict: Calls, failures and total seconds for each backend used, plus unavailable backends
+        """
+        with self._lock:
+            return {
+                'backends': {name: dict(stats) for name, stats in self._stats.items()},
+                'unavailable': sorted(self._unavailable)
+            }
+
+
+def _create_default_registry():
+    registry = ExtractorRegistry()
+    registry.register('pdf', 'pypdf2', backends.pdf_pypdf2)
+    registry.register('pdf', 'pypdfium2', backends.pdf_pypdfium2)
+    registry.register('pdf', 'pdfminer', backends.pdf_pdfminer)
+    registry.register('docx', 'xml', backends.docx_xml)
+    registry.register('docx', 'python-docx', backends.docx_python_docx)
+    registry.register('txt', 'utf-8', backends.txt_utf8)
+
+    # e.g. EXTRACTOR_PDF_BACKENDS=pypdfium2,pypdf2; read here so worker processes pick it up too
+    for file_format in ('pdf', 'docx', 'txt'):
+        preference = os.getenv(f"EXTRACTOR_{file_format.upper()}_BACKENDS")
+        if preference:
+            registry.set_preference(file_format, [name.strip() for name in preference.split(',') if name.strip()])
+
+    # Limits also applied by the page-parallel PDF engine
+    pdf_options = {name: int(os.getenv(variable)) for name, variable in
+                   (('max_pages', 'PDF_MAX_PAGES'), ('max_chars', 'PDF_MAX_CHARS')) if os.getenv(variable)}
+    if pdf_options:
+        registry.set_options('pdf', **pdf_options)
+
+    return registry
+
+
+# Registry used by TextExtractor
+default_registry = _create_default_registry()
@@ -0,0 +1,164 @@
+"""Persistent store of processed resume documents keyed by file hash"""
+import hashlib
+import json
+import time
+
+from model.helpers.sqlite_cache import SqliteCache
+
+
+class DocumentStore(SqliteCache):
+    """
+    SQLite-backed store mapping the SHA-256 of an uploaded file to its extracted text,
+    parsed data and spell check results
+
+    Text is reused for any model, but only for the extractor version that
+    produced it, since backends and limits change what a file's text is.
+    Parsed data and spell check results are only returned for the model
+    version that produced them.
+    """
+
+    def __init__(self, path, max_entries=50000, ttl_seconds=30 * 24 * 3600, evict_every=100):
+        """
+        Initialize the store and create its table if needed
+
+        Parameters:
+        path (str): Path to the SQLite database file (":memory:" for a private in-memory store)
+        max_entries (int): Maximum number of stored documents, None for unbounded
+        ttl_seconds (float): Lifetime of a stored document in seconds, None to never expire
+        evict_every (int): Writes between eviction passes
+        """
+        super().__init__(
+            path, 'documents', 'sha256',
+            ['text TEXT', 'parsed TEXT', 'spell_check TEXT', 'model_version TEXT', 'extractor_version TEXT'],
+            max_entries, ttl_seconds, evict_every
+        )
+
+    @staticmethod
+    def hash_bytes(data):
+        """
+        Compute the key of a file's content
+
+        Parameters:
+        data (bytes): File content
+
+        Returns:
+        str: Hex SHA-256 digest
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, sha256, model_version, extractor_version=None):
+        """
+        Look up a stored document
+
+        Parameters:
+        sha256 (str): Hash of the file content
+        model_version (str): Version of the model whose results are wanted
+        extractor_version (str): Version of the text extraction in use
+
+        Returns:
+        dict: 'text', 'parsed' and 'spell_check' (each None if not stored), or None if the file is
+            unknown or its text came from another extractor version
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, parsed, spell_check, model_version, extractor_version, created_at "
+                "FROM documents WHERE sha256 = ?",
+                (sha256,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            text, parsed, spell_check, stored_version, stored_extractor, created_at = row
+            if self._is_expired(created_at, now):
+                self._expire(sha256)
+                return None
+
+            # Results were derived from the text, so none of them hold once it would be extracted differently
+            if text is not None and stored_extractor != extractor_version:
+                self.misses += 1
+                return None
+
+            self._touch(sha256, now)
+
+        if stored_version != model_version:
+            parsed = spell_check = None
+
+        return {
+            'text': text,
+            'parsed': json.loads(parsed) if parsed is not None else None,
+            'spell_check': json.loads(spell_check) if spell_check is not None else None
+        }
+
+    def _upsert(self, sha256, column, value, model_version=None, extractor_version=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO documents (sha256, created_at, accessed_at) VALUES (?, ?, ?)",
+                (sha256, now, now)
+            )
+            if column == 'text':
+                # Results derived from text extracted another way are stale once new text is written
+                self._conn.execute(
+                    "UPDATE documents SET parsed = NULL, spell_check = NULL, model_version = NULL, "
+                    "extractor_version = ? WHERE sha256 = ? AND extractor_version IS NOT ?",
+                    (extractor_version, sha256, extractor_version)
+                )
+            if model_version is not None:
+                # Results from another model version are stale once this one writes
+                self._conn.execute(
+                    "UPDATE documents SET parsed = NULL, spell_check = NULL, model_version = ? "
+                    "WHERE sha256 = ? AND model_version IS NOT ?",
+                    (model_version, sha256, model_version)
+                )
+            self._conn.execute(
+                f"UPDATE documents SET {column} = ?, accessed_at = ? WHERE sha256 = ?", (value, now, sha256)
+            )
+            self._written(now)
+
+    def put_text(self, sha256, text, extractor_version=None):
+        """
+        Store the text extracted from a file
+
+        Parameters:
+        sha256 (str): Hash of the file content
+        text (str): Extracted text
+        extractor_version (str): Version of the text extraction that produced it
+        """
+        self._upsert(sha256, 'text', text, extractor_version=extractor_version)
+
+    def put_parsed(self, sha256, parsed, model_version):
+        """
+        Store parsed resume data
+
+        Parameters:
+        sha256 (str): Hash of the file content
+        parsed (dict): Parsed resume data
+        model_version (str): Version of the model that produced it
+        """
+        self._upsert(sha256, 'parsed', json.dumps(parsed), model_version)
+
+    def put_spell_check(self, sha256, spell_check, model_version):
+        """
+        Store spell check results
+
+        Parameters:
+        sha256 (str): Hash of the file content
+        spell_check (dict): Spell check results
+        model_version (str): Version of the model that produced them
+        """
+        self._upsert(sha256, 'spell_check', json.dumps(spell_check), model_version)
+
+    def invalidate(self, sha256):
+        """
+        Remove a stored document
+
+        Parameters:
+        sha256 (str): Hash of the file content
+
+        Returns:
+        bool: Whether the document was stored
+        """
+        return self._delete(sha256)
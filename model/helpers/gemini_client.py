@@ -1,50 +1,199 @@
 """Gemini API client wrapper for the resume parser"""
-import re
-import json
-import google.generativeai as genai
+import asyncio
+from model.helpers.json_extract import extract_json
+from model.helpers.rate_limiter import RateLimiter, RateLimitExceeded
+from model.helpers.response_cache import ResponseCache
+from model.helpers.single_flight import SingleFlight
+
+# Asks the model for a bare JSON document instead of prose or fenced code
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
 
 
 class GeminiClient:
     """
     Client for the Google Gemini API
     """
-    
-    def __init__(self, api_key):
+
+    def __init__(self, api_key, cache=None, rate_limiter=None):
         """
         Initialize the Gemini client with API key
-        
+
         Parameters:
         api_key (str): Your Gemini API key from Google AI Studio
+        cache (ResponseCache): Optional cache for responses to previously seen prompts
+        rate_limiter (RateLimiter): Optional admission control shared by every call to the API
         """
         self.api_key = api_key
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(model_name="gemini-2.0-flash")
-    
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.single_flight = SingleFlight()
+        self.model_name = "gemini-2.0-flash"
+        self._model = None
+        self.json_repairs = 0
+        self.json_failures = 0
+
+    @property
+    def model(self):
+        """Gemini model, created on first use so the SDK is only imported when it is called"""
+        if self._model is None:
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.api_key)
+            self._model = genai.GenerativeModel(model_name=self.model_name)
+        return self._model
+
+    def _request_key(self, prompt, json_mode=False):
+        """Key identifying interchangeable requests, shared by the cache and call coalescing"""
+        return ResponseCache.make_key(self.model_name, prompt, 'json' if json_mode else None)
+
+    def _call_model(self, prompt, key, json_mode=False):
+        """Call the model under the rate limiter and cache the response text"""
+        generation_config = JSON_GENERATION_CONFIG if json_mode else None
+        if self.rate_limiter is None:
+            response_text = self.model.generate_content(prompt, generation_config=generation_config).text
+        else:
+            response_text = self.rate_limiter.call(
+                lambda: self.model.generate_content(prompt, generation_config=generation_config).text,
+                tokens=RateLimiter.estimate_tokens(prompt)
+            )
+        if self.cache is not None:
+            self.cache.set(key, response_text)
+        return response_text
+
+    async def _acall_model(self, prompt, key, json_mode=False):
+        """Asynchronous version of _call_model"""
+        generation_config = JSON_GENERATION_CONFIG if json_mode else None
+        if self.rate_limiter is None:
+            response = await self.model.generate_content_async(prompt, generation_config=generation_config)
+        else:
+            response = await self.rate_limiter.acall(
+                lambda: self.model.generate_content_async(prompt, generation_config=generation_config),
+                tokens=RateLimiter.estimate_tokens(prompt)
+            )
+        response_text = response.text
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, key, response_text)
+        return response_text
+
+    def generate_text(self, prompt, json_mode=False):
+        """
+        Generate raw response text from the Gemini model
+
+        Cached responses are returned directly, and identical prompts already
+        in flight share that call's response instead of making their own.
+
+        Parameters:
+        prompt (str): Prompt to send to the model
+        json_mode (bool): Ask the model to respond with a bare JSON document
+
+        Returns:
+        str: Response text
+        """
+        key = self._request_key(prompt, json_mode)
+        if self.cache is not None:
+            cached_text = self.cache.get(key)
+            if cached_text is not None:
+                return cached_text
+
+        return self.single_flight.do(key, lambda: self._call_model(prompt, key, json_mode))
+
+    async def agenerate_text(self, prompt, json_mode=False):
+        """
+        Asynchronous version of generate_text that doesn't block the event loop
+
+        Parameters:
+        prompt (str): Prompt to send to the model
+        json_mode (bool): Ask the model to respond with a bare JSON document
+
+        Returns:
+        str: Response text
+        """
+        key = self._request_key(prompt, json_mode)
+        if self.cache is not None:
+            # SQLite reads and writes block, and can wait on another process's write lock
+            cached_text = await asyncio.to_thread(self.cache.get, key)
+            if cached_text is not None:
+                return cached_text
+
+        return await self.single_flight.ado(key, lambda: self._acall_model(prompt, key, json_mode))
+
+    async def awarm_up(self, prompt="Reply with OK"):
+        """
+        Open the connection to the API with a minimal request that bypasses the cache
+
+        Parameters:
+        prompt (str): Tiny prompt to send
+        """
+        model = self.model
+        if self.rate_limiter is None:
+            await model.generate_content_async(prompt)
+        else:
+            await self.rate_limiter.acall(
+                lambda: model.generate_content_async(prompt),
+                tokens=RateLimiter.estimate_tokens(prompt)
+            )
+
+    def stats(self):
+        """
+        Get cache, rate limiter, call coalescing and JSON parsing metrics
+
+        Returns:
+        dict: Metrics for each configured component
+        """
+        return {
+            'cache': self.cache.stats() if self.cache is not None else None,
+            'rate_limiter': self.rate_limiter.stats() if self.rate_limiter is not None else None,
+            'single_flight': self.single_flight.stats(),
+            'json': {'repairs': self.json_repairs, 'failures': self.json_failures}
+        }
+
+    def _parse_json_response(self, prompt, response_text):
+        """Parse the JSON object out of a model response, repairing fencing, trailing commas and truncation"""
+        try:
+            data, repaired = extract_json(response_text, objects_only=True)
+        except ValueError:
+            self.json_failures += 1
+            # Don't keep serving a response we can't use
+            if self.cache is not None:
+                self.cache.delete(self._request_key(prompt, json_mode=True))
+            raise
+
+        if repaired:
+            self.json_repairs += 1
+        return data
+
     def generate_response(self, prompt):
         """
         Generate a response from the Gemini model
-        
+
         Parameters:
         prompt (str): Prompt to send to the model
-        
+
+        Returns:
+        dict: Extracted data as a dictionary
+        """
+        try:
+            response_text = self.generate_text(prompt, json_mode=True)
+            return self._parse_json_response(prompt, response_text)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            raise Exception(f"Error generating response from Gemini: {str(e)}")
+
+    async def agenerate_response(self, prompt):
+        """
+        Asynchronous version of generate_response
+
+        Parameters:
+        prompt (str): Prompt to send to the model
+
         Returns:
         dict: Extracted data as a dictionary
         """
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text
-            
-            # Clean response if needed
-            if "```json" in response_text:
-                match = re.search(r"```json\n(.*?)\n```", response_text, re.DOTALL)
-                if match:
-                    response_text = match.group(1)
-            elif "```" in response_text:
-                match = re.search(r"```\n(.*?)\n```", response_text, re.DOTALL)
-                if match:
-                    response_text = match.group(1)
-            
-            # Parse JSON
-            return json.loads(response_text)
+            response_text = await self.agenerate_text(prompt, json_mode=True)
+            return self._parse_json_response(prompt, response_text)
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            raise Exception(f"Error generating response from Gemini: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Error generating response from Gemini: {str(e)}")
@@ -0,0 +1,144 @@
+"""Locate, repair and parse the JSON payload in model output"""
+import json
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+# Opening brackets tried as the payload's start, for prose like "see [1]" before the JSON
+_MAX_STARTS = 4
+
+
+def extract_json(text, objects_only=False):
+    """
+    Parse the outermost JSON object or array in model output
+
+    The payload is found regardless of code fences or surrounding prose.
+    Trailing commas are dropped, and output cut off mid-document is closed
+    after its last complete value.
+
+    Parameters:
+    text (str): Model response text
+    objects_only (bool): Only look for an object, ignoring arrays and bracketed prose
+
+    Returns:
+    tuple: (parsed value, whether the payload had to be repaired)
+
+    Raises:
+    ValueError: If the text holds no JSON that can be parsed or repaired
+    """
+    openers = '{' if objects_only else '{['
+    start = _find_start(text, 0, openers)
+    if start < 0:
+        raise ValueError("No JSON object found in model response")
+
+    for _ in range(_MAX_STARTS):
+        try:
+            return _parse_from(text, start)
+        except ValueError as e:
+            error = e
+        start = _find_start(text, start + 1, openers)
+        if start < 0:
+            break
+    raise error
+
+
+def _parse_from(text, start):
+    """Parse the JSON value starting at an opening bracket, repairing it if needed"""
+    # Well-formed output, fenced or not, parses without scanning character by character
+    end = text.rfind(_CLOSERS[text[start]])
+    if end > start:
+        try:
+            return json.loads(text[start:end + 1]), False
+        except ValueError:
+            pass
+
+    return json.loads(_scan(text, start)), True
+
+
+def _find_start(text, position, openers):
+    """Index of the next opening character, -1 if there is none"""
+    indices = [index for index in (text.find(opener, position) for opener in openers) if index >= 0]
+    return min(indices) if indices else -1
+
+
+def _scan(text, start):
+    """
+    Single pass over the payload returning a repaired JSON document
+
+    Tracks strings and nesting to find where the outermost value ends,
+    which commas are trailing, and the last point the document could be
+    cut and closed if it turns out to be truncated.
+    """
+    stack = []
+    dropped = set()
+    pending_comma = None
+    in_string = False
+    escaped = False
+    # (end index, open containers) of the latest prefix that closes into valid JSON
+    safe_point = None
+
+    for index in range(start, len(text)):
+        char = text[index]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char in ' \t\r\n':
+            continue
+
+        if char in '}]':
+            if pending_comma is not None:
+                dropped.add(pending_comma)
+            pending_comma = None
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                return _join(text, start, index + 1, dropped)
+            safe_point = (index + 1, tuple(stack))
+            continue
+
+        if char == ',':
+            if pending_comma is None:
+                safe_point = (index, tuple(stack))
+            else:
+                # Repeated comma, drop it too
+                dropped.add(index)
+                continue
+            pending_comma = index
+            continue
+
+        pending_comma = None
+        if char in '{[':
+            stack.append(char)
+            safe_point = (index + 1, tuple(stack))
+        elif char == '"':
+            in_string = True
+
+    # Truncated: first try closing everything where the text stops
+    closing = ''.join(_CLOSERS[opener] for opener in reversed(stack))
+    candidate = _join(text, start, len(text), dropped).rstrip().rstrip(',')
+    candidate += ('"' if in_string else '') + closing
+    try:
+        json.loads(candidate)
+        return candidate
+    except ValueError:
+        pass
+
+    # Otherwise drop the incomplete trailing value
+    if safe_point is None:
+        raise ValueError("Could not repair JSON in model response")
+    cut, open_containers = safe_point
+    return _join(text, start, cut, dropped) + ''.join(_CLOSERS[opener] for opener in reversed(open_containers))
+
+
+def _join(text, start, stop, dropped):
+    """Slice the payload, leaving out dropped characters"""
+    if not dropped:
+        return text[start:stop]
+    return ''.join(text[i] for i in range(start, stop) if i not in dropped)
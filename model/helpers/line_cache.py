@@ -0,0 +1,97 @@
+"""In-memory LRU cache of per-line results"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LineCache:
+    """
+    Maps a hash of a normalized line of text to a result, evicting the least recently used lines
+
+    Lines are normalized by collapsing whitespace, so the same line with
+    different indentation or spacing shares an entry.
+    """
+
+    def __init__(self, max_entries=50000):
+        """
+        Initialize an empty cache
+
+        Parameters:
+        max_entries (int): Maximum number of cached lines
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(line):
+        """
+        Build the cache key for a line
+
+        Parameters:
+        line (str): Line of text
+
+        Returns:
+        bytes: Digest of the normalized line
+        """
+        return hashlib.blake2b(' '.join(line.split()).encode('utf-8'), digest_size=16).digest()
+
+    def get(self, line):
+        """
+        Look up a line's cached result
+
+        Parameters:
+        line (str): Line of text
+
+        Returns:
+        object: Cached result, or None on a miss
+        """
+        key = self.make_key(line)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, line, value):
+        """
+        Cache a line's result
+
+        Parameters:
+        line (str): Line of text
+        value (object): Result to cache, not None
+        """
+        key = self.make_key(line)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every cached line"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+        dict: Entry count plus hit, miss and eviction counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
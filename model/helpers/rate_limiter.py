@@ -0,0 +1,311 @@
+"""Admission control for Gemini API calls"""
+import asyncio
+import collections
+import random
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a request can't be admitted within the quota, or keeps being throttled upstream
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        """
+        Initialize a full bucket
+
+        Parameters:
+        per_minute (float): Tokens added per minute
+        capacity (float): Maximum burst size, defaults to one minute's worth of tokens
+        """
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        self._rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, amount=1):
+        """
+        Take tokens from the bucket, going into debt if there aren't enough
+
+        Parameters:
+        amount (float): Number of tokens needed
+
+        Returns:
+        float: Seconds the caller must wait before the reserved tokens are available
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= min(amount, self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def refund(self, amount=1):
+        """Return previously reserved tokens that won't be used"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+    def available(self):
+        """Get the number of tokens currently in the bucket"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class _Slots:
+    """
+    Concurrency slots shared by blocking and asynchronous callers, granted in arrival order
+
+    A released slot is handed straight to the oldest waiter, so callers
+    arriving later can't take it first and starve one that is waiting.
+    """
+
+    def __init__(self, count):
+        self._free = count
+        self._waiters = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a slot, blocking the thread until one is granted"""
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self):
+        """Take a slot, waiting without blocking the event loop until one is granted"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        future = waiter[1]
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                waiting = waiter in self._waiters
+                if waiting:
+                    self._waiters.remove(waiter)
+            # Granted just before the cancellation, so pass the slot on; a grant still
+            # in flight finds the future cancelled and passes it on itself
+            if not waiting and future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        """Give a slot back, to the oldest waiter if there is one"""
+        with self._lock:
+            if not self._waiters:
+                self._free += 1
+                return
+            waiter = self._waiters.popleft()
+
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(self._grant, future)
+        except RuntimeError:
+            # The waiter's event loop has closed
+            self.release()
+
+    def _grant(self, future):
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class RateLimiter:
+    """
+    Limits concurrent and per-minute Gemini calls, retrying throttled or failed calls with jittered backoff
+    """
+
+    def __init__(self, max_in_flight=8, requests_per_minute=None, tokens_per_minute=None,
+                 max_retries=5, base_delay=1.0, max_delay=30.0, max_queue_seconds=60.0):
+        """
+        Initialize the rate limiter
+
+        Parameters:
+        max_in_flight (int): Maximum number of concurrent calls
+        requests_per_minute (float): Request quota, None for unlimited
+        tokens_per_minute (float): Prompt token quota, None for unlimited
+        max_retries (int): Retries for calls failing with 429 or 5xx
+        base_delay (float): Backoff before the first retry in seconds
+        max_delay (float): Upper bound for a single backoff in seconds
+        max_queue_seconds (float): Reject calls that would wait longer than this for quota
+        """
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_queue_seconds = max_queue_seconds
+
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self._slots = _Slots(max_in_flight)
+        self._lock = threading.Lock()
+        self._counters = {
+            'requests': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'throttled': 0,
+            'throttled_seconds': 0.0,
+            'retries': 0,
+            'rejected': 0,
+            'failures': 0
+        }
+
+    @staticmethod
+    def estimate_tokens(prompt):
+        """Roughly estimate the number of tokens in a prompt"""
+        return len(prompt) // 4 + 1
+
+    @staticmethod
+    def is_retryable(error):
+        """Check whether an error is a 429 or 5xx response from the API"""
+        code = getattr(error, 'code', None)
+        return isinstance(code, int) and (code == 429 or 500 <= code < 600)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _reserve(self, tokens):
+        """Reserve quota for a call and return how long to wait before making it"""
+        request_wait = self.request_bucket.reserve(1) if self.request_bucket else 0.0
+        token_wait = self.token_bucket.reserve(tokens) if self.token_bucket else 0.0
+        wait = max(request_wait, token_wait)
+
+        if wait > self.max_queue_seconds:
+            if self.request_bucket:
+                self.request_bucket.refund(1)
+            if self.token_bucket:
+                self.token_bucket.refund(tokens)
+            self._count('rejected')
+            raise RateLimitExceeded("Gemini request quota exhausted", retry_after=wait)
+
+        if wait > 0:
+            self._count('throttled')
+            self._count('throttled_seconds', wait)
+        return wait
+
+    def _enter(self):
+        with self._lock:
+            self._counters['requests'] += 1
+            self._counters['in_flight'] += 1
+            self._counters['peak_in_flight'] = max(self._counters['peak_in_flight'], self._counters['in_flight'])
+
+    def _exit(self):
+        with self._lock:
+            self._counters['in_flight'] -= 1
+        self._slots.release()
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _give_up(self, error):
+        self._count('failures')
+        if getattr(error, 'code', None) == 429:
+            raise RateLimitExceeded(f"Gemini quota exceeded: {str(error)}", retry_after=self.max_delay) from error
+        raise error
+
+    def call(self, func, tokens=1):
+        """
+        Run a blocking API call under the limits
+
+        Parameters:
+        func (callable): Function making the API call
+        tokens (int): Estimated prompt tokens used by the call
+
+        Returns:
+        object: Whatever func returns
+        """
+        attempt = 0
+        while True:
+            time.sleep(self._reserve(tokens))
+            self._slots.acquire()
+            self._enter()
+            try:
+                return func()
+            except Exception as e:
+                if not self.is_retryable(e) or attempt >= self.max_retries:
+                    self._give_up(e)
+            finally:
+                self._exit()
+
+            self._count('retries')
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def acall(self, func, tokens=1):
+        """
+        Asynchronous version of call
+
+        Parameters:
+        func (callable): Function returning an awaitable that makes the API call
+        tokens (int): Estimated prompt tokens used by the call
+
+        Returns:
+        object: Whatever the awaitable returns
+        """
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._reserve(tokens))
+            await self._slots.aacquire()
+            self._enter()
+            try:
+                return await func()
+            except Exception as e:
+                if not self.is_retryable(e) or attempt >= self.max_retries:
+                    self._give_up(e)
+            finally:
+                self._exit()
+
+            self._count('retries')
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def stats(self):
+        """
+        Get limiter configuration and counters
+
+        Returns:
+        dict: Limits, current usage and throttling counters
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats['max_in_flight'] = self.max_in_flight
+        stats['requests_per_minute'] = self.request_bucket.per_minute if self.request_bucket else None
+        stats['tokens_per_minute'] = self.token_bucket.per_minute if self.token_bucket else None
+        stats['available_requests'] = self.request_bucket.available() if self.request_bucket else None
+        stats['available_tokens'] = self.token_bucket.available() if self.token_bucket else None
+        return stats
@@ -0,0 +1,98 @@
+"""Persistent, content-addressed cache for LLM responses"""
+import hashlib
+import time
+
+from model.helpers.sqlite_cache import SqliteCache
+
+
+class ResponseCache(SqliteCache):
+    """
+    SQLite-backed cache mapping a hash of (model name, prompt) to the raw response text
+    """
+
+    def __init__(self, path, max_entries=10000, ttl_seconds=7 * 24 * 3600, evict_every=100):
+        """
+        Initialize the cache and create its table if needed
+
+        Parameters:
+        path (str): Path to the SQLite database file (":memory:" for a private in-memory cache)
+        max_entries (int): Maximum number of cached responses, None for unbounded
+        ttl_seconds (float): Lifetime of a cached response in seconds, None to never expire
+        evict_every (int): Writes between eviction passes
+        """
+        super().__init__(path, 'responses', 'key', ['value TEXT NOT NULL'], max_entries, ttl_seconds, evict_every)
+
+    @staticmethod
+    def make_key(model_name, prompt, generation_mode=None):
+        """
+        Build the cache key for a prompt sent to a given model
+
+        Parameters:
+        model_name (str): Name of the model the prompt is sent to
+        prompt (str): Prompt text
+        generation_mode (str): Output mode requested from the model, e.g. 'json', None for plain text
+
+        Returns:
+        str: Hex SHA-256 digest identifying the request
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        if generation_mode is not None:
+            digest.update(b'\0')
+            digest.update(generation_mode.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached response
+
+        Parameters:
+        key (str): Cache key from make_key
+
+        Returns:
+        str: Cached response text, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self._is_expired(created_at, now):
+                self._expire(key)
+                return None
+
+            self._touch(key, now)
+            return value
+
+    def set(self, key, value):
+        """
+        Store a response, evicting expired or least recently used entries every evict_every writes
+
+        Parameters:
+        key (str): Cache key from make_key
+        value (str): Response text to store
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._written(now)
+
+    def delete(self, key):
+        """
+        Remove a single cached response
+
+        Parameters:
+        key (str): Cache key from make_key
+        """
+        self._delete(key)
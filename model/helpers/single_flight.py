@@ -0,0 +1,99 @@
+"""Coalescing of identical concurrent calls"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time and shares its result with every concurrent caller of the same key
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight"""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _record(self, leader):
+        with self._lock:
+            if leader:
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+    def do(self, key, func):
+        """
+        Call func, or wait for the identical call already in flight
+
+        Parameters:
+        key (str): Identifies calls that are interchangeable
+        func (callable): Function making the call
+
+        Returns:
+        object: Result of the call, shared by every concurrent caller with this key
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        self._record(leader)
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+        future.set_result(result)
+        return result
+
+    async def ado(self, key, func):
+        """
+        Asynchronous version of do
+
+        The call runs as its own task, so cancelling one caller doesn't cancel it for the others.
+
+        Parameters:
+        key (str): Identifies calls that are interchangeable
+        func (callable): Function returning an awaitable that makes the call
+
+        Returns:
+        object: Result of the call, shared by every concurrent caller with this key
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+
+        task = self._tasks.get(task_key)
+        leader = task is None
+        if leader:
+            task = loop.create_task(func())
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+        self._record(leader)
+
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """
+        Get coalescing counters
+
+        Returns:
+        dict: Calls made, calls that joined one already in flight, and calls in flight now
+        """
+        with self._lock:
+            return {
+                'calls': self.leaders,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls) + len(self._tasks)
+            }
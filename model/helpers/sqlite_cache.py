@@ -0,0 +1,125 @@
+"""SQLite table bounded by entry count and age, shared by the response cache and document store"""
+import sqlite3
+import threading
+
+
+class SqliteCache:
+    """
+    Base for SQLite-backed caches whose entries expire and are evicted least recently used first
+
+    Subclasses name their table and key column and list their own columns;
+    created_at and accessed_at are added, and indexed for eviction. Expired
+    and surplus entries are evicted every evict_every writes rather than on
+    each one, so a cache can briefly hold up to evict_every - 1 entries over
+    max_entries.
+    """
+
+    def __init__(self, path, table, key_column, columns, max_entries=None, ttl_seconds=None, evict_every=100):
+        """
+        Open the database and create the table if needed
+
+        Parameters:
+        path (str): Path to the SQLite database file (":memory:" for a private in-memory cache)
+        table (str): Table name
+        key_column (str): Name of the TEXT primary key column
+        columns (list): "name TYPE" definitions of the other columns; ones missing from an
+            existing table are added
+        max_entries (int): Maximum number of entries, None for unbounded
+        ttl_seconds (float): Lifetime of an entry in seconds, None to never expire
+        evict_every (int): Writes between eviction passes
+        """
+        self.path = path
+        self.table = table
+        self.key_column = key_column
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = max(1, evict_every)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ({key_column} TEXT PRIMARY KEY, {', '.join(columns)}, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for column in columns:
+            if column.split()[0] not in existing:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at)")
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _expire(self, key):
+        """Drop an entry found expired on read, counting the read as a miss; call with the lock held"""
+        self._conn.execute(f"DELETE FROM {self.table} WHERE {self.key_column} = ?", (key,))
+        self.evictions += 1
+        self.misses += 1
+
+    def _touch(self, key, now):
+        """Mark an entry as used by a read, counting it as a hit; call with the lock held"""
+        self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE {self.key_column} = ?", (now, key))
+        self.hits += 1
+
+    def _written(self, now):
+        """Count a write, evicting once every evict_every writes; call with the lock held"""
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self._evict(now)
+
+    def _evict(self, now):
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+        if self.max_entries is not None:
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            if count > self.max_entries:
+                cursor = self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE {self.key_column} IN "
+                    f"(SELECT {self.key_column} FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                self.evictions += max(cursor.rowcount, 0)
+
+    def _delete(self, key):
+        """Remove one entry, returning whether it was there"""
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM {self.table} WHERE {self.key_column} = ?", (key,))
+            return cursor.rowcount > 0
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+        dict: Entry count plus hit, miss and eviction counters
+        """
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            return {
+                'entries': entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
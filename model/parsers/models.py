@@ -0,0 +1,174 @@
+"""Immutable result objects produced by the resume parser"""
+import json
+from dataclasses import dataclass
+
+
+def _as_tuple(value):
+    """Normalize a list field from the model's output, which may be missing or a single value"""
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+@dataclass(frozen=True, slots=True)
+class ContactInfo:
+    """Contact details of the candidate"""
+    name: str | None = None
+    email: str | None = None
+    phone: str | None = None
+    location: str | None = None
+    linkedin: str | None = None
+    github: str | None = None
+    portfolio: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build contact info from a dictionary, ignoring unknown keys
+
+        Parameters:
+        data (dict): Contact info as returned by the model
+
+        Returns:
+        ContactInfo: Contact details, empty if data isn't a dictionary
+        """
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            name=data.get('name'),
+            email=data.get('email'),
+            phone=data.get('phone'),
+            location=data.get('location'),
+            linkedin=data.get('linkedin'),
+            github=data.get('github'),
+            portfolio=data.get('portfolio')
+        )
+
+    def to_dict(self):
+        """Convert to a plain dictionary"""
+        return {
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'location': self.location,
+            'linkedin': self.linkedin,
+            'github': self.github,
+            'portfolio': self.portfolio
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Skills:
+    """Skills of the candidate grouped by type"""
+    technical: tuple = ()
+    soft: tuple = ()
+    languages: tuple = ()
+    tools: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build skills from a dictionary of skill lists
+
+        Parameters:
+        data (dict): Skills as returned by the model
+
+        Returns:
+        Skills: Skills, empty if data isn't a dictionary
+        """
+        if not isinstance(data, dict):
+            return cls()
+        return cls(
+            technical=_as_tuple(data.get('technical')),
+            soft=_as_tuple(data.get('soft')),
+            languages=_as_tuple(data.get('languages')),
+            tools=_as_tuple(data.get('tools'))
+        )
+
+    def to_dict(self):
+        """Convert to a dictionary of lists"""
+        return {
+            'technical': list(self.technical),
+            'soft': list(self.soft),
+            'languages': list(self.languages),
+            'tools': list(self.tools)
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedResume:
+    """
+    Structured data parsed from a resume
+
+    Section entries such as education or projects are kept as the
+    dictionaries the model returned, since their fields vary between resumes.
+    """
+    contact_info: ContactInfo = ContactInfo()
+    education: tuple = ()
+    work_experience: tuple = ()
+    skills: Skills = Skills()
+    projects: tuple = ()
+    certifications: tuple = ()
+    publications: tuple = ()
+    summary: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a result from the model's output or a stored result dictionary
+
+        Parameters:
+        data (dict): Parsed resume data
+
+        Returns:
+        ParsedResume: Parsed resume, with missing sections left empty
+        """
+        return cls(
+            contact_info=ContactInfo.from_dict(data.get('contact_info')),
+            education=_as_tuple(data.get('education')),
+            work_experience=_as_tuple(data.get('work_experience')),
+            skills=Skills.from_dict(data.get('skills')),
+            projects=_as_tuple(data.get('projects')),
+            certifications=_as_tuple(data.get('certifications')),
+            publications=_as_tuple(data.get('publications')),
+            summary=data.get('summary')
+        )
+
+    def to_dict(self, include_summary=True):
+        """
+        Convert to the dictionary structure returned by the API
+
+        Section entries are shared with this object rather than copied.
+
+        Parameters:
+        include_summary (bool): Whether to include the summary key
+
+        Returns:
+        dict: Structured resume data
+        """
+        result = {
+            'contact_info': self.contact_info.to_dict(),
+            'education': list(self.education),
+            'work_experience': list(self.work_experience),
+            'skills': self.skills.to_dict(),
+            'projects': list(self.projects),
+            'certifications': list(self.certifications),
+            'publications': list(self.publications)
+        }
+        if include_summary:
+            result['summary'] = self.summary
+        return result
+
+    def to_json(self, include_summary=True):
+        """
+        Encode as compact JSON
+
+        Parameters:
+        include_summary (bool): Whether to include the summary key
+
+        Returns:
+        str: JSON document
+        """
+        return json.dumps(self.to_dict(include_summary), separators=(',', ':'))
@@ -0,0 +1,110 @@
+"""Rough structure of a resume found from its text alone, without the model"""
+import re
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<!\w)\+?\(?\d[\d \t().-]{7,}\d(?!\w)")
+# Date ranges such as "2019-2023" or "2015 - 2019" are digit runs the phone pattern would take
+_YEAR_RANGE = re.compile(r"\d{4}\s*[-–]\s*\d{4}")
+_NAME = re.compile(r"[A-Z][A-Za-z'.-]*(?:\s+[A-Z][A-Za-z'.-]*){1,3}")
+
+# Headings of the sections used for completeness, with the other common headings that end a section
+_HEADINGS = {
+    'education': 'education',
+    'academic background': 'education',
+    'academics': 'education',
+    'qualifications': 'education',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'core competencies': 'skills',
+    'technologies': 'skills',
+    'tech stack': 'skills',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'employment': 'experience',
+    'employment history': 'experience',
+    'work history': 'experience',
+    'internships': 'experience',
+    'summary': None,
+    'professional summary': None,
+    'profile': None,
+    'objective': None,
+    'projects': None,
+    'certifications': None,
+    'publications': None,
+    'awards': None,
+    'achievements': None,
+    'interests': None,
+    'references': None,
+    'volunteering': None,
+    'volunteer experience': None,
+}
+
+
+def _heading(line):
+    """Section of a heading line and any content after a colon, or None if the line isn't a heading"""
+    title, _, rest = line.partition(':')
+    key = ' '.join(title.lower().split()).strip(' -#*')
+    if key not in _HEADINGS:
+        return None
+    return _HEADINGS[key], rest.strip()
+
+
+def _find_phone(text):
+    """First run of at least 10 digits that isn't a date range, or None"""
+    for match in _PHONE.finditer(text):
+        candidate = match.group().strip()
+        if sum(char.isdigit() for char in candidate) >= 10 and not _YEAR_RANGE.search(candidate):
+            return candidate
+    return None
+
+
+def outline_resume(text):
+    """
+    Find a resume's contact details and main sections without calling the model
+
+    Entries are the raw lines under each heading, so the result is only good
+    for checking which parts a resume has, not for displaying them.
+
+    Parameters:
+    text (str): Resume text
+
+    Returns:
+    dict: Parsed resume data with contact_info name, email and phone, education and
+    work_experience entries as {'text': line}, and technical skills
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+
+    email = _EMAIL.search(text)
+    phone = _find_phone(text)
+    name = None
+    # The name is usually the first line of a resume
+    if lines and _NAME.fullmatch(lines[0]) and not _heading(lines[0]):
+        name = lines[0]
+
+    sections = {'education': [], 'skills': [], 'experience': []}
+    current = None
+    for line in lines:
+        heading = _heading(line)
+        if heading is not None:
+            current, rest = heading
+            if current is not None and rest:
+                sections[current].append(rest)
+        elif current is not None:
+            sections[current].append(line)
+
+    skills = [skill.strip() for line in sections['skills'] for skill in re.split(r"[,;|•]", line) if skill.strip()]
+
+    return {
+        'contact_info': {
+            'name': name,
+            'email': email.group() if email else None,
+            'phone': phone
+        },
+        'education': [{'text': line} for line in sections['education']],
+        'work_experience': [{'text': line} for line in sections['experience']],
+        'skills': {'technical': skills, 'soft': [], 'languages': [], 'tools': []},
+        'projects': [],
+        'certifications': [],
+        'publications': []
+    }
@@ -1,50 +1,45 @@
-import pandas as pd
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from model.extractors.text_extractor import TextExtractor
 from model.helpers.gemini_client import GeminiClient
+from model.helpers.rate_limiter import RateLimitExceeded
 from model.analyzers.spell_checker import SpellChecker
 from model.analyzers.job_matcher import JobMatcher
+from model.parsers.models import ParsedResume
+from model.parsers.outline import outline_resume
+
+# Bump when prompts or post-processing change, so stored results from older versions aren't reused
+PROMPT_VERSION = 2
 
 
 class ResumeParser:
-    def __init__(self, gemini_api_key):
+    """
+    Parses and analyzes resumes
+
+    Holds no per-request state, so one instance can be shared across threads and tasks.
+    """
+
+    def __init__(self, gemini_api_key, cache=None, rate_limiter=None):
         """
         Initialize the ResumeParser with Gemini API integration
         
         Parameters:
         gemini_api_key (str): Your Gemini API key from Google AI Studio
+        cache (ResponseCache): Optional cache for Gemini responses
+        rate_limiter (RateLimiter): Optional admission control for Gemini calls
         """
-        self.gemini_client = GeminiClient(gemini_api_key)
+        self.gemini_client = GeminiClient(gemini_api_key, cache=cache, rate_limiter=rate_limiter)
         self.spell_checker = SpellChecker(self.gemini_client)
         self.job_matcher = JobMatcher(self.gemini_client)
-        
-        # Default structure for extracted data
-        self.extracted_data = {
-            'contact_info': {
-                'name': None,
-                'email': None,
-                'phone': None,
-                'location': None,
-                'linkedin': None,
-                'github': None,
-                'portfolio': None
-            },
-            'education': [],
-            'work_experience': [],
-            'skills': {
-                'technical': [],
-                'soft': [],
-                'languages': [],
-                'tools': []
-            },
-            'projects': [],
-            'certifications': [],
-            'publications': [],
-            'summary': None
-        }
-    
+
+    @property
+    def model_version(self):
+        """Identifies the model and prompts producing this parser's results"""
+        return f"{self.gemini_client.model_name}/v{PROMPT_VERSION}"
+
     def extract_text_from_file(self, file_path):
         """
-        Extract text from file based on its extension
+        Extract text from a file, identifying its format from its content
         
         Parameters:
         file_path (str): Path to the file
@@ -54,33 +49,34 @@ class ResumeParser:
         """
         return TextExtractor.extract_text_from_file(file_path)
 
-    def extract_text_from_uploaded_file(self, uploaded_file, filename=None):
+    def extract_text_from_stream(self, stream):
         """
-        Extract text from uploaded file
+        Extract text from a binary file-like object
         
         Parameters:
-        uploaded_file: The file content (could be bytes or file-like object)
-        filename: Optional filename if not available in uploaded_file
+        stream: Seekable binary file-like object positioned at the start of the file
         
         Returns:
         str: Extracted text content
         """
-        return TextExtractor.extract_text_from_uploaded_file(uploaded_file, filename)
+        return TextExtractor.extract_text_from_stream(stream)
 
-    def parse_resume(self, text, include_summary=True):
+    def extract_text_from_uploaded_file(self, uploaded_file, filename=None):
         """
-        Parse resume text using Gemini API
+        Extract text from uploaded file
         
         Parameters:
-        text (str): The resume text content
-        include_summary (bool): Whether to include summary in output
+        uploaded_file: The file content (could be bytes or file-like object)
+        filename: Optional filename, checked against the format identified from the content
         
         Returns:
-        dict: Structured resume data
+        str: Extracted text content
         """
-        try:
-            # Customize prompt 
-            prompt = f"""You are a professional resume parser that extracts detailed and accurate information from resumes. Focus especially on extracting contact information, education, and skills.
+        return TextExtractor.extract_text_from_uploaded_file(uploaded_file, filename)
+
+    def _build_parse_prompt(self, text):
+        """Build the resume parsing prompt for a resume's text"""
+        return f"""You are a professional resume parser that extracts detailed and accurate information from resumes. Focus especially on extracting contact information, education, and skills.
 
 Extract the following information from this resume and provide it in JSON format:
 
@@ -124,72 +120,71 @@ Resume text:
 {text}
 """
 
-            # Get response from Gemini
-            extracted_data = self.gemini_client.generate_response(prompt)
-            
-            # Update our standard structure with the extracted data
-            self.extracted_data = {
-                'contact_info': extracted_data.get('contact_info', {
-                    'name': None,
-                    'email': None,
-                    'phone': None,
-                    'location': None,
-                    'linkedin': None,
-                    'github': None,
-                    'portfolio': None
-                }),
-                'education': extracted_data.get('education', []),
-                'work_experience': extracted_data.get('work_experience', []),
-                'skills': extracted_data.get('skills', {
-                    'technical': [],
-                    'soft': [],
-                    'languages': [],
-                    'tools': []
-                }),
-                'projects': extracted_data.get('projects', []),
-                'certifications': extracted_data.get('certifications', []),
-                'publications': extracted_data.get('publications', [])
-            }
-            
-            # Only include summary if requested
-            if include_summary:
-                self.extracted_data['summary'] = extracted_data.get('summary', None)
-            else:
-                self.extracted_data.pop('summary', None)
-            
-            return self.extracted_data
+    def parse(self, text):
+        """
+        Parse resume text using Gemini API
+        
+        Parameters:
+        text (str): The resume text content
+        
+        Returns:
+        ParsedResume: Structured resume data, empty if parsing fails
+        """
+        try:
+            extracted_data = self.gemini_client.generate_response(self._build_parse_prompt(text))
+            return ParsedResume.from_dict(extracted_data)
             
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"Error parsing resume with Gemini: {str(e)}")
+            return ParsedResume()
+
+    async def aparse(self, text):
+        """
+        Asynchronous version of parse that doesn't block the event loop
+        
+        Parameters:
+        text (str): The resume text content
+        
+        Returns:
+        ParsedResume: Structured resume data, empty if parsing fails
+        """
+        try:
+            extracted_data = await self.gemini_client.agenerate_response(self._build_parse_prompt(text))
+            return ParsedResume.from_dict(extracted_data)
             
-            # Return empty structure if parsing fails
-            default_structure = {
-                'contact_info': {
-                    'name': None,
-                    'email': None,
-                    'phone': None,
-                    'location': None,
-                    'linkedin': None,
-                    'github': None,
-                    'portfolio': None
-                },
-                'education': [],
-                'work_experience': [],
-                'skills': {
-                    'technical': [],
-                    'soft': [],
-                    'languages': [],
-                    'tools': []
-                },
-                'projects': [],
-                'certifications': [],
-                'publications': []
-            }
-            
-            if include_summary:
-                default_structure['summary'] = None
-                
-            return default_structure
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"Error parsing resume with Gemini: {str(e)}")
+            return ParsedResume()
+
+    def parse_resume(self, text, include_summary=True):
+        """
+        Parse resume text using Gemini API
+        
+        Parameters:
+        text (str): The resume text content
+        include_summary (bool): Whether to include summary in output
+        
+        Returns:
+        dict: Structured resume data
+        """
+        return self.parse(text).to_dict(include_summary)
+
+    async def aparse_resume(self, text, include_summary=True):
+        """
+        Asynchronous version of parse_resume that doesn't block the event loop
+        
+        Parameters:
+        text (str): The resume text content
+        include_summary (bool): Whether to include summary in output
+        
+        Returns:
+        dict: Structured resume data
+        """
+        return (await self.aparse(text)).to_dict(include_summary)
 
     def parse_resume_from_file(self, file_path, include_summary=True):
         """Parse resume from a file path"""
@@ -221,6 +216,8 @@ Resume text:
         Returns:
         dict: Dictionary of DataFrames for different sections
         """
+        import pandas as pd
+
         dataframes = {}
         
         # Contact info DataFrame
@@ -280,6 +277,18 @@ Resume text:
         dict: Spell check results
         """
         return self.spell_checker.check_spelling(resume_text)
+
+    async def aspell_check_resume(self, resume_text):
+        """
+        Asynchronous version of spell_check_resume
+        
+        Parameters:
+        resume_text (str): The raw resume text
+        
+        Returns:
+        dict: Spell check results
+        """
+        return await self.spell_checker.acheck_spelling(resume_text)
     
     def compare_resume_to_jd(self, resume_data, job_description):
         """
@@ -293,19 +302,72 @@ Resume text:
         dict: Comparison results with match score, matches, gaps, and recommendations
         """
         return self.job_matcher.compare_resume_to_job(resume_data, job_description)
+
+    async def acompare_resume_to_jd(self, resume_data, job_description):
+        """
+        Asynchronous version of compare_resume_to_jd
         
-    def calculate_resume_quality_score(self, resume_data, raw_text=None):
+        Parameters:
+        resume_data (dict): Parsed resume data
+        job_description (str): Job description text
+        
+        Returns:
+        dict: Comparison results with match score, matches, gaps, and recommendations
         """
-        Calculate an overall quality score for a resume
+        return await self.job_matcher.acompare_resume_to_job(resume_data, job_description)
+
+    async def aextract_jd_requirements(self, job_description):
+        """
+        Extract the requirements from a job description once, for matching against many resumes
         
         Parameters:
-        resume_data (dict): The parsed resume data
-        raw_text (str): Optional raw resume text for spell checking
+        job_description (str): Job description text
         
         Returns:
-        dict: Quality metrics and improvement suggestions
+        dict: Technical, soft, education and experience requirements
+        """
+        return await self.job_matcher.aextract_requirements(job_description)
+
+    def compile_jd_requirements(self, jd_requirements):
         """
-        metrics = {}
+        Compile extracted job requirements once for scoring many resumes
+        
+        Parameters:
+        jd_requirements (dict): Requirements from aextract_jd_requirements
+        
+        Returns:
+        RequirementMatcher: Compiled requirements accepted by match_resume_to_requirements
+        """
+        return self.job_matcher.compile_requirements(jd_requirements)
+
+    def match_resume_to_requirements(self, resume_data, jd_requirements):
+        """
+        Score a resume against already extracted job requirements without any AI calls
+        
+        Parameters:
+        resume_data (dict): Parsed resume data
+        jd_requirements (dict or RequirementMatcher): Requirements from aextract_jd_requirements,
+            optionally compiled with compile_jd_requirements
+        
+        Returns:
+        dict: Match score, matches, gaps and rule-based recommendations
+        """
+        return self.job_matcher.match_requirements(resume_data, jd_requirements)
+        
+    def outline_resume(self, resume_text):
+        """
+        Find a resume's contact details and main sections without any AI calls
+        
+        Parameters:
+        resume_text (str): The raw resume text
+        
+        Returns:
+        dict: Rough parsed resume data, good enough for calculate_resume_quality_score with local_only
+        """
+        return outline_resume(resume_text)
+
+    def _completeness(self, resume_data):
+        """Percentage of the expected resume sections present, with suggestions for the missing ones"""
         suggestions = []
         
         # Check completeness
@@ -342,24 +404,11 @@ Resume text:
             suggestions.append("Include your work experience with detailed responsibilities")
         
         # Calculate completeness percentage
-        completeness_percentage = round((completeness_score / total_checks) * 100)
-        metrics['completeness'] = completeness_percentage
-        
-        # Spell check if raw text is provided
-        if raw_text:
-            spell_check_results = self.spell_check_resume(raw_text)
-            metrics['spelling_errors'] = spell_check_results['summary']['total_errors']
-            metrics['spelling_severity'] = spell_check_results['summary']['severity']
-            
-            # Store detailed spelling errors for display
-            metrics['spelling_details'] = spell_check_results.get('errors', [])
-            
-            if spell_check_results['summary']['total_errors'] > 0:
-                suggestions.append(spell_check_results['summary']['improvement_recommendation'])
-        
-        # AI-generated quality assessment
-        try:
-            prompt = f"""Analyze this resume data and provide a brief quality assessment with 2-3 specific improvement suggestions:
+        return round((completeness_score / total_checks) * 100), suggestions
+
+    def _quality_prompt(self, resume_data):
+        """Build the quality assessment prompt for parsed resume data"""
+        return f"""Analyze this resume data and provide a brief quality assessment with 2-3 specific improvement suggestions:
 
             Contact Info: {resume_data['contact_info']}
             Education: {resume_data['education']}
@@ -369,43 +418,139 @@ Resume text:
 
             Focus on structure, content completeness, and professional presentation.
             """
+
+    @staticmethod
+    def _quality_rating(overall_score):
+        """Rating label for an overall score"""
+        if overall_score >= 90:
+            return "Excellent"
+        if overall_score >= 75:
+            return "Good"
+        if overall_score >= 60:
+            return "Average"
+        return "Needs Improvement"
+
+    def _quality_result(self, resume_data, spell_check_results, ai_assessment, assessment_error):
+        """Combine completeness, spell check results and the AI assessment into the quality score"""
+        completeness_percentage, suggestions = self._completeness(resume_data)
+        metrics = {'completeness': completeness_percentage}
+        
+        if spell_check_results is not None:
+            metrics['spelling_errors'] = spell_check_results['summary']['total_errors']
+            metrics['spelling_severity'] = spell_check_results['summary']['severity']
             
-            response = self.gemini_client.model.generate_content(prompt)
-            ai_assessment = response.text
-            
-            # Extract additional suggestions
-            ai_suggestions = [line.strip() for line in ai_assessment.split('\n') if line.strip() and not line.strip().lower().startswith(('quality', 'assessment', 'analysis', 'overall'))]
-            suggestions.extend(ai_suggestions[:3])  # Add up to 3 AI suggestions
-            
-            # Calculate overall score (weighted)
-            overall_score = completeness_percentage
-            if 'spelling_errors' in metrics:
-                # Adjust score based on spelling errors
-                spelling_penalty = min(30, metrics['spelling_errors'] * 3)  # Cap at 30% deduction
-                overall_score = max(0, overall_score - spelling_penalty)
-            
-            metrics['overall_score'] = overall_score
-            
-            # Add quality rating
-            if overall_score >= 90:
-                metrics['quality_rating'] = "Excellent"
-            elif overall_score >= 75:
-                metrics['quality_rating'] = "Good"
-            elif overall_score >= 60:
-                metrics['quality_rating'] = "Average"
-            else:
-                metrics['quality_rating'] = "Needs Improvement"
+            # Store detailed spelling errors for display
+            metrics['spelling_details'] = spell_check_results.get('errors', [])
             
+            if spell_check_results['summary']['total_errors'] > 0:
+                suggestions.append(spell_check_results['summary']['improvement_recommendation'])
+        
+        if assessment_error is not None:
+            metrics['overall_score'] = completeness_percentage
             return {
                 'metrics': metrics,
                 'suggestions': suggestions,
-                'assessment': ai_assessment
+                'assessment': f"Error generating AI assessment: {str(assessment_error)}"
             }
-            
+        
+        # Extract additional suggestions
+        ai_suggestions = [line.strip() for line in ai_assessment.split('\n') if line.strip() and not line.strip().lower().startswith(('quality', 'assessment', 'analysis', 'overall'))]
+        suggestions.extend(ai_suggestions[:3])  # Add up to 3 AI suggestions
+        
+        # Calculate overall score (weighted)
+        overall_score = completeness_percentage
+        if 'spelling_errors' in metrics:
+            # Adjust score based on spelling errors
+            spelling_penalty = min(30, metrics['spelling_errors'] * 3)  # Cap at 30% deduction
+            overall_score = max(0, overall_score - spelling_penalty)
+        
+        metrics['overall_score'] = overall_score
+        metrics['quality_rating'] = self._quality_rating(overall_score)
+        
+        return {
+            'metrics': metrics,
+            'suggestions': suggestions,
+            'assessment': ai_assessment
+        }
+
+    def _local_quality_result(self, resume_data):
+        """Quality score from completeness alone"""
+        completeness_percentage, suggestions = self._completeness(resume_data)
+        return {
+            'metrics': {
+                'completeness': completeness_percentage,
+                'overall_score': completeness_percentage,
+                'quality_rating': self._quality_rating(completeness_percentage)
+            },
+            'suggestions': suggestions,
+            'assessment': None
+        }
+
+    def _assess_quality(self, resume_data):
+        """Get the AI quality assessment, returning (assessment, error)"""
+        try:
+            return self.gemini_client.generate_text(self._quality_prompt(resume_data)), None
         except Exception as e:
-            metrics['overall_score'] = completeness_percentage
-            return {
-                'metrics': metrics,
-                'suggestions': suggestions,
-                'assessment': f"Error generating AI assessment: {str(e)}"
-            } 
\ No newline at end of file
+            return None, e
+
+    async def _aassess_quality(self, resume_data):
+        """Asynchronous version of _assess_quality"""
+        try:
+            return await self.gemini_client.agenerate_text(self._quality_prompt(resume_data)), None
+        except Exception as e:
+            return None, e
+        
+    def calculate_resume_quality_score(self, resume_data, raw_text=None, local_only=False, spell_check_results=None):
+        """
+        Calculate an overall quality score for a resume
+        
+        The spell check and the AI assessment are independent, so they run at the same time.
+        
+        Parameters:
+        resume_data (dict): The parsed resume data
+        raw_text (str): Optional raw resume text for spell checking
+        local_only (bool): Score completeness only, without any AI calls
+        spell_check_results (dict): Spell check results already available for raw_text
+        
+        Returns:
+        dict: Quality metrics and improvement suggestions
+        """
+        if local_only:
+            return self._local_quality_result(resume_data)
+
+        if raw_text and spell_check_results is None:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                spell_check = pool.submit(self.spell_check_resume, raw_text)
+                ai_assessment, assessment_error = self._assess_quality(resume_data)
+                spell_check_results = spell_check.result()
+        else:
+            ai_assessment, assessment_error = self._assess_quality(resume_data)
+
+        return self._quality_result(resume_data, spell_check_results, ai_assessment, assessment_error)
+
+    async def acalculate_resume_quality_score(self, resume_data, raw_text=None, local_only=False,
+                                              spell_check_results=None):
+        """
+        Asynchronous version of calculate_resume_quality_score
+        
+        Parameters:
+        resume_data (dict): The parsed resume data
+        raw_text (str): Optional raw resume text for spell checking
+        local_only (bool): Score completeness only, without any AI calls
+        spell_check_results (dict): Spell check results already available for raw_text
+        
+        Returns:
+        dict: Quality metrics and improvement suggestions
+        """
+        if local_only:
+            return self._local_quality_result(resume_data)
+
+        if raw_text and spell_check_results is None:
+            spell_check_results, (ai_assessment, assessment_error) = await asyncio.gather(
+                self.aspell_check_resume(raw_text),
+                self._aassess_quality(resume_data)
+            )
+        else:
+            ai_assessment, assessment_error = await self._aassess_quality(resume_data)
+
+        return self._quality_result(resume_data, spell_check_results, ai_assessment, assessment_error)
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from model.batch import BatchRunner, compact_records, load_checkpoint, read_records
+from model.parsers.models import ParsedResume
+
+
+class FakeParser:
+    """Parses a resume's first line as the name, failing for names in fail"""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+
+    async def aparse(self, text):
+        name = text.strip().splitlines()[0]
+        if name in self.fail:
+            return ParsedResume()
+        return ParsedResume.from_dict({'contact_info': {'name': name}})
+
+
+def write_lines(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+
+
+def test_read_records_keeps_one_record_per_file(tmp_path):
+    output = tmp_path / 'out.ndjson'
+    write_lines(output, [
+        {'path': 'a.txt', 'status': 'failed'},
+        {'path': 'b.txt', 'status': 'completed', 'run': 1},
+        {'path': 'a.txt', 'status': 'completed'},
+        # Redone after a stop between record and checkpoint, then failed
+        {'path': 'b.txt', 'status': 'failed'},
+        {'path': 'c.txt', 'status': 'failed', 'run': 1},
+        {'path': 'c.txt', 'status': 'failed', 'run': 2},
+    ])
+    with open(output, 'a', encoding='utf-8') as file:
+        file.write('{"path": "d.txt", "sta')
+
+    records = read_records(output)
+    assert [(record['path'], record['status']) for record in records] == [
+        ('a.txt', 'completed'), ('b.txt', 'completed'), ('c.txt', 'failed')
+    ]
+    assert records[1]['run'] == 1 and records[2]['run'] == 2
+
+    compact_records(str(output))
+    assert read_records(output) == records
+    assert len(output.read_text(encoding='utf-8').splitlines()) == 3
+
+
+def test_resumed_run_after_a_stop_before_checkpointing(tmp_path):
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    for name in ('alice', 'bob', 'carol'):
+        (resumes / f'{name}.txt').write_text(name + '\nEngineer', encoding='utf-8')
+    output = tmp_path / 'out.ndjson'
+    checkpoint = tmp_path / 'out.ndjson.checkpoint'
+
+    first = BatchRunner(FakeParser(fail={'carol'}), str(output), str(checkpoint), workers=1, progress_every=0)
+    report = asyncio.run(first.run(str(resumes)))
+    assert (report['succeeded'], report['failed']) == (2, 1)
+
+    # Simulate a stop after bob's record was written but before it was checkpointed,
+    # in the middle of writing another record
+    checkpoint.write_text('alice.txt\n', encoding='utf-8')
+    with open(output, 'a', encoding='utf-8') as file:
+        file.write('{"path": "carol.txt", "st')
+
+    second = BatchRunner(FakeParser(), str(output), str(checkpoint), workers=1, progress_every=0)
+    report = asyncio.run(second.run(str(resumes)))
+    assert (report['succeeded'], report['failed'], report['skipped']) == (2, 0, 1)
+    assert load_checkpoint(str(checkpoint)) == {'alice.txt', 'bob.txt', 'carol.txt'}
+
+    records = read_records(output)
+    assert [(record['path'], record['status']) for record in records] == [
+        ('alice.txt', 'completed'), ('bob.txt', 'completed'), ('carol.txt', 'completed')
+    ]
+    assert records[2]['parsed']['contact_info']['name'] == 'carol'
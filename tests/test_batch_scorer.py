@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from model.analyzers.batch_scorer import BatchScorer
+from model.analyzers.job_matcher import JobMatcher
+
+MATCHER = JobMatcher(None)
+
+
+def _phrase(rng, words):
+    # Empty phrases are requirements and resume items too, and match everything
+    return ' '.join(''.join(rng.choice('abcde') for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(0, words)))
+
+
+def _requirements(rng, count):
+    phrases = [_phrase(rng, 2) for _ in range(rng.randint(0, count))]
+    # Requirements listed twice, possibly in another case, count twice
+    return phrases + [phrase.upper() for phrase in rng.sample(phrases, len(phrases) // 3)]
+
+
+def random_job(rng):
+    return {
+        'technical_skills': _requirements(rng, 8),
+        'soft_skills': _requirements(rng, 4),
+        'education_requirements': _requirements(rng, 3),
+        'experience_requirements': _requirements(rng, 3)
+    }
+
+
+def random_resume(rng):
+    return {
+        'skills': {
+            'technical': [_phrase(rng, 3) for _ in range(rng.randint(0, 8))],
+            'soft': [_phrase(rng, 3) for _ in range(rng.randint(0, 4))]
+        },
+        'education': [{'degree': _phrase(rng, 4)} for _ in range(rng.randint(0, 2))],
+        'work_experience': [
+            {'job_title': _phrase(rng, 3), 'responsibilities': [_phrase(rng, 5) for _ in range(3)]}
+            for _ in range(rng.randint(0, 3))
+        ]
+    }
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_scores_equal_job_matcher_scores(seed):
+    rng = random.Random(seed)
+    resumes = [random_resume(rng) for _ in range(40)]
+    jobs = [random_job(rng) for _ in range(15)]
+
+    scorer = BatchScorer(resumes)
+    # Scored in two batches, so the second reuses and extends the encoded vocabulary
+    scores = [scorer.score(jobs[:5]), scorer.score(jobs[5:])]
+
+    for batch, batch_jobs in zip(scores, (jobs[:5], jobs[5:])):
+        assert batch.shape == (len(resumes), len(batch_jobs))
+        for row, resume_data in enumerate(resumes):
+            for column, jd_requirements in enumerate(batch_jobs):
+                expected = MATCHER.match_requirements(resume_data, jd_requirements)['match_score']
+                assert batch[row, column] == expected
+
+
+def test_duplicate_and_empty_requirements():
+    resumes = [
+        {'skills': {'technical': ['Python'], 'soft': []}, 'education': [], 'work_experience': []},
+        {'skills': {'technical': [], 'soft': []}, 'education': [], 'work_experience': []},
+    ]
+    jd_requirements = {'technical_skills': ['python', 'Python', 'go', ''], 'soft_skills': []}
+
+    scores = BatchScorer(resumes).score([jd_requirements])[:, 0]
+    # "python" twice and the empty requirement match any listed skill, "go" doesn't
+    assert scores.tolist() == [75, 0]
+    assert scores.tolist() == [MATCHER.match_requirements(resume, jd_requirements)['match_score'] for resume in resumes]
+
+
+def test_rank_orders_by_score_then_pool_position():
+    resumes = [
+        {'skills': {'technical': skills, 'soft': []}, 'education': [], 'work_experience': []}
+        for skills in (['go'], ['python', 'go'], [], ['python', 'go'])
+    ]
+    scorer = BatchScorer(resumes)
+    jd_requirements = {'technical_skills': ['python', 'go']}
+
+    assert scorer.rank(jd_requirements, top_k=3) == [(1, 100), (3, 100), (0, 50)]
+    assert scorer.rank(jd_requirements, top_k=10) == [(1, 100), (3, 100), (0, 50), (2, 0)]
+    assert scorer.vocabulary_size == 2
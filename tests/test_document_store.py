@@ -0,0 +1,107 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from model.extractors import backends
+from model.extractors.registry import ExtractorRegistry
+from model.helpers.document_store import DocumentStore
+from model.parsers import resume_parser
+
+
+@pytest.fixture
+def store():
+    store = DocumentStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_text_is_shared_but_results_are_per_model_version(store):
+    sha256 = DocumentStore.hash_bytes(b'resume')
+    store.put_text(sha256, 'resume text')
+    store.put_parsed(sha256, {'name': 'Jane'}, 'gemini/v1')
+    store.put_spell_check(sha256, {'errors': []}, 'gemini/v1')
+
+    assert store.get(sha256, 'gemini/v1') == {
+        'text': 'resume text', 'parsed': {'name': 'Jane'}, 'spell_check': {'errors': []}
+    }
+    assert store.get(sha256, 'gemini/v2') == {'text': 'resume text', 'parsed': None, 'spell_check': None}
+
+
+def test_writing_a_new_version_drops_the_old_results(store):
+    sha256 = DocumentStore.hash_bytes(b'resume')
+    store.put_text(sha256, 'resume text')
+    store.put_parsed(sha256, {'name': 'Jane'}, 'gemini/v1')
+    store.put_spell_check(sha256, {'errors': []}, 'gemini/v1')
+
+    store.put_parsed(sha256, {'name': 'Jane Doe'}, 'gemini/v2')
+
+    # The v1 spell check isn't returned alongside v2 parsed data, nor for v1 any more
+    assert store.get(sha256, 'gemini/v2') == {'text': 'resume text', 'parsed': {'name': 'Jane Doe'}, 'spell_check': None}
+    assert store.get(sha256, 'gemini/v1') == {'text': 'resume text', 'parsed': None, 'spell_check': None}
+
+
+def test_model_version_changes_with_the_prompt_version(monkeypatch):
+    parser = SimpleNamespace(gemini_client=SimpleNamespace(model_name='gemini-2.0-flash'))
+    current = resume_parser.ResumeParser.model_version.fget(parser)
+
+    monkeypatch.setattr(resume_parser, 'PROMPT_VERSION', resume_parser.PROMPT_VERSION + 1)
+    bumped = resume_parser.ResumeParser.model_version.fget(parser)
+
+    assert current != bumped
+    assert bumped.startswith('gemini-2.0-flash/')
+
+
+def test_unknown_and_expired_documents(store):
+    assert store.get('missing', 'gemini/v1') is None
+
+    expiring = DocumentStore(':memory:', ttl_seconds=-1)
+    expiring.put_text('sha', 'text')
+    assert expiring.get('sha', 'gemini/v1') is None
+    expiring.close()
+
+
+def test_text_from_another_extractor_version_is_not_reused(store):
+    sha256 = DocumentStore.hash_bytes(b'resume')
+    store.put_text(sha256, 'first 100 pages', 'v1;pdf(max_pages=100)')
+    store.put_parsed(sha256, {'name': 'Jane'}, 'gemini/v1')
+    assert store.get(sha256, 'gemini/v1', 'v1;pdf(max_pages=100)')['parsed'] == {'name': 'Jane'}
+    assert store.get(sha256, 'gemini/v1', 'v1;pdf(max_pages=5)') is None
+
+    # Results from the old text go with it
+    store.put_text(sha256, 'first 5 pages', 'v1;pdf(max_pages=5)')
+    assert store.get(sha256, 'gemini/v1', 'v1;pdf(max_pages=5)') == {
+        'text': 'first 5 pages', 'parsed': None, 'spell_check': None
+    }
+
+
+def test_registry_version_follows_backends_and_options():
+    registry = ExtractorRegistry()
+    registry.register('pdf', 'pypdf2', backends.pdf_pypdf2)
+    registry.register('pdf', 'pdfminer', backends.pdf_pdfminer)
+    versions = {registry.version()}
+
+    registry.set_options('pdf', max_pages=10)
+    versions.add(registry.version())
+    registry.set_preference('pdf', ['pdfminer'])
+    versions.add(registry.version())
+    assert len(versions) == 3
+
+
+def test_stores_created_before_extractor_versions_are_upgraded(tmp_path):
+    path = str(tmp_path / 'documents.sqlite3')
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE documents (sha256 TEXT PRIMARY KEY, text TEXT, parsed TEXT, spell_check TEXT, "
+        "model_version TEXT, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    connection.execute("INSERT INTO documents (sha256, text, created_at, accessed_at) VALUES ('sha', 'old', 0, 0)")
+    connection.commit()
+    connection.close()
+
+    store = DocumentStore(path, ttl_seconds=None)
+    # Text from before versions were recorded is extracted again
+    assert store.get('sha', 'gemini/v1', 'v1') is None
+    store.put_text('sha', 'new', 'v1')
+    assert store.get('sha', 'gemini/v1', 'v1')['text'] == 'new'
+    store.close()
@@ -0,0 +1,75 @@
+import io
+import zipfile
+
+import docx
+
+from benchmarks.corpus import make_docx
+from model.extractors import backends
+
+WORD = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+
+def extract(data):
+    return backends.docx_xml(io.BytesIO(data))
+
+
+def package(body, parts=None):
+    """A DOCX holding only the XML parts the backend reads"""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{WORD}" xmlns:mc="{MC}"><w:body>{body}</w:body></w:document>')
+        for name, xml in (parts or {}).items():
+            archive.writestr(name, xml)
+    return output.getvalue()
+
+
+def run(text):
+    return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def test_tables_keep_one_paragraph_per_cell():
+    assert extract(make_docx(['Jane Doe'], table_rows=2)) == '\n'.join([
+        'Jane Doe', 'cell 0.0', 'cell 0.1', 'cell 0.2', 'cell 1.0', 'cell 1.1', 'cell 1.2'
+    ])
+
+
+def test_headers_come_first_and_footers_last():
+    document = docx.Document(io.BytesIO(make_docx(['Jane Doe', 'Python engineer'])))
+    document.sections[0].header.paragraphs[0].text = 'jane@example.com'
+    document.sections[0].footer.paragraphs[0].text = 'Page 1'
+    output = io.BytesIO()
+    document.save(output)
+
+    assert extract(output.getvalue()) == 'jane@example.com\nJane Doe\nPython engineer\nPage 1'
+
+
+def test_header_and_footer_parts_are_read_in_order():
+    part = f'<w:hdr xmlns:w="{WORD}"><w:p>{{}}</w:p></w:hdr>'
+    data = package(f'<w:p>{run("Body")}</w:p>', {
+        'word/footer1.xml': part.format(run('Footer')),
+        'word/header2.xml': part.format(run('Header 2')),
+        'word/header1.xml': part.format(run('Header 1')),
+    })
+    assert extract(data) == 'Header 1\nHeader 2\nBody\nFooter'
+
+
+def test_text_boxes_are_read_once_before_their_anchor():
+    text_box = (
+        '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><w:txbxContent>'
+        f'<w:p>{run("Skills: Python")}</w:p>'
+        '</w:txbxContent></w:drawing></mc:Choice><mc:Fallback><w:pict><w:txbxContent>'
+        f'<w:p>{run("Skills: Python")}</w:p>'
+        '</w:txbxContent></w:pict></mc:Fallback></mc:AlternateContent>'
+    )
+    data = package(f'<w:p>{run("Jane Doe")}</w:p><w:p>{run("Anchor ")}<w:r>{text_box}</w:r>{run("text")}</w:p>')
+    assert extract(data) == 'Jane Doe\nSkills: Python\nAnchor text'
+
+
+def test_tabs_and_breaks_count_only_inside_runs():
+    paragraph = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>2019</w:t><w:tab/><w:t>Engineer</w:t><w:br/><w:t>Acme</w:t>'
+        '<w:noBreakHyphen/><w:t>Corp</w:t></w:r></w:p>'
+    )
+    assert extract(package(paragraph)) == '2019\tEngineer\nAcme-Corp'
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.extraction_pool import ExtractionPool, ExtractionTimeout
+
+
+def sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_timeout_only_affects_the_stuck_call():
+    async def scenario():
+        pool = ExtractionPool(None, max_workers=2, timeout=2.0)
+        try:
+            return await asyncio.gather(
+                pool.run(sleep_for, 5),
+                pool.run(sleep_for, 1.5),
+                # Waits for a worker behind the others, which doesn't count against its timeout
+                pool.run(sleep_for, 1.9),
+                return_exceptions=True
+            ), pool.stats()
+        finally:
+            pool.shutdown()
+
+    results, stats = asyncio.run(scenario())
+
+    assert isinstance(results[0], ExtractionTimeout)
+    assert results[1:] == [1.5, 1.9]
+    assert stats['timeouts'] == 1
+    assert stats['restarts'] == 1
+
+
+def test_replacement_workers_serve_later_calls():
+    async def scenario():
+        pool = ExtractionPool(None, max_workers=1, timeout=0.5)
+        try:
+            with pytest.raises(ExtractionTimeout):
+                await pool.run(sleep_for, 3)
+            return await pool.run(sleep_for, 0)
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(scenario()) == 0
@@ -0,0 +1,44 @@
+from app.utils.helpers import sanitize_response
+
+
+def test_well_formed_response_is_kept():
+    data = {
+        'contact_info': {'name': 'Jane Doe', 'email': 'jane@example.com'},
+        'education': [{'degree': 'BSc'}],
+        'skills': {'technical': ['Python'], 'soft': ['Leadership']},
+        'summary': 'Engineer',
+        'raw_text': 'dropped'
+    }
+    result = sanitize_response(data)
+    assert 'raw_text' not in result
+    assert result['contact_info']['name'] == 'Jane Doe'
+    assert result['contact_info']['phone'] is None
+    assert result['education'] == [{'degree': 'BSc'}]
+    assert result['skills'] == {'technical': ['Python'], 'soft': ['Leadership'], 'languages': [], 'tools': []}
+    assert result['projects'] == []
+    assert result['summary'] == 'Engineer'
+
+
+def test_wrong_types_are_coerced_or_dropped():
+    result = sanitize_response({
+        'contact_info': {'name': 'Jane', 'phone': 5550102030, 'email': ['jane@example.com']},
+        'education': [{'degree': 'BSc'}, 'MIT'],
+        'work_experience': None,
+        'skills': {'technical': 'Python', 'tools': ['Git', 3, {'name': 'Jira'}]},
+        'summary': 42
+    })
+    assert result['contact_info'] == {
+        'name': 'Jane', 'email': None, 'phone': '5550102030', 'location': None,
+        'linkedin': None, 'github': None, 'portfolio': None
+    }
+    assert result['education'] == [{'degree': 'BSc'}]
+    assert result['work_experience'] == []
+    assert result['skills']['technical'] == ['Python']
+    assert result['skills']['tools'] == ['Git', '3']
+    assert result['summary'] == '42'
+
+
+def test_sections_that_are_not_objects_get_defaults():
+    result = sanitize_response({'contact_info': 'Jane Doe', 'skills': ['Python']})
+    assert result['contact_info']['name'] is None
+    assert result['skills'] == {'technical': [], 'soft': [], 'languages': [], 'tools': []}
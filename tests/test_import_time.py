@@ -0,0 +1,33 @@
+"""Cold-start guard: importing the app must stay cheap and leave the heavy libraries unloaded"""
+import json
+import os
+import re
+import subprocess
+import sys
+
+from conftest import ROOT
+
+# Seconds; about 0.4 s on a developer laptop, override on slow CI machines
+BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", 1.0))
+LAZY_MODULES = ('google.generativeai', 'PyPDF2', 'docx', 'pandas')
+
+
+def test_app_import_is_lazy_and_within_budget():
+    script = (
+        "import json, sys, app.main; "
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=os.path.join(ROOT, 'backend'),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    assert json.loads(result.stdout) == []
+
+    # "import time: self [us] | cumulative [us] | module"
+    cumulative = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| app\.main$", result.stderr, re.MULTILINE)
+    assert cumulative is not None
+    assert int(cumulative.group(1)) / 1e6 < BUDGET_SECONDS
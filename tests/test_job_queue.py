@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.services.job_queue import JobQueue, JobStore, check_callback_url
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1:8000/cb',
+    'http://localhost/cb',
+    'http://10.0.0.5/cb',
+    'http://192.168.1.1/cb',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://[::1]/cb',
+    'http://[::ffff:127.0.0.1]/cb',
+    'http://0.0.0.0/cb',
+    'file:///etc/passwd',
+    'ftp://example.com/cb',
+])
+def test_callback_urls_to_internal_addresses_are_rejected(url):
+    with pytest.raises(ValueError):
+        check_callback_url(url)
+
+
+def test_callback_allowlist():
+    check_callback_url('http://127.0.0.1:9000/cb', {'127.0.0.1'})
+    with pytest.raises(ValueError):
+        check_callback_url('https://example.com/cb', {'127.0.0.1'})
+
+
+def test_submit_limits_and_queue_positions():
+    async def scenario():
+        async def run_job(task, data, filename, params):
+            return {'task': task}
+
+        queue = JobQueue(run_job, max_file_bytes=10)
+        with pytest.raises(ValueError):
+            await queue.submit('parse', b'x' * 11, 'r.txt')
+        with pytest.raises(ValueError):
+            await queue.submit('parse', b'x', 'r.txt', callback_url='http://127.0.0.1/cb')
+
+        jobs = [await queue.submit('parse', b'x', f'{i}.txt') for i in range(3)]
+        positions = [queue.get(job['id'])['queue_position'] for job in jobs]
+
+        await queue.start()
+        await queue._queue.join()
+        await queue.stop()
+        return positions, [queue.get(job['id']) for job in jobs]
+
+    positions, finished = asyncio.run(scenario())
+    assert positions == [1, 2, 3]
+    assert [job['status'] for job in finished] == ['completed'] * 3
+    assert all(job['queue_position'] is None for job in finished)
+
+
+def add_job(store, job_id, created_at):
+    store.add({'id': job_id, 'task': 'parse', 'status': 'queued', 'filename': f'{job_id}.txt', 'params': {},
+               'callback_url': None, 'created_at': created_at}, job_id.encode())
+
+
+def test_jobs_are_claimed_once_and_only_expired_leases_are_reclaimed(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    first, second = JobStore(path), JobStore(path)
+    add_job(first, 'a', 1.0)
+    add_job(first, 'b', 2.0)
+
+    job, data = first.claim('one', lease_seconds=60)
+    assert (job['id'], job['status'], data) == ('a', 'running', b'a')
+    assert second.claim('two', lease_seconds=60)[0]['id'] == 'b'
+    # Both jobs are held under live leases
+    assert second.claim('two', lease_seconds=60) is None
+
+    assert first.renew('a', 'one', lease_seconds=-1)
+    assert not first.renew('a', 'two', lease_seconds=60)
+    assert second.claim('two', lease_seconds=60)[0]['id'] == 'a'
+
+    # The first owner lost the job, so its result is not recorded
+    job.update(status='completed', result={'owner': 'one'}, error=None, finished_at=3.0)
+    assert not first.finish(job, 'one')
+    job['result'] = {'owner': 'two'}
+    assert second.finish(job, 'two')
+    assert first.get('a')['result'] == {'owner': 'two'}
+
+    assert second.release('two') == 1
+    assert first.get('b')['status'] == 'queued'
+    first.close()
+    second.close()
+
+
+def test_queues_sharing_a_store_run_each_job_once(tmp_path):
+    async def scenario():
+        runs = []
+
+        async def run_job(task, data, filename, params):
+            runs.append(filename)
+            await asyncio.sleep(0.01)
+            return {'data': data.decode()}
+
+        stores = [JobStore(str(tmp_path / 'jobs.db')) for _ in range(2)]
+        queues = [JobQueue(run_job, workers=2, store=store, poll_interval=0.01) for store in stores]
+        jobs = [await queues[i % 2].submit('parse', str(i).encode(), f'{i}.txt') for i in range(8)]
+        # Looked up from the other process's queue
+        assert queues[1].get(jobs[0]['id'])['queue_position'] == 1
+
+        for queue in queues:
+            await queue.start()
+        while any(queue.get(job['id'])['status'] != 'completed' for job in jobs for queue in queues):
+            await asyncio.sleep(0.01)
+        for queue in queues:
+            await queue.stop()
+
+        results = [queues[1].get(job['id'])['result'] for job in jobs]
+        for store in stores:
+            store.close()
+        return runs, results
+
+    runs, results = asyncio.run(scenario())
+    assert sorted(runs) == sorted(f'{i}.txt' for i in range(8))
+    assert results == [{'data': str(i)} for i in range(8)]
@@ -0,0 +1,52 @@
+import pytest
+
+from model.helpers.json_extract import extract_json
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": 1}', {'a': 1}),
+    ('```json\n{"a": [1, 2]}\n```', {'a': [1, 2]}),
+    ('Here is the result:\n{"a": {"b": "c"}}\nLet me know!', {'a': {'b': 'c'}}),
+    ('[{"a": 1}, {"a": 2}]', [{'a': 1}, {'a': 2}]),
+    ('{"text": "braces } and ] in a string"}', {'text': 'braces } and ] in a string'}),
+])
+def test_well_formed_json_is_not_repaired(text, expected):
+    assert extract_json(text) == (expected, False)
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Trailing and repeated commas
+    ('{"a": [1, 2,], "b": 3,}', {'a': [1, 2], 'b': 3}),
+    ('{"a": 1,, "b": 2}', {'a': 1, 'b': 2}),
+    # Cut off inside a string, after a key, and mid-number
+    ('{"errors": [{"error_text": "teh", "suggestion": "th', {'errors': [{'error_text': 'teh', 'suggestion': 'th'}]}),
+    ('{"a": 1, "b": {"c": 2}, "d"', {'a': 1, 'b': {'c': 2}}),
+    ('{"a": [1, 2, 3', {'a': [1, 2, 3]}),
+    ('{"a"', {}),
+    # Fenced and cut off
+    ('```json\n{"skills": {"technical": ["Python", "Go"', {'skills': {'technical': ['Python', 'Go']}}),
+    # Escaped quotes don't end strings
+    ('{"a": "say \\"hi\\"", "b": [1,]}', {'a': 'say "hi"', 'b': [1]}),
+])
+def test_malformed_json_is_repaired(text, expected):
+    assert extract_json(text) == (expected, True)
+
+
+def test_text_after_the_payload_is_ignored():
+    assert extract_json('{"a": [1,]} and then {"b": 2}') == ({'a': [1]}, True)
+
+
+def test_bracketed_prose_before_the_payload_is_skipped():
+    assert extract_json('[see below] {"a": 1}') == ({'a': 1}, False)
+    # "[1]" is itself valid JSON, only objects_only skips it
+    assert extract_json('See note [1] below. {"a": 1}', objects_only=True) == ({'a': 1}, False)
+
+
+def test_objects_only_ignores_arrays():
+    assert extract_json('[1, 2] {"a": 1}', objects_only=True) == ({'a': 1}, False)
+
+
+@pytest.mark.parametrize('text', ['', 'no json here', '{a: 1}', '{"a": 1 "b": 2}', '{"a": undefined}'])
+def test_unrecoverable_text_raises(text):
+    with pytest.raises(ValueError):
+        extract_json(text)
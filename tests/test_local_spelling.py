@@ -0,0 +1,40 @@
+from model.analyzers.local_spelling import LocalSpellChecker, split_text
+
+
+def flagged(text):
+    return [(candidate['word'], candidate['offset']) for candidate in LocalSpellChecker().find_candidates(text)]
+
+
+def test_misspellings_are_flagged_with_offsets():
+    text = "Built tools for managment and recieve flows."
+    assert flagged(text) == [('managment', text.index('managment')), ('recieve', text.index('recieve'))]
+    assert LocalSpellChecker().find_candidates(text)[0]['suggestions'][0] == 'management'
+
+
+def test_names_urls_and_technical_tokens_are_skipped():
+    text = ("Jane Doe\njane.doe@example.com https://github.com/janedoe www.jane.dev\n"
+            "Worked at Acme with AWS, python3 and node.js on microservices and kubernetes.")
+    assert flagged(text) == []
+
+
+def test_misspelled_first_word_of_a_sentence_is_flagged():
+    text = "Devloped APIs. - Implemnted caching.\nGoogle, Mountain View"
+    candidates = LocalSpellChecker().find_candidates(text)
+    assert [(candidate['word'], candidate['offset']) for candidate in candidates] == [
+        ('Devloped', 0), ('Implemnted', text.index('Implemnted'))
+    ]
+    assert candidates[0]['suggestions'][0] == 'Developed'
+
+
+def test_check_returns_only_sentences_with_candidates():
+    text = "All good here. Led managment of teams.\nAnother fine line."
+    result = LocalSpellChecker().check(text)
+    assert result['segments'] == [{'text': 'Led managment of teams.', 'offset': text.index('Led')}]
+    assert LocalSpellChecker().check("Everything is spelled correctly.") == {'candidates': [], 'segments': []}
+
+
+def test_split_text_keeps_offsets_and_limits():
+    text = "First paragraph line one.\nline two.\n\nSecond paragraph. " + "x" * 50
+    pieces = split_text(text, 30)
+    assert all(len(piece) <= 30 for piece, _ in pieces)
+    assert all(text[offset:offset + len(piece)] == piece for piece, offset in pieces)
@@ -0,0 +1,56 @@
+import pytest
+
+from model.parsers.outline import outline_resume
+from model.parsers.resume_parser import ResumeParser
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 (555) 123-4567
+
+Summary
+Backend engineer.
+
+Experience
+Engineer, Acme (2019-2023)
+Intern, Initech 2018 - 2019
+
+Education: BSc Computer Science, 2015-2019
+
+Skills
+Python, SQL; Go | Docker
+"""
+
+
+def test_outline_finds_contact_details_and_sections():
+    outline = outline_resume(RESUME)
+    assert outline['contact_info'] == {
+        'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '+1 (555) 123-4567'
+    }
+    assert outline['work_experience'] == [
+        {'text': 'Engineer, Acme (2019-2023)'}, {'text': 'Intern, Initech 2018 - 2019'}
+    ]
+    assert outline['education'] == [{'text': 'BSc Computer Science, 2015-2019'}]
+    assert outline['skills']['technical'] == ['Python', 'SQL', 'Go', 'Docker']
+
+
+@pytest.mark.parametrize('text, phone', [
+    ('Engineer, Acme (2019-2023)', None),
+    ('Acme 2015 - 2019, 2019 – 2023', None),
+    ('Order 12345678', None),
+    ('Call 020 7946 0958', '020 7946 0958'),
+    ('Engineer (2019-2023)\n555.123.4567', '555.123.4567'),
+])
+def test_phone_needs_ten_digits_and_is_not_a_date_range(text, phone):
+    assert outline_resume(text)['contact_info']['phone'] == phone
+
+
+def test_local_only_quality_score_from_an_outline():
+    parser = ResumeParser('unused')
+    complete = parser.calculate_resume_quality_score(outline_resume(RESUME), RESUME, local_only=True)
+    assert complete['metrics']['completeness'] == 100
+    assert complete['assessment'] is None
+
+    text = "Jane Doe\n\nExperience\nEngineer, Acme (2019-2023)"
+    partial = parser.calculate_resume_quality_score(outline_resume(text), text, local_only=True)
+    # Email, phone, education and skills are missing
+    assert partial['metrics']['completeness'] == round(2 / 6 * 100)
+    assert "Add your phone to the contact information section" in partial['suggestions']
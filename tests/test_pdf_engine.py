@@ -0,0 +1,75 @@
+import asyncio
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.corpus import lines, make_pdf
+from model.extractors.pdf_engine import PdfExtractionEngine
+from model.extractors.registry import ExtractorRegistry
+from model.extractors import backends
+
+PDF = make_pdf([lines(5, seed=page) for page in range(30)])
+
+
+async def run_in_thread(func, *args):
+    return await asyncio.to_thread(func, *args)
+
+
+def _without_timings(result):
+    return {key: value for key, value in result.items() if key != 'page_timings'}
+
+
+@pytest.mark.parametrize('options', [
+    {'max_chars': 50, 'max_pages': 10, 'pages_per_task': 2},
+    {'max_chars': 1500, 'pages_per_task': 3},
+    {'max_pages': 7, 'pages_per_task': 2},
+    {'pages_per_task': 4},
+])
+def test_every_path_gives_the_same_result(options):
+    engine = PdfExtractionEngine(**options)
+    expected = _without_timings(engine.extract(PDF))
+
+    with ThreadPoolExecutor(3) as executor:
+        assert _without_timings(engine.extract(PDF, executor)) == expected
+    assert _without_timings(asyncio.run(engine.aextract(PDF, run_in_thread, 2))) == expected
+    assert _without_timings(asyncio.run(engine.aextract(PDF, run_in_thread))) == expected
+
+
+def test_character_limit_applies_across_the_document():
+    engine = PdfExtractionEngine(pages_per_task=2, max_pages=10, max_chars=50)
+    result = asyncio.run(engine.aextract(PDF, run_in_thread, 2))
+    assert len(result['text']) == 50
+    assert result['pages_extracted'] == 1
+    assert result['truncated']
+
+
+def test_spooled_file_is_removed():
+    before = set(os.listdir(tempfile.gettempdir()))
+    asyncio.run(PdfExtractionEngine(pages_per_task=2).aextract(PDF, run_in_thread, 2))
+    assert set(os.listdir(tempfile.gettempdir())) == before
+
+
+def test_documents_in_one_range_are_sent_without_a_temporary_file():
+    sources = []
+
+    async def run(func, *args):
+        sources.append(args[0])
+        return func(*args)
+
+    engine = PdfExtractionEngine(pages_per_task=30)
+    assert not engine.splits(30) and engine.splits(31)
+    result = asyncio.run(engine.aextract(PDF, run))
+    assert sources == [PDF]
+    assert _without_timings(result) == _without_timings(engine.extract(PDF))
+
+
+def test_registry_applies_default_pdf_limits():
+    registry = ExtractorRegistry()
+    registry.register('pdf', 'pypdf2', backends.pdf_pypdf2)
+    registry.set_options('pdf', max_chars=40)
+
+    assert len(registry.extract(io.BytesIO(PDF))) == 40
+    assert len(registry.extract(io.BytesIO(PDF), max_chars=100)) == 100
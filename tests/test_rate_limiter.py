@@ -0,0 +1,185 @@
+import asyncio
+import threading
+
+import pytest
+
+from model.helpers import rate_limiter as rate_limiter_module
+from model.helpers.rate_limiter import RateLimiter, RateLimitExceeded, TokenBucket
+
+
+class ApiError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record sleeps instead of sleeping, and make backoff use the top of its jitter range"""
+    recorded = []
+
+    async def asleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr(rate_limiter_module.time, 'sleep', recorded.append)
+    monkeypatch.setattr(rate_limiter_module.asyncio, 'sleep', asleep)
+    monkeypatch.setattr(rate_limiter_module.random, 'uniform', lambda low, high: high)
+    return recorded
+
+
+def failing(errors, result='ok'):
+    """Function raising each error in turn, then returning result"""
+    errors = list(errors)
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return call
+
+
+def test_retries_with_capped_exponential_backoff(sleeps):
+    limiter = RateLimiter(max_retries=5, base_delay=1.0, max_delay=5.0)
+    assert limiter.call(failing([ApiError(503), ApiError(500), ApiError(429), ApiError(502)])) == 'ok'
+    assert [seconds for seconds in sleeps if seconds] == [1.0, 2.0, 4.0, 5.0]
+    assert limiter.stats()['retries'] == 4
+    assert limiter.stats()['in_flight'] == 0
+
+
+def test_client_errors_are_not_retried(sleeps):
+    limiter = RateLimiter()
+    with pytest.raises(ApiError):
+        limiter.call(failing([ApiError(400)]))
+    assert limiter.stats()['retries'] == 0
+    assert limiter.stats()['failures'] == 1
+
+
+def test_gives_up_on_repeated_429(sleeps):
+    limiter = RateLimiter(max_retries=2, max_delay=7.0)
+    with pytest.raises(RateLimitExceeded) as raised:
+        limiter.call(failing([ApiError(429)] * 3))
+    assert raised.value.retry_after == 7.0
+    assert limiter.stats()['retries'] == 2
+
+
+def test_gives_up_on_repeated_5xx_with_the_original_error(sleeps):
+    limiter = RateLimiter(max_retries=1)
+    with pytest.raises(ApiError):
+        limiter.call(failing([ApiError(503)] * 2))
+
+
+def test_async_retries_and_gives_up(sleeps):
+    limiter = RateLimiter(max_retries=1, base_delay=0.5)
+
+    def acall(errors):
+        call = failing(errors)
+
+        async def run():
+            return call()
+        return asyncio.run(limiter.acall(run))
+
+    assert acall([ApiError(503)]) == 'ok'
+    assert 0.5 in sleeps
+    with pytest.raises(RateLimitExceeded):
+        acall([ApiError(429)] * 2)
+    assert limiter.stats()['in_flight'] == 0
+
+
+def test_rejected_calls_refund_their_quota(sleeps):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600, max_queue_seconds=1.0)
+    # Five requests already waiting for quota
+    limiter.request_bucket._tokens = -5
+    tokens_before = limiter.token_bucket.available()
+
+    with pytest.raises(RateLimitExceeded) as raised:
+        limiter.call(lambda: 'ok', tokens=300)
+    assert raised.value.retry_after == pytest.approx(6.0, abs=0.05)
+    assert limiter.token_bucket.available() == pytest.approx(tokens_before)
+    assert limiter.request_bucket.available() == pytest.approx(-5, abs=0.05)
+    assert limiter.stats()['rejected'] == 1
+
+
+def test_throttled_calls_wait_for_quota(sleeps):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.request_bucket._tokens = 0
+    assert limiter.call(lambda: 'ok') == 'ok'
+    assert sleeps[0] == pytest.approx(1.0, abs=0.05)
+    assert limiter.stats()['throttled'] == 1
+
+
+def test_bucket_reserve_and_refund():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    bucket.refund(1)
+    assert bucket.available() == pytest.approx(0.0, abs=0.05)
+    # Refunds never overfill the bucket
+    bucket.refund(10)
+    assert bucket.available() == 2
+
+
+def test_async_callers_get_slots_in_arrival_order():
+    async def scenario():
+        limiter = RateLimiter(max_in_flight=1)
+        order = []
+        release_first = asyncio.Event()
+        newcomers = []
+
+        async def first():
+            order.append('first')
+            await release_first.wait()
+            # Arrives as the slot is freed, but must queue behind the callers already waiting
+            newcomers.append(asyncio.create_task(limiter.acall(lambda: later('newcomer'))))
+
+        async def later(name):
+            order.append(name)
+
+        holder = asyncio.create_task(limiter.acall(first))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(limiter.acall(lambda name=name: later(name))) for name in 'abc']
+        await asyncio.sleep(0)
+        # Cancelled while waiting, its place is skipped
+        waiters[1].cancel()
+        release_first.set()
+        await holder
+        await asyncio.gather(*waiters, *newcomers, return_exceptions=True)
+
+        # A newcomer once everyone has finished gets the slot straight away
+        await limiter.acall(lambda: later('d'))
+        return order, limiter.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ['first', 'a', 'c', 'newcomer', 'd']
+    assert stats['in_flight'] == 0
+    assert stats['peak_in_flight'] == 1
+
+
+def test_blocking_and_async_callers_share_the_slots():
+    limiter = RateLimiter(max_in_flight=1)
+    started = threading.Event()
+    finish = threading.Event()
+    order = []
+
+    def blocking():
+        order.append('blocking')
+        started.set()
+        finish.wait()
+
+    thread = threading.Thread(target=limiter.call, args=(blocking,))
+    thread.start()
+    started.wait()
+
+    async def waiting():
+        async def call():
+            order.append('async')
+
+        task = asyncio.create_task(limiter.acall(call))
+        await asyncio.sleep(0.01)
+        assert order == ['blocking']
+        finish.set()
+        await task
+
+    asyncio.run(waiting())
+    thread.join()
+    assert order == ['blocking', 'async']
+    assert limiter.stats()['peak_in_flight'] == 1
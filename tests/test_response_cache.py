@@ -0,0 +1,75 @@
+import pytest
+
+from model.helpers import response_cache as response_cache_module
+from model.helpers.response_cache import ResponseCache
+
+
+class Clock:
+    """Stands in for time.time"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache_module, 'time', clock)
+    return clock
+
+
+def test_hits_misses_and_keys():
+    cache = ResponseCache(':memory:')
+    key = ResponseCache.make_key('gemini', 'prompt')
+    assert key != ResponseCache.make_key('gemini', 'prompt', 'json')
+    assert key != ResponseCache.make_key('other', 'prompt')
+
+    assert cache.get(key) is None
+    cache.set(key, 'response')
+    assert cache.get(key) == 'response'
+    assert cache.get(key) == 'response'
+    assert cache.stats() == {'entries': 1, 'hits': 2, 'misses': 1, 'evictions': 0}
+    cache.close()
+
+
+def test_expired_responses_are_misses_and_are_evicted(clock):
+    cache = ResponseCache(':memory:', ttl_seconds=60, evict_every=1)
+    cache.set('old', 'a')
+    clock.now += 30
+    cache.set('new', 'b')
+
+    clock.now += 31
+    assert cache.get('old') is None
+    assert cache.get('new') == 'b'
+
+    # The next write sweeps the ones nobody asked for
+    clock.now += 30
+    cache.set('newest', 'c')
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'evictions': 2}
+
+
+def test_least_recently_used_responses_are_evicted(clock):
+    cache = ResponseCache(':memory:', max_entries=2, evict_every=1)
+    cache.set('a', '1')
+    clock.now += 1
+    cache.set('b', '2')
+    clock.now += 1
+    # Reading a makes b the least recently used
+    assert cache.get('a') == '1'
+    clock.now += 1
+    cache.set('c', '3')
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == ('1', '3')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_eviction_runs_every_few_writes(clock):
+    cache = ResponseCache(':memory:', max_entries=2, evict_every=3)
+    for index in range(5):
+        clock.now += 1
+        cache.set(str(index), 'x')
+        assert cache.stats()['entries'] == [1, 2, 2, 3, 4][index]
@@ -0,0 +1,113 @@
+import asyncio
+import io
+import zipfile
+
+import orjson
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.routers.v1 import comparison_routes, parser_routes
+from app.services.parser_service import ParserService
+
+RESUME = ('resume.txt', b'Jane Doe\nPython engineer', 'text/plain')
+
+
+def make_client(router, parser_service):
+    """Serve one router with the given service in place of the application's"""
+    app = FastAPI()
+    app.include_router(router)
+    app.state.parser_service = parser_service
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('top_k', ['0', '-1'])
+def test_rank_resumes_rejects_top_k_below_one(top_k):
+    client = make_client(comparison_routes.router, object.__new__(ParserService))
+    response = client.post('/api/v1/rank-resumes', files=[('resume_files', RESUME)],
+                           data={'job_description': 'Python engineer', 'top_k': top_k})
+    assert response.status_code == 422
+
+    # Callers of the service get the same check, before any AI call
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(ParserService.rank_resumes(object.__new__(ParserService), [], 'Python engineer', int(top_k)))
+    assert error.value.status_code == 400
+
+
+class FakeResumeParser:
+    """Reads text files as is and takes the first line as the name"""
+
+    model_version = 'fake/v1'
+
+    def extract_text_from_stream(self, stream):
+        return stream.read().decode('utf-8')
+
+    async def aparse_resume(self, text, include_summary=True):
+        return {'contact_info': {'name': text.splitlines()[0]}}
+
+
+def bulk_service(**limits):
+    """ParserService without a document store or extraction pool, recording the copies it makes"""
+    service = object.__new__(ParserService)
+    service.resume_parser = FakeResumeParser()
+    service.document_store = None
+    service.extraction_pool = None
+    service.bulk_concurrency = 2
+    service.bulk_max_files = limits.get('bulk_max_files', 10)
+    service.bulk_max_file_bytes = limits.get('bulk_max_file_bytes', 1000)
+    service.bulk_memory_limit = 1024 * 1024
+
+    service.spooled = []
+
+    def spool_upload(*args):
+        sha256, stream = ParserService._spool_upload(service, *args)
+        service.spooled.append(stream)
+        return sha256, stream
+
+    service._spool_upload = spool_upload
+    return service
+
+
+def bulk_results(response):
+    assert response.status_code == 200
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    return {line['filename']: (line['status'], line.get('status_code')) for line in lines}, lines
+
+
+def test_parse_resumes_streams_one_line_per_upload_and_closes_the_copies():
+    service = bulk_service(bulk_max_file_bytes=100)
+    client = make_client(parser_routes.router, service)
+    response = client.post('/api/v1/parse-resumes', files=[
+        ('resume_files', ('a.txt', b'Ada Lovelace\nEngineer', 'text/plain')),
+        ('resume_files', ('big.txt', b'x' * 101, 'text/plain')),
+        ('resume_files', ('c.md', b'Grace Hopper', 'text/plain')),
+    ])
+
+    statuses, lines = bulk_results(response)
+    assert statuses == {'a.txt': ('completed', None), 'big.txt': ('failed', 413), 'c.md': ('failed', 400)}
+    assert next(line for line in lines if line['filename'] == 'a.txt')['result']['contact_info']['name'] == 'Ada Lovelace'
+    # The oversized file is never copied
+    assert len(service.spooled) == 2
+    assert all(stream.closed for stream in service.spooled)
+
+
+def test_parse_resumes_from_a_zip_archive():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zip_file:
+        zip_file.writestr('resumes/a.txt', 'Ada Lovelace\nEngineer')
+        zip_file.writestr('resumes/.hidden.txt', 'skipped')
+        zip_file.writestr('resumes/b.txt', 'Alan Turing')
+
+    service = bulk_service()
+    client = make_client(parser_routes.router, service)
+    response = client.post('/api/v1/parse-resumes',
+                           files=[('resume_files', ('batch.zip', archive.getvalue(), 'application/zip'))])
+
+    statuses, _ = bulk_results(response)
+    assert statuses == {'resumes/a.txt': ('completed', None), 'resumes/b.txt': ('completed', None)}
+    assert [stream.closed for stream in service.spooled] == [True]
+
+    response = client.post('/api/v1/parse-resumes',
+                           files=[('resume_files', ('batch.zip', b'not a zip', 'application/zip'))])
+    assert response.status_code == 400
+    assert all(stream.closed for stream in service.spooled)
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from model.helpers.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flight.do, 'prompt', slow_call)
+        started.wait(5)
+        followers = [pool.submit(flight.do, 'prompt', slow_call) for _ in range(3)]
+        # Let the followers reach the shared future before the call finishes
+        while flight.stats()['coalesced'] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert results == ['result'] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {'calls': 1, 'coalesced': 3, 'in_flight': 0}
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_call():
+        started.set()
+        release.wait(5)
+        raise ValueError('upstream failed')
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, 'prompt', failing_call)
+        started.wait(5)
+        follower = pool.submit(flight.do, 'prompt', failing_call)
+        while flight.stats()['coalesced'] < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    # The failed call is forgotten, so the next caller tries again
+    assert flight.do('prompt', lambda: 'retried') == 'retried'
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.stats()['coalesced'] == 0
+
+
+def test_async_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def scenario():
+        return await asyncio.gather(*[flight.ado('prompt', call) for _ in range(5)])
+
+    assert asyncio.run(scenario()) == ['result'] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_async_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ValueError('upstream failed')
+
+    async def scenario():
+        return await asyncio.gather(*[flight.ado('prompt', call) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_cancelling_one_async_caller_leaves_the_call_running():
+    flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.ado('prompt', call))
+        second = asyncio.ensure_future(flight.ado('prompt', call))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == 'result'
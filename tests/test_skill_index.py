@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from benchmarks.bench_requirement_matcher import legacy_match_requirements
+from model.analyzers.job_matcher import JobMatcher
+from model.analyzers.skill_index import AhoCorasick, RequirementMatcher
+
+
+def test_finds_overlapping_and_nested_patterns():
+    patterns = ['he', 'she', 'his', 'hers', 'java', 'javascript', 'script']
+    found = AhoCorasick(patterns).find('ushers use javascript')
+    assert {patterns[pattern_id] for pattern_id in found} == {'he', 'she', 'hers', 'java', 'javascript', 'script'}
+
+
+def test_empty_pattern_and_duplicates():
+    index = AhoCorasick(['', 'go', 'go'])
+    assert index.find('') == {0}
+    assert index.find('django') == {0, 1, 2}
+
+
+def _word(rng):
+    return ''.join(rng.choice('abcdefg') for _ in range(rng.randint(1, 5)))
+
+
+def _phrase(rng, words):
+    return ' '.join(_word(rng) for _ in range(rng.randint(1, words)))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_aho_corasick_agrees_with_substring_checks(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        patterns = [_phrase(rng, 2) for _ in range(rng.randint(0, 10))]
+        text = _phrase(rng, 12)
+        expected = {pattern_id for pattern_id, pattern in enumerate(patterns) if pattern in text}
+        assert AhoCorasick(patterns).find(text) == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_requirement_matcher_agrees_with_substring_checks(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        jd_requirements = {
+            'technical_skills': [_phrase(rng, 2).upper() for _ in range(rng.randint(0, 8))],
+            'soft_skills': [_phrase(rng, 2) for _ in range(rng.randint(0, 5))],
+            'education_requirements': [_phrase(rng, 3) for _ in range(rng.randint(0, 3))],
+            'experience_requirements': [_phrase(rng, 2) for _ in range(rng.randint(0, 3))]
+        }
+        resume_data = {
+            'skills': {
+                'technical': [_phrase(rng, 3) for _ in range(rng.randint(0, 8))],
+                'soft': [_phrase(rng, 3) for _ in range(rng.randint(0, 4))]
+            },
+            'education': [{'degree': _phrase(rng, 4)} for _ in range(rng.randint(0, 2))],
+            'work_experience': [
+                {'job_title': _phrase(rng, 3), 'responsibilities': [_phrase(rng, 5) for _ in range(3)]}
+                for _ in range(rng.randint(0, 3))
+            ]
+        }
+        assert RequirementMatcher(jd_requirements).match(resume_data) == \
+            legacy_match_requirements(resume_data, jd_requirements)
+
+
+def test_match_requirements_accepts_raw_or_compiled_requirements():
+    jd_requirements = {
+        'technical_skills': ['Python', 'Kubernetes'],
+        'soft_skills': ['communication'],
+        'education_requirements': ["Bachelor's in Computer Science"],
+        'experience_requirements': ['backend']
+    }
+    resume_data = {
+        'skills': {'technical': ['Python 3', 'Docker'], 'soft': ['Written communication']},
+        'education': [{'degree': 'BSc Computer Science'}],
+        'work_experience': [{'job_title': 'Engineer', 'responsibilities': ['Built backend services']}]
+    }
+    matcher = JobMatcher(None)
+    result = matcher.match_requirements(resume_data, jd_requirements)
+    assert result == matcher.match_requirements(resume_data, matcher.compile_requirements(jd_requirements))
+    assert result['match_score'] == 80
+    assert result['gaps']['technical'] == ['kubernetes']
@@ -0,0 +1,98 @@
+import asyncio
+
+from model.analyzers.spell_checker import SpellChecker
+
+MISSPELLINGS = {'recieve': 'receive', 'managment': 'management'}
+
+
+class FakeGeminiClient:
+    """Reports each known misspelling in the resume text or excerpts of a prompt, every error twice"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_response(self, prompt):
+        self.prompts.append(prompt)
+        if 'Resume Excerpts:' in prompt:
+            resume_text = prompt.split('Resume Excerpts:', 1)[1].split('These words were not found', 1)[0]
+        else:
+            resume_text = prompt.split('Resume Text:', 1)[1]
+        errors = []
+        for word in resume_text.split():
+            word = word.strip('.,')
+            if word in MISSPELLINGS:
+                error = {'error_text': word, 'suggestion': MISSPELLINGS[word], 'explanation': 'Misspelled'}
+                errors.extend([error, dict(error)])
+        return {'errors': errors}
+
+    async def agenerate_response(self, prompt):
+        return self.generate_response(prompt)
+
+
+TEXT = (
+    "Led a team of five engineers building payment services.\n\n"
+    "Designed the API gateway and the billing pipeline.\n\n"
+    "Helped customers recieve refunds faster.\n\n"
+    "Owned managment of releases and recieve queues."
+)
+
+
+def offsets(result):
+    return [(error['error_text'], error['offset']) for error in result['errors']]
+
+
+def test_offsets_are_absolute_across_chunks_and_duplicates_are_merged():
+    client = FakeGeminiClient()
+    checker = SpellChecker(client, prepass=False, chunk_chars=60, line_cache_size=0)
+    result = checker.check_spelling(TEXT)
+
+    assert len(client.prompts) > 1
+    second = TEXT.index('recieve', TEXT.index('recieve') + 1)
+    assert offsets(result) == [
+        ('recieve', TEXT.index('recieve')),
+        ('managment', TEXT.index('managment')),
+        ('recieve', second),
+    ]
+    assert result['summary']['total_errors'] == 3
+
+
+def test_async_path_gives_the_same_errors():
+    checker = SpellChecker(FakeGeminiClient(), prepass=False, chunk_chars=60, line_cache_size=0)
+    sync_result = checker.check_spelling(TEXT)
+    assert asyncio.run(checker.acheck_spelling(TEXT)) == sync_result
+
+
+def test_cached_lines_keep_their_offsets():
+    client = FakeGeminiClient()
+    checker = SpellChecker(client, prepass=False, chunk_chars=60)
+    first = checker.check_spelling(TEXT)
+    calls = len(client.prompts)
+
+    shifted = "Jane Doe\n\n" + TEXT
+    second = checker.check_spelling(shifted)
+
+    assert len(client.prompts) == calls + 1
+    assert offsets(second) == [(word, offset + len("Jane Doe\n\n")) for word, offset in offsets(first)]
+
+
+def test_prepass_segments_longer_than_a_chunk_are_split():
+    words = ['built'] * 4000
+    for index in (10, 1500, 3900):
+        words[index] = 'recieve'
+    # One run-on paragraph with no sentence breaks
+    text = 'Summary\n\n' + ' '.join(words)
+
+    client = FakeGeminiClient()
+    checker = SpellChecker(client, chunk_chars=500, line_cache_size=0)
+    chunks, _ = checker._plan(text)
+    assert len(chunks) > 1
+    assert all(len(chunk['text']) <= 500 for chunk in chunks)
+
+    result = checker.check_spelling(text)
+    expected = []
+    position = text.find('recieve')
+    while position >= 0:
+        expected.append(('recieve', position))
+        position = text.find('recieve', position + 1)
+    assert offsets(result) == expected
+    assert all(len(prompt) < 2000 for prompt in client.prompts)
@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks.corpus import make_pdf
+from model.extractors.registry import check_extension
+from model.extractors.text_extractor import TextExtractor
+
+PDF = make_pdf([['Jane Doe', 'Python engineer']])
+
+
+def test_format_is_sniffed_from_the_content():
+    assert 'Jane Doe' in TextExtractor.extract_text_from_uploaded_file(PDF)
+    assert TextExtractor.extract_text_from_uploaded_file(b'plain text') == 'plain text'
+
+
+def test_matching_or_unknown_extensions_are_accepted():
+    assert 'Jane Doe' in TextExtractor.extract_text_from_uploaded_file(PDF, 'resume.PDF')
+    assert TextExtractor.extract_text_from_uploaded_file(b'plain text', 'notes.md') == 'plain text'
+    assert TextExtractor.extract_text_from_uploaded_file(b'plain text', 'README') == 'plain text'
+
+
+@pytest.mark.parametrize('data, filename', [
+    (PDF, 'resume.docx'),
+    (PDF, 'resume.txt'),
+    (b'plain text', 'resume.pdf'),
+])
+def test_content_not_matching_its_extension_is_rejected(data, filename):
+    with pytest.raises(ValueError, match="doesn't match"):
+        TextExtractor.extract_text_from_uploaded_file(data, filename)
+
+
+def test_check_extension():
+    check_extension('docx', 'cv.docx')
+    with pytest.raises(ValueError):
+        check_extension('docx', 'cv.pdf')